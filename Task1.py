@@ -1,17 +1,467 @@
 #The To-Do List application is a user-friendly task management tool built with Python and Tkinter. It allows users to efficiently manage their daily tasks. Users can add new tasks, update existing ones, and delete multiple tasks simultaneously. The interface displays tasks with their respective indices for easy reference. The application features an intuitive graphical interface with buttons for adding, updating, and deleting tasks. The list box supports multiple task selection, making task management seamless and efficient. Ideal for users seeking a simple yet effective way to keep track of their tasks and improve productivity.
 
+import argparse
+import bisect
+import gc
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
 import tkinter as tk
 from tkinter import messagebox
+import tk_instrument
+
+# Target number of tasks per block in TaskStore; a block is split at twice this size
+TASK_BLOCK_SIZE = 512
+
+# Base path of the saved task list: <path>.snapshot plus <path>.journal.<generation> files
+TASKS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tasks")
+
+# Journal records after which the task list is compacted into a new snapshot; this
+# also bounds the journal tail replayed at startup
+JOURNAL_COMPACT_RECORDS = 50000
+
+# Ordered task list as a list of blocks with a Fenwick tree over the block lengths.
+# Finding a position walks the tree in O(log blocks) and the edit itself only shifts
+# one block, so insert, delete and rename stay cheap at millions of tasks, and a bulk
+# delete touches each affected block once. Independent of Tk.
+class TaskStore:
+    def __init__(self, tasks=(), block_size=TASK_BLOCK_SIZE):
+        self.block_size = block_size
+        tasks = list(tasks)
+        self.blocks = [tasks[start:start + block_size] for start in range(0, len(tasks), block_size)] or [[]]
+        self.size = len(tasks)
+        # Ids of blocks handed out by freeze that must be copied before they change
+        self.shared = set()
+        self.rebuild()
+
+    # Recomputes the Fenwick tree after blocks were added or removed
+    def rebuild(self):
+        self.tree = [0] * (len(self.blocks) + 1)
+        for index, block in enumerate(self.blocks, 1):
+            self.tree[index] += len(block)
+            parent = index + (index & -index)
+            if parent <= len(self.blocks):
+                self.tree[parent] += self.tree[index]
+        self.top_bit = 1 << (len(self.blocks).bit_length() - 1)
+
+    def adjust(self, block_index, delta):
+        index = block_index + 1
+        while index <= len(self.blocks):
+            self.tree[index] += delta
+            index += index & -index
+
+    # Block index and offset in the block of a task position
+    def locate(self, position):
+        if not 0 <= position < self.size:
+            raise IndexError("task position out of range")
+        index = 0
+        bit = self.top_bit
+        while bit:
+            step = index + bit
+            if step <= len(self.blocks) and self.tree[step] <= position:
+                position -= self.tree[step]
+                index = step
+            bit >>= 1
+        return index, position
+
+    # The current blocks for a reader on another thread, in O(blocks). They are never
+    # changed afterwards: an edit copies a shared block first (copy on write).
+    def freeze(self):
+        self.shared = set(map(id, self.blocks))
+        return list(self.blocks)
+
+    # Block to change in place
+    def writable(self, block_index):
+        block = self.blocks[block_index]
+        if id(block) in self.shared:
+            self.shared.discard(id(block))
+            block = self.blocks[block_index] = block[:]
+        return block
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, position):
+        block_index, offset = self.locate(position)
+        return self.blocks[block_index][offset]
+
+    # Rename
+    def __setitem__(self, position, task):
+        block_index, offset = self.locate(position)
+        self.writable(block_index)[offset] = task
+
+    def __iter__(self):
+        for block in self.blocks:
+            yield from block
+
+    # Tasks from start up to stop, walking the blocks from one lookup
+    def range(self, start, stop):
+        stop = min(stop, self.size)
+        if start >= stop:
+            return
+        block_index, offset = self.locate(start)
+        remaining = stop - start
+        while remaining:
+            chunk = self.blocks[block_index][offset:offset + remaining]
+            yield from chunk
+            remaining -= len(chunk)
+            block_index += 1
+            offset = 0
+
+    def insert(self, position, task):
+        if position == self.size:
+            block_index = len(self.blocks) - 1
+            offset = len(self.blocks[block_index])
+        else:
+            block_index, offset = self.locate(position)
+        block = self.writable(block_index)
+        block.insert(offset, task)
+        self.size += 1
+        if len(block) > 2 * self.block_size:
+            self.blocks[block_index:block_index + 1] = [block[:self.block_size], block[self.block_size:]]
+            self.rebuild()
+        else:
+            self.adjust(block_index, 1)
+
+    def append(self, task):
+        self.insert(self.size, task)
+
+    def extend(self, tasks):
+        tasks = list(tasks)
+        last = self.writable(len(self.blocks) - 1)
+        room = max(0, self.block_size - len(last))
+        last.extend(tasks[:room])
+        self.size += len(tasks)
+        if len(tasks) <= room:
+            self.adjust(len(self.blocks) - 1, len(tasks))
+            return
+        self.blocks.extend(tasks[start:start + self.block_size] for start in range(room, len(tasks), self.block_size))
+        self.rebuild()
+
+    def pop(self, position):
+        block_index, offset = self.locate(position)
+        block = self.writable(block_index)
+        task = block.pop(offset)
+        self.size -= 1
+        if not block and len(self.blocks) > 1:
+            del self.blocks[block_index]
+            self.rebuild()
+        else:
+            self.adjust(block_index, -1)
+        return task
+
+    # Deletes many positions at once in one pass over the blocks, so each deletion
+    # only shifts its own block and the tree is rebuilt once
+    def delete(self, positions):
+        positions = sorted(set(positions))
+        if not positions:
+            return
+        if positions[0] < 0 or positions[-1] >= self.size:
+            raise IndexError("task position out of range")
+        start = 0
+        first = 0
+        for block_index, block in enumerate(self.blocks):
+            end = start + len(block)
+            last = bisect.bisect_left(positions, end, first)
+            if last > first:
+                block = self.writable(block_index)
+            for position in reversed(positions[first:last]):
+                del block[position - start]
+            first = last
+            start = end
+        self.size -= len(positions)
+        self.blocks = [block for block in self.blocks if block] or [[]]
+        self.rebuild()
+
+# Listbox that only holds the rows in view. A window of `height` rows is filled from
+# the store, and edits rewrite at most the rows from the changed position down to the
+# bottom of the window. Selection is kept as a set of task positions, so it survives
+# scrolling.
+class VirtualListbox:
+    def __init__(self, listbox, scrollbar, store):
+        self.listbox = listbox
+        self.scrollbar = scrollbar
+        self.store = store
+        self.visible = int(listbox.cget("height"))
+        self.top = 0
+        self.selected = set()
+        self.scrollbar.config(command=self.yview)
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<MouseWheel>", self.on_mousewheel)
+        self.listbox.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll(3))
+        self.render_from(0)
+
+    def selection(self):
+        return sorted(self.selected)
+
+    def inserted(self, position):
+        if position < self.top + self.visible:
+            self.render_from(position)
+        else:
+            self.update_scrollbar()
+
+    def changed(self, position):
+        slot = position - self.top
+        if 0 <= slot < self.visible:
+            self.listbox.delete(slot)
+            self.listbox.insert(slot, f"{position + 1}. {self.store[position]}")
+            if position in self.selected:
+                self.listbox.selection_set(slot)
+
+    # Called after tasks from `first` on were deleted; rows below shift up and get new numbers
+    def removed(self, first):
+        self.selected.clear()
+        self.listbox.selection_clear(0, tk.END)
+        old_top = self.top
+        self.top = max(0, min(self.top, len(self.store) - self.visible))
+        self.render_from(first if self.top == old_top else self.top)
+
+    # Rewrites the shown rows from a task position to the bottom of the window
+    def render_from(self, position):
+        start = max(position, self.top)
+        end = min(len(self.store), self.top + self.visible)
+        self.listbox.delete(start - self.top, tk.END)
+        if start < end:
+            self.listbox.insert(tk.END, *(f"{row + 1}. {task}" for row, task in zip(range(start, end), self.store.range(start, end))))
+            for row in range(start, end):
+                if row in self.selected:
+                    self.listbox.selection_set(row - self.top)
+        self.update_scrollbar()
+
+    def on_select(self, event):
+        self.selected.difference_update(range(self.top, self.top + self.visible))
+        self.selected.update(self.top + slot for slot in self.listbox.curselection())
+
+    def scroll(self, rows):
+        top = max(0, min(self.top + rows, len(self.store) - self.visible))
+        if top != self.top:
+            self.top = top
+            self.render_from(top)
+        return "break"
+
+    def on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    # Scrollbar protocol: "moveto fraction" or "scroll n units|pages"
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.scroll(int(float(args[1]) * len(self.store)) - self.top)
+        elif args[0] == "scroll":
+            step = self.visible if args[2] == "pages" else 1
+            self.scroll(int(args[1]) * step)
+
+    def update_scrollbar(self):
+        total = len(self.store)
+        if total <= self.visible:
+            self.scrollbar.set(0, 1)
+            return
+        self.scrollbar.set(self.top / total, min(1, (self.top + self.visible) / total))
+
+# Tasks are stored one per line in the snapshot and journal. Only a task with a line
+# break or a leading quote is written JSON-quoted, so reading is mostly plain splits.
+def encode_task(task):
+    if "\n" in task or "\r" in task or task.startswith('"'):
+        return json.dumps(task, ensure_ascii=False)
+    return task
+
+def decode_task(text):
+    return json.loads(text) if text.startswith('"') else text
+
+# Durable task list: a snapshot plus an append-only journal of tab-separated lines,
+# "add<TAB>task", "update<TAB>position<TAB>task" and "delete<TAB>positions". The
+# snapshot is a JSON header line followed by one task per line. A background thread writes and fsyncs whatever
+# has queued up since its last flush, so a burst of edits shares one fsync (group
+# commit). After JOURNAL_COMPACT_RECORDS records the journal is rotated to the next
+# generation and a second thread writes the current tasks as the snapshot of the
+# finished generations, then removes their journals. The editing thread only freezes
+# the task blocks and queues the rotation; the writer thread switches files at that
+# point in the record order. Loading reads the snapshot and replays only the journals newer
+# than it.
+class TaskJournal:
+    def __init__(self, path=TASKS_PATH):
+        self.path = path
+        self.store = None
+        self.file = None
+        self.generation = 0
+        self.records = 0
+        self.flushes = 0
+        self.pending = []
+        self.writing = False
+        self.closing = False
+        self.condition = threading.Condition()
+        self.flusher = None
+        self.compactor = None
+
+    def journals(self):
+        folder, prefix = os.path.split(self.path + ".journal.")
+        generations = [name[len(prefix):] for name in os.listdir(folder or ".") if name.startswith(prefix)]
+        return sorted(int(generation) for generation in generations if generation.isdigit())
+
+    def load(self):
+        # Loading creates a million objects at once, which would trigger repeated
+        # full garbage collections
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            snapshot_generation = -1
+            tasks = []
+            if os.path.exists(self.path + ".snapshot"):
+                with open(self.path + ".snapshot", encoding="utf-8", newline="\n") as file:
+                    header, _, body = file.read().partition("\n")
+                snapshot_generation = json.loads(header)["generation"]
+                tasks = body.split("\n")[:-1]
+                if '\n"' in "\n" + body:
+                    tasks = [decode_task(task) for task in tasks]
+            self.store = TaskStore(tasks)
+            generations = self.journals()
+            for generation in generations:
+                if generation > snapshot_generation:
+                    self.replay(f"{self.path}.journal.{generation}")
+        finally:
+            if collecting:
+                gc.enable()
+        self.generation = max(generations + [snapshot_generation]) + 1
+        self.file = open(f"{self.path}.journal.{self.generation}", "a", encoding="utf-8", newline="\n")
+        self.flusher = threading.Thread(target=self.flush_loop, daemon=True)
+        self.flusher.start()
+        return self.store
+
+    # Runs of adds are applied with one extend. A torn last line from a crash, which
+    # has no line end, ends the replay.
+    def replay(self, path):
+        added = []
+        with open(path, encoding="utf-8", newline="\n") as file:
+            for line in file:
+                if not line.endswith("\n"):
+                    break
+                kind, _, rest = line[:-1].partition("\t")
+                self.records += 1
+                if kind == "add":
+                    added.append(decode_task(rest))
+                    continue
+                if added:
+                    self.store.extend(added)
+                    added = []
+                if kind == "update":
+                    position, _, task = rest.partition("\t")
+                    self.store[int(position)] = decode_task(task)
+                elif kind == "delete":
+                    self.store.delete(int(position) for position in rest.split())
+        if added:
+            self.store.extend(added)
+
+    def add(self, task):
+        self.record(f"add\t{encode_task(task)}\n")
+
+    def update(self, position, task):
+        self.record(f"update\t{position}\t{encode_task(task)}\n")
+
+    def delete(self, positions):
+        self.record(f"delete\t{' '.join(map(str, positions))}\n")
+
+    def record(self, line):
+        with self.condition:
+            self.pending.append(line)
+            self.condition.notify_all()
+        self.records += 1
+        if self.records >= JOURNAL_COMPACT_RECORDS and not (self.compactor and self.compactor.is_alive()):
+            self.compact()
+
+    def flush_loop(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closing:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                batch, self.pending = self.pending, []
+                self.writing = True
+            lines = []
+            for line in batch:
+                # A generation number is where compact rotated the journal
+                if isinstance(line, int):
+                    self.write(lines)
+                    lines = []
+                    self.file.close()
+                    self.file = open(f"{self.path}.journal.{line}", "a", encoding="utf-8", newline="\n")
+                else:
+                    lines.append(line)
+            self.write(lines)
+            with self.condition:
+                self.writing = False
+                self.flushes += 1
+                self.condition.notify_all()
+
+    def write(self, lines):
+        if lines:
+            self.file.write("".join(lines))
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    # Waits until everything recorded so far is on disk
+    def sync(self):
+        with self.condition:
+            while self.pending or self.writing:
+                self.condition.wait()
+
+    # Rotates the journal, then snapshots the tasks in the background. The tasks are
+    # frozen here, on the thread that edits them, which costs O(blocks); nothing waits
+    # for the disk.
+    def compact(self):
+        if self.compactor is not None:
+            self.compactor.join()
+        finished = self.generation
+        self.generation += 1
+        with self.condition:
+            self.pending.append(self.generation)
+            self.condition.notify_all()
+        self.records = 0
+        blocks = self.store.freeze()
+        self.compactor = threading.Thread(target=self.write_snapshot, args=(finished, blocks), daemon=True)
+        self.compactor.start()
+
+    # Writes the snapshot of a generation from a list of task blocks
+    def write_snapshot(self, generation, blocks):
+        temporary = self.path + ".snapshot.tmp"
+        with open(temporary, "w", encoding="utf-8", newline="\n") as file:
+            file.write(json.dumps({"generation": generation, "count": sum(map(len, blocks))}) + "\n")
+            for block in blocks:
+                file.write("".join(encode_task(task) + "\n" for task in block))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path + ".snapshot")
+        for old in self.journals():
+            if old <= generation:
+                os.remove(f"{self.path}.journal.{old}")
+
+    def close(self):
+        with self.condition:
+            self.closing = True
+            self.condition.notify_all()
+        self.flusher.join()
+        if self.compactor is not None:
+            self.compactor.join()
+        empty = self.file.tell() == 0
+        self.file.close()
+        # Every session starts a new journal; drop it if nothing was recorded
+        if empty:
+            os.remove(self.file.name)
 
 class TodoApp:
-    def __init__(self, root):
+    def __init__(self, root, tasks=None, journal=None):
         self.root = root
+        self.journal = journal
         self.root.title("To-Do List")
         self.root.geometry("500x450")
         self.root.resizable(False, False)
 
         # Task list
-        self.tasks = []
+        self.tasks = tasks if tasks is not None else TaskStore()
 
         # Title label
         self.title_label = tk.Label(root, text="To-Do List", font=('Arial', 18, 'bold'))
@@ -25,9 +475,14 @@ class TodoApp:
         self.add_button = tk.Button(root, text="Add Task", font=('Arial', 12, 'bold'), bg="#58D68D", command=self.add_task)
         self.add_button.pack(pady=5)
 
-        # Task listbox
-        self.task_listbox = tk.Listbox(root, font=('Arial', 12), width=40, height=10, selectmode=tk.MULTIPLE)
-        self.task_listbox.pack(pady=10)
+        # Task listbox, showing a window of the task list
+        self.list_frame = tk.Frame(root)
+        self.list_frame.pack(pady=10)
+        self.task_listbox = tk.Listbox(self.list_frame, font=('Arial', 12), width=40, height=10, selectmode=tk.MULTIPLE, exportselection=False)
+        self.task_listbox.pack(side=tk.LEFT)
+        self.task_scrollbar = tk.Scrollbar(self.list_frame, orient=tk.VERTICAL)
+        self.task_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.task_view = VirtualListbox(self.task_listbox, self.task_scrollbar, self.tasks)
 
         # Buttons frame
         self.buttons_frame = tk.Frame(root)
@@ -41,26 +496,31 @@ class TodoApp:
         self.delete_button = tk.Button(self.buttons_frame, text="Delete Task(s)", font=('Arial', 12, 'bold'), bg="#E74C3C", command=self.delete_task)
         self.delete_button.grid(row=0, column=1, padx=5)
 
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def add_task(self):
         task = self.task_entry.get()
         if task:
             self.tasks.append(task)
-            self.refresh_task_list()
+            if self.journal is not None:
+                self.journal.add(task)
+            self.task_view.inserted(len(self.tasks) - 1)
             self.task_entry.delete(0, tk.END)
         else:
             messagebox.showwarning("Warning", "Please enter a task.")
 
     def delete_task(self):
-        selected_task_indices = self.task_listbox.curselection()
+        selected_task_indices = self.task_view.selection()
         if not selected_task_indices:
             messagebox.showwarning("Warning", "Please select one or more tasks to delete.")
             return
-        for index in reversed(selected_task_indices):
-            self.tasks.pop(index)
-        self.refresh_task_list()
+        self.tasks.delete(selected_task_indices)
+        if self.journal is not None:
+            self.journal.delete(selected_task_indices)
+        self.task_view.removed(selected_task_indices[0])
 
     def update_task(self):
-        selected_task_indices = self.task_listbox.curselection()
+        selected_task_indices = self.task_view.selection()
         if len(selected_task_indices) != 1:
             messagebox.showwarning("Warning", "Please select exactly one task to update.")
             return
@@ -68,17 +528,133 @@ class TodoApp:
         new_task = self.task_entry.get()
         if new_task:
             self.tasks[selected_task_index] = new_task
-            self.refresh_task_list()
+            if self.journal is not None:
+                self.journal.update(selected_task_index, new_task)
+            self.task_view.changed(selected_task_index)
             self.task_entry.delete(0, tk.END)
         else:
             messagebox.showwarning("Warning", "Please enter a task.")
 
-    def refresh_task_list(self):
-        self.task_listbox.delete(0, tk.END)
-        for index, task in enumerate(self.tasks):
-            self.task_listbox.insert(tk.END, f"{index + 1}. {task}")
+    def on_close(self):
+        if self.journal is not None:
+            self.journal.close()
+        self.root.destroy()
+
+# Writes a snapshot of `size` tasks and a journal tail of `tail` records in a temporary
+# folder, then times loading them, a burst of edits with group commit, and compaction
+def benchmark_journal(size, tail, burst=10000):
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, "tasks")
+        journal = TaskJournal(path)
+        journal.write_snapshot(0, TaskStore(f"Task {i}" for i in range(size)).blocks)
+        with open(path + ".journal.1", "w", encoding="utf-8") as file:
+            for i in range(tail):
+                file.write(f"update\t{i}\tUpdated {i}\n" if i % 2 else f"add\tAdded {i}\n")
+
+        journal = TaskJournal(path)
+        begin = time.perf_counter()
+        tasks = journal.load()
+        print(f"load {len(tasks)} tasks ({tail} journal records): {time.perf_counter() - begin:.2f}s")
+
+        begin = time.perf_counter()
+        for i in range(burst):
+            tasks.append(f"Burst {i}")
+            journal.add(f"Burst {i}")
+        journal.sync()
+        elapsed = time.perf_counter() - begin
+        print(f"burst of {burst} edits: {elapsed * 1000:.0f}ms, {journal.flushes} fsyncs")
+
+        # The burst may have started a compaction already
+        if journal.compactor is not None:
+            journal.compactor.join()
+        begin = time.perf_counter()
+        journal.compact()
+        print(f"compaction pause: {(time.perf_counter() - begin) * 1000:.0f}ms")
+        journal.close()
+        print(f"snapshot written, journals left: {journal.journals()}")
+        expected = list(tasks)
+        reloaded = TaskJournal(path)
+        begin = time.perf_counter()
+        assert list(reloaded.load()) == expected
+        print(f"reload after compaction: {time.perf_counter() - begin:.2f}s")
+        reloaded.close()
+    finally:
+        shutil.rmtree(folder)
+
+# Times TaskStore against a plain list on `size` tasks: random inserts, deletes and
+# renames, and a bulk delete of `bulk` random positions done the old way (pop one
+# by one from the end) and with TaskStore.delete
+def benchmark(size, operations=10000, bulk=10000, seed=0):
+    rng = random.Random(seed)
+    tasks = [f"Task {i}" for i in range(size)]
+    begin = time.perf_counter()
+    store = TaskStore(tasks)
+    print(f"build {size} tasks: {time.perf_counter() - begin:.2f}s")
+    plain = list(tasks)
+
+    positions = [rng.randrange(size) for i in range(operations)]
+    for label, edit in (("insert", lambda target, position: target.insert(position, "new")),
+                        ("delete", lambda target, position: target.pop(position)),
+                        ("rename", lambda target, position: target.__setitem__(position, "renamed")),
+                        ("read", lambda target, position: target[position])):
+        timings = []
+        for target in (plain, store):
+            begin = time.perf_counter()
+            for position in positions:
+                edit(target, position)
+            timings.append((time.perf_counter() - begin) / operations * 1e6)
+        print(f"{label}: list {timings[0]:.2f}us, TaskStore {timings[1]:.2f}us")
+
+    doomed = sorted(rng.sample(range(len(plain)), bulk))
+    begin = time.perf_counter()
+    for position in reversed(doomed):
+        plain.pop(position)
+    popped = time.perf_counter() - begin
+    begin = time.perf_counter()
+    store.delete(doomed)
+    deleted = time.perf_counter() - begin
+    assert list(store) == plain
+    print(f"bulk delete of {bulk}: list pops {popped * 1000:.1f}ms, TaskStore {deleted * 1000:.1f}ms")
+
+    # Rendering needs a display
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("no display, skipping the Listbox timings")
+        return
+    app = TodoApp(root, store)
+    begin = time.perf_counter()
+    for i in range(100):
+        app.task_view.scroll(rng.randrange(-1000, 1000))
+    scrolled = (time.perf_counter() - begin) / 100
+    begin = time.perf_counter()
+    for i in range(100):
+        app.tasks.delete([app.task_view.top])
+        app.task_view.removed(app.task_view.top)
+    removed = (time.perf_counter() - begin) / 100
+    print(f"Listbox: scroll {scrolled * 1000:.2f}ms, delete in view {removed * 1000:.2f}ms")
+    root.destroy()
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = TodoApp(root)
-    root.mainloop()
+    parser = argparse.ArgumentParser(description="To-Do List")
+    subparsers = parser.add_subparsers(dest="command")
+    benchmark_parser = subparsers.add_parser("benchmark", help="time TaskStore edits against a plain list")
+    benchmark_parser.add_argument("--tasks", type=int, default=1000000)
+    journal_parser = subparsers.add_parser("benchmark-journal", help="time loading, journaling and compacting a saved task list")
+    journal_parser.add_argument("--tasks", type=int, default=1000000)
+    journal_parser.add_argument("--tail", type=int, default=JOURNAL_COMPACT_RECORDS, help="journal records after the snapshot")
+    parser.add_argument("--tasks-file", default=TASKS_PATH, help="base path of the saved task list")
+    args = parser.parse_args()
+
+    if args.command == "benchmark":
+        benchmark(args.tasks)
+    elif args.command == "benchmark-journal":
+        benchmark_journal(args.tasks, args.tail)
+    else:
+        journal = TaskJournal(args.tasks_file)
+        tasks = journal.load()
+        root = tk.Tk()
+        tk_instrument.instrument(root)
+        app = TodoApp(root, tasks, journal)
+        root.mainloop()
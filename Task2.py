@@ -1,25 +1,323 @@
 #This Python program creates a visually appealing and functional calculator using the Tkinter library. The calculator features a clean and modern design with well-organized buttons for digits and basic arithmetic operations (addition, subtraction, multiplication, division). The display area is prominently placed at the top, showing user inputs and results. The operation buttons are color-coded for easy identification, and all buttons are evenly spaced for a neat layout. The calculator handles exceptions gracefully, displaying error messages for invalid operations, such as division by zero. Overall, this user-friendly calculator combines aesthetic design with practical functionality.
 
+import argparse
+import operator
+import os
+import random
+import re
+import sys
+import time
 import tkinter as tk
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from tkinter import messagebox
+import tk_instrument
+
+# NumPy is only needed for the vectorized template path
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Number of parsed expressions kept by the expression cache
+EXPRESSION_CACHE_SIZE = 1024
+
+# Largest integer exponent the live preview computes for a base other than 0, 1 or -1
+LIVE_EXPONENT_LIMIT = 10000
+
+# Largest integer result, in bits, that ** computes; 9**9**9 would otherwise run for
+# hours in the GUI thread or a batch worker
+POWER_RESULT_BITS_LIMIT = 1 << 20
+
+# Expressions handed to each worker process in batch mode
+BATCH_CHUNK_SIZE = 10000
+
+# Tokens of the keypad grammar: numbers (with an optional decimal point) and + - * /.
+# Pressing * or / twice gives ** and //, which eval used to accept, so they are kept.
+# Names are only valid as operands in vectorized templates. The last two groups catch
+# whitespace and anything invalid.
+TOKEN_PATTERN = re.compile(r"(\d+\.?\d*|\.\d+)|([A-Za-z_]\w*)|(\*\*|//|[-+*/])|(\s+)|(.)")
+
+# Function for **, refusing integer powers whose result would exceed the size limit.
+# Float powers overflow on their own and arrays in templates are left to NumPy.
+def bounded_power(base, exponent):
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and (abs(base).bit_length() - 1) * exponent > POWER_RESULT_BITS_LIMIT:
+        raise OverflowError("Result too large")
+    return base ** exponent
+
+# Binary operators with their precedence. Unary signs bind tighter than * and /, but
+# ** binds tighter still on its left and is right associative, as in Python.
+BINARY_OPERATORS = {"+": (1, operator.add), "-": (1, operator.sub), "*": (2, operator.mul), "/": (2, operator.truediv), "//": (2, operator.floordiv), "**": (4, bounded_power)}
+UNARY_PRECEDENCE = 3
+
+# Function to split an expression into numbers, operand names and operator characters
+def tokenize(expression, allow_names=False):
+    tokens = []
+    for number, name, symbol, space, invalid in TOKEN_PATTERN.findall(expression):
+        if number:
+            tokens.append(float(number) if "." in number else int(number))
+        elif name:
+            if not allow_names:
+                raise ValueError(f"Invalid character {name[0]!r}")
+            tokens.append(Operand(name))
+        elif symbol:
+            tokens.append(symbol)
+        elif invalid:
+            raise ValueError(f"Invalid character {invalid!r}")
+    return tokens
+
+# Named operand of a vectorized template, bound to an array when the template runs
+class Operand(str):
+    pass
+
+# Function to compile an expression into a postfix program (shunting-yard). The program is
+# a tuple of steps: (None, number) pushes a number, (operator.neg, None) negates the top of
+# the stack and any other (function, None) pops two operands and pushes the result.
+# Evaluation is a flat loop, so even very long chains never recurse.
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(expression, allow_names=False):
+    program = []
+    pending = []
+    expect_operand = True
+    for token in tokenize(expression, allow_names):
+        if not isinstance(token, str) or isinstance(token, Operand):
+            if not expect_operand:
+                raise ValueError("Missing operator between numbers")
+            program.append((None, token))
+            expect_operand = False
+        elif expect_operand:
+            if token not in "+-":
+                raise ValueError(f"Missing number before {token!r}")
+            if token == "-":
+                pending.append((UNARY_PRECEDENCE, operator.neg))
+        else:
+            precedence, function = BINARY_OPERATORS[token]
+            # Pop what binds at least as tightly; ** only pops tighter operators
+            while pending and (pending[-1][0] > precedence or (pending[-1][0] == precedence and token != "**")):
+                program.append((pending.pop()[1], None))
+            pending.append((precedence, function))
+            expect_operand = True
+    if expect_operand:
+        raise ValueError("Incomplete expression")
+    while pending:
+        program.append((pending.pop()[1], None))
+    return tuple(program)
+
+# Function to run a compiled postfix program
+def run_program(program):
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    neg = operator.neg
+    for function, value in program:
+        if function is None:
+            push(value)
+        elif function is neg:
+            stack[-1] = -stack[-1]
+        else:
+            right = pop()
+            stack[-1] = function(stack[-1], right)
+    return stack[0]
+
+# Function to evaluate a keypad expression without eval
+def evaluate(expression):
+    return run_program(compile_expression(expression))
+
+# Function to evaluate one line of a batch, reporting errors the way the GUI does
+def evaluate_line(line):
+    try:
+        return str(evaluate(line))
+    except ZeroDivisionError:
+        return "Error: Cannot divide by zero"
+    except (ValueError, ArithmeticError) as e:
+        return f"Error: {e}"
+
+# Function run by the worker processes
+def evaluate_chunk(lines):
+    return [evaluate_line(line) for line in lines]
+
+# Function to stream results for an iterable of expressions, in input order. Chunks are
+# fanned out to a process pool with at most two chunks per worker in flight, so memory
+# stays bounded however long the input is.
+def evaluate_batch(lines, workers=None, chunk_size=BATCH_CHUNK_SIZE):
+    lines = (line.rstrip("\r\n") for line in lines)
+    chunks = iter(lambda: list(islice(lines, chunk_size)), [])
+    if workers == 1:
+        for chunk in chunks:
+            yield from evaluate_chunk(chunk)
+        return
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(evaluate_chunk, chunk))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+# Function to evaluate one template such as "a*b+c" over NumPy arrays of operands. The
+# compiled program runs once with arrays in place of numbers, so every row is computed
+# by NumPy; division by zero gives inf or nan for that row instead of raising.
+def evaluate_template(template, operands):
+    if np is None:
+        raise RuntimeError("NumPy is required for vectorized evaluation")
+    program = compile_expression(template, allow_names=True)
+    bound = []
+    for function, value in program:
+        if isinstance(value, Operand):
+            if value not in operands:
+                raise ValueError(f"No operand named {value!r}")
+            value = np.asarray(operands[value])
+        bound.append((function, value))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return run_program(bound)
+
+# Incremental evaluator behind the live result preview. It keeps the expression as
+# accumulators instead of a token list: the sum of finished terms, the product of the
+# finished factors of the current term, and the power chain of the current factor (whose
+# last element is the number being typed). Appending a character updates these in
+# amortized O(1) and the preview folds them together in the same left-to-right order as
+# run_program, so it always matches what = will show.
+class LiveEvaluator:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.total = None
+        self.add_op = None
+        self.term = None
+        self.term_op = None
+        self.chain = []
+        self.number = ""
+        self.pending = ""
+        self.negative = False
+        self.signed = False
+        self.error = None
+
+    def push(self, char):
+        if self.error:
+            return
+        try:
+            if char.isdigit() or char == ".":
+                self.push_digit(char)
+            else:
+                self.push_operator(char)
+        except ZeroDivisionError:
+            self.error = "Cannot divide by zero"
+        except (ValueError, ArithmeticError) as e:
+            self.error = str(e)
+
+    def push_digit(self, char):
+        if self.number:
+            if char == "." and "." in self.number:
+                raise ValueError("Missing operator between numbers")
+            self.number += char
+            self.chain[-1][1] = self.number_value()
+            return
+        if self.chain and not self.pending:
+            raise ValueError("Missing operator between numbers")
+        self.fold(self.pending)
+        self.number = char
+        self.chain.append([self.negative, self.number_value()])
+        self.pending = ""
+        self.negative = False
+        self.signed = False
+
+    def push_operator(self, char):
+        if self.number == ".":
+            raise ValueError("Invalid character '.'")
+        if self.number:
+            self.number = ""
+            self.pending = char
+        elif self.pending in ("*", "/") and char == self.pending and not self.signed:
+            self.pending += char
+        elif char in "+-":
+            self.negative ^= char == "-"
+            self.signed = True
+        else:
+            raise ValueError(f"Missing number before {char!r}")
+
+    # A lone "." is not a number yet; it stays out of the preview until a digit follows
+    def number_value(self):
+        if self.number == ".":
+            return None
+        return float(self.number) if "." in self.number else int(self.number)
+
+    # Applies the operator that separated the finished factor from the next number
+    def fold(self, op):
+        if op == "**" or not self.chain:
+            return
+        factor = self.chain_value()
+        self.term = factor if self.term is None else self.term_op(self.term, factor)
+        self.chain = []
+        if op in ("+", "-"):
+            self.total = self.term if self.total is None else self.add_op(self.total, self.term)
+            self.add_op = BINARY_OPERATORS[op][1]
+            self.term = None
+            self.term_op = None
+        else:
+            self.term_op = BINARY_OPERATORS[op][1]
+
+    # Power chains are right associative and a sign applies after its power, as in Python
+    def chain_value(self):
+        value = None
+        for negative, number in reversed(self.chain):
+            if number is None:
+                continue
+            if value is None:
+                value = number
+            elif isinstance(value, int) and value > LIVE_EXPONENT_LIMIT and abs(number) > 1:
+                # Typing 9**9**9 must not freeze the window while the preview is computed
+                raise OverflowError("Result too large to preview")
+            else:
+                value = number ** value
+            if negative:
+                value = -value
+        return value
+
+    # Value of everything typed so far, ignoring a trailing operator or lone "."
+    def preview(self):
+        if self.error:
+            return f"Error: {self.error}"
+        try:
+            value = self.chain_value()
+            if self.term is not None:
+                value = self.term if value is None else self.term_op(self.term, value)
+            if self.total is not None:
+                value = self.total if value is None else self.add_op(self.total, value)
+            return "" if value is None else str(value)
+        except ZeroDivisionError:
+            return "Error: Cannot divide by zero"
+        except (ValueError, ArithmeticError) as e:
+            return f"Error: {e}"
 
 # Function to update the input field
 def btn_click(item):
     global expression
     expression = expression + str(item)
     input_text.set(expression)
+    for char in str(item):
+        live.push(char)
+    result_text.set(live.preview())
 
 # Function to clear the input field
 def bt_clear(): 
     global expression 
     expression = "" 
     input_text.set("")
+    live.clear()
+    result_text.set("")
  
 # Function to evaluate the expression
 def bt_equal():
+    live.clear()
+    result_text.set("")
     try:
         global expression
-        result = str(eval(expression))
+        result = str(evaluate(expression))
         input_text.set(result)
         expression = ""
     except ZeroDivisionError:
@@ -31,55 +329,159 @@ def bt_equal():
         expression = ""
         input_text.set("")
 
-# Creating the main window
-root = tk.Tk()
-root.title("Simple Calculator")
-root.geometry("335x450")
-root.resizable(False, False)
+# Micro-benchmark of the expression engine against eval
+def benchmark(repeat=1000):
+    short = ["7+8", "12.5*4-3/2", "9-3*2+8/4-1"]
+    long = ["+".join(["12*3-4/2"] * 250), "+".join(["12*3-4/2"] * 2500)]
+    print(f"{'expression':>22} {'eval us':>10} {'cold us':>10} {'cached us':>10}")
+    for expression in short + long:
+        runs = repeat if len(expression) < 100 else max(1, repeat // 100)
+        label = expression if len(expression) <= 22 else f"{len(expression)} chars"
+        try:
+            begin = time.perf_counter()
+            for _ in range(runs):
+                eval(expression)
+            eval_time = f"{(time.perf_counter() - begin) / runs * 1e6:10.1f}"
+        except (RecursionError, MemoryError, SyntaxError):
+            eval_time = f"{'fails':>10}"
+        begin = time.perf_counter()
+        for _ in range(runs):
+            compile_expression.cache_clear()
+            evaluate(expression)
+        cold = (time.perf_counter() - begin) / runs * 1e6
+        begin = time.perf_counter()
+        for _ in range(runs):
+            evaluate(expression)
+        cached = (time.perf_counter() - begin) / runs * 1e6
+        print(f"{label:>22} {eval_time} {cold:10.1f} {cached:10.1f}")
 
-# Global expression variable and StringVar for the input field
+# Latency of the live preview per keystroke on a long expression, against re-evaluating
+# the whole expression string on every keystroke
+def benchmark_live(tokens=10000):
+    rng = random.Random(0)
+    parts = [str(rng.randint(1, 999))]
+    while len(parts) < tokens:
+        parts += [rng.choice("+-*/"), str(rng.randint(1, 999))]
+    keystrokes = "".join(parts)
+    evaluator = LiveEvaluator()
+    latencies = []
+    for char in keystrokes:
+        begin = time.perf_counter()
+        evaluator.push(char)
+        evaluator.preview()
+        latencies.append(time.perf_counter() - begin)
+    latencies.sort()
+    rescans = []
+    for end in range(len(keystrokes) - 50, len(keystrokes)):
+        compile_expression.cache_clear()
+        begin = time.perf_counter()
+        try:
+            str(evaluate(keystrokes[:end]))
+        except (ValueError, ArithmeticError):
+            pass
+        rescans.append(time.perf_counter() - begin)
+    print(f"{len(parts)} tokens, {len(keystrokes)} keystrokes")
+    print(f"incremental: mean {sum(latencies) / len(latencies) * 1e6:.1f} us, p99 {latencies[len(latencies) * 99 // 100] * 1e6:.1f} us, max {latencies[-1] * 1e6:.1f} us")
+    print(f"full re-evaluation at the end: mean {sum(rescans) / len(rescans) * 1e6:.1f} us")
+
+# Global expression variable and the live preview state
 expression = ""
-input_text = tk.StringVar()
-
-# Creating the input field frame
-input_frame = tk.Frame(root, width=312, height=50, bd=0, highlightbackground="black", highlightcolor="black", highlightthickness=1)
-input_frame.pack(side=tk.TOP)
-
-# Creating the input field
-input_field = tk.Entry(input_frame, font=('arial', 18, 'bold'), textvariable=input_text, width=50, bg="#eee", bd=0, justify=tk.RIGHT)
-input_field.grid(row=0, column=0)
-input_field.pack(ipady=10)
-
-# Creating the buttons frame
-btns_frame = tk.Frame(root, width=312, height=324, bg="grey")
-btns_frame.pack()
-
-# Adding buttons to the buttons frame
-# First row
-clear = tk.Button(btns_frame, text="C", fg="black", width=32, height=3, bd=0, bg="#f2a33c", cursor="hand2", command=lambda: bt_clear()).grid(row=0, column=0, columnspan=3, padx=5, pady=5)
-divide = tk.Button(btns_frame, text="/", fg="black", width=10, height=3, bd=0, bg="#ffcccb", cursor="hand2", command=lambda: btn_click("/")).grid(row=0, column=3, padx=5, pady=5)
-
-# Second row
-seven = tk.Button(btns_frame, text="7", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(7)).grid(row=1, column=0, padx=5, pady=5)
-eight = tk.Button(btns_frame, text="8", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(8)).grid(row=1, column=1, padx=5, pady=5)
-nine = tk.Button(btns_frame, text="9", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(9)).grid(row=1, column=2, padx=5, pady=5)
-multiply = tk.Button(btns_frame, text="*", fg="black", width=10, height=3, bd=0, bg="#ffcccb", cursor="hand2", command=lambda: btn_click("*")).grid(row=1, column=3, padx=5, pady=5)
-
-# Third row
-four = tk.Button(btns_frame, text="4", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(4)).grid(row=2, column=0, padx=5, pady=5)
-five = tk.Button(btns_frame, text="5", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(5)).grid(row=2, column=1, padx=5, pady=5)
-six = tk.Button(btns_frame, text="6", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(6)).grid(row=2, column=2, padx=5, pady=5)
-minus = tk.Button(btns_frame, text="-", fg="black", width=10, height=3, bd=0, bg="#ffcccb", cursor="hand2", command=lambda: btn_click("-")).grid(row=2, column=3, padx=5, pady=5)
-
-# Fourth row
-one = tk.Button(btns_frame, text="1", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(1)).grid(row=3, column=0, padx=5, pady=5)
-two = tk.Button(btns_frame, text="2", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(2)).grid(row=3, column=1, padx=5, pady=5)
-three = tk.Button(btns_frame, text="3", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(3)).grid(row=3, column=2, padx=5, pady=5)
-plus = tk.Button(btns_frame, text="+", fg="black", width=10, height=3, bd=0, bg="#ffcccb", cursor="hand2", command=lambda: btn_click("+")).grid(row=3, column=3, padx=5, pady=5)
-
-# Fifth row
-zero = tk.Button(btns_frame, text="0", fg="black", width=21, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(0)).grid(row=4, column=0, columnspan=2, padx=5, pady=5)
-point = tk.Button(btns_frame, text=".", fg="black", width=10, height=3, bd=0, bg="#ffcccb", cursor="hand2", command=lambda: btn_click(".")).grid(row=4, column=2, padx=5, pady=5)
-equals = tk.Button(btns_frame, text="=", fg="black", width=10, height=3, bd=0, bg="#f2a33c", cursor="hand2", command=lambda: bt_equal()).grid(row=4, column=3, padx=5, pady=5)
-
-root.mainloop()
+live = LiveEvaluator()
+
+# Creating the main window
+def run_gui():
+    global root, input_text, result_text
+
+    root = tk.Tk()
+    tk_instrument.instrument(root)
+    root.title("Simple Calculator")
+    root.geometry("335x480")
+    root.resizable(False, False)
+
+    # StringVar for the input field
+    input_text = tk.StringVar()
+
+    # Creating the input field frame
+    input_frame = tk.Frame(root, width=312, height=50, bd=0, highlightbackground="black", highlightcolor="black", highlightthickness=1)
+    input_frame.pack(side=tk.TOP)
+
+    # Creating the input field
+    input_field = tk.Entry(input_frame, font=('arial', 18, 'bold'), textvariable=input_text, width=50, bg="#eee", bd=0, justify=tk.RIGHT)
+    input_field.grid(row=0, column=0)
+    input_field.pack(ipady=10)
+
+    # Live result preview
+    result_text = tk.StringVar()
+    result_label = tk.Label(input_frame, font=('arial', 12), textvariable=result_text, bg="#eee", fg="#555", anchor=tk.E)
+    result_label.pack(fill=tk.X)
+
+    # Creating the buttons frame
+    btns_frame = tk.Frame(root, width=312, height=324, bg="grey")
+    btns_frame.pack()
+
+    # Adding buttons to the buttons frame
+    # First row
+    clear = tk.Button(btns_frame, text="C", fg="black", width=32, height=3, bd=0, bg="#f2a33c", cursor="hand2", command=lambda: bt_clear()).grid(row=0, column=0, columnspan=3, padx=5, pady=5)
+    divide = tk.Button(btns_frame, text="/", fg="black", width=10, height=3, bd=0, bg="#ffcccb", cursor="hand2", command=lambda: btn_click("/")).grid(row=0, column=3, padx=5, pady=5)
+
+    # Second row
+    seven = tk.Button(btns_frame, text="7", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(7)).grid(row=1, column=0, padx=5, pady=5)
+    eight = tk.Button(btns_frame, text="8", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(8)).grid(row=1, column=1, padx=5, pady=5)
+    nine = tk.Button(btns_frame, text="9", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(9)).grid(row=1, column=2, padx=5, pady=5)
+    multiply = tk.Button(btns_frame, text="*", fg="black", width=10, height=3, bd=0, bg="#ffcccb", cursor="hand2", command=lambda: btn_click("*")).grid(row=1, column=3, padx=5, pady=5)
+
+    # Third row
+    four = tk.Button(btns_frame, text="4", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(4)).grid(row=2, column=0, padx=5, pady=5)
+    five = tk.Button(btns_frame, text="5", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(5)).grid(row=2, column=1, padx=5, pady=5)
+    six = tk.Button(btns_frame, text="6", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(6)).grid(row=2, column=2, padx=5, pady=5)
+    minus = tk.Button(btns_frame, text="-", fg="black", width=10, height=3, bd=0, bg="#ffcccb", cursor="hand2", command=lambda: btn_click("-")).grid(row=2, column=3, padx=5, pady=5)
+
+    # Fourth row
+    one = tk.Button(btns_frame, text="1", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(1)).grid(row=3, column=0, padx=5, pady=5)
+    two = tk.Button(btns_frame, text="2", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(2)).grid(row=3, column=1, padx=5, pady=5)
+    three = tk.Button(btns_frame, text="3", fg="black", width=10, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(3)).grid(row=3, column=2, padx=5, pady=5)
+    plus = tk.Button(btns_frame, text="+", fg="black", width=10, height=3, bd=0, bg="#ffcccb", cursor="hand2", command=lambda: btn_click("+")).grid(row=3, column=3, padx=5, pady=5)
+
+    # Fifth row
+    zero = tk.Button(btns_frame, text="0", fg="black", width=21, height=3, bd=0, bg="#fff", cursor="hand2", command=lambda: btn_click(0)).grid(row=4, column=0, columnspan=2, padx=5, pady=5)
+    point = tk.Button(btns_frame, text=".", fg="black", width=10, height=3, bd=0, bg="#ffcccb", cursor="hand2", command=lambda: btn_click(".")).grid(row=4, column=2, padx=5, pady=5)
+    equals = tk.Button(btns_frame, text="=", fg="black", width=10, height=3, bd=0, bg="#f2a33c", cursor="hand2", command=lambda: bt_equal()).grid(row=4, column=3, padx=5, pady=5)
+
+    root.mainloop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simple Calculator")
+    subparsers = parser.add_subparsers(dest="command")
+    bench_parser = subparsers.add_parser("benchmark", help="compare the expression engine with eval")
+    bench_parser.add_argument("--repeat", type=int, default=1000)
+    batch_parser = subparsers.add_parser("batch", help="evaluate one expression per line from a file or stdin")
+    batch_parser.add_argument("input", nargs="?", default="-")
+    batch_parser.add_argument("--output", default="-")
+    batch_parser.add_argument("--workers", type=int, default=None)
+    batch_parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE)
+    template_parser = subparsers.add_parser("template", help="evaluate a template like 'a*b+c' over the columns of a CSV file (needs NumPy)")
+    template_parser.add_argument("template")
+    template_parser.add_argument("operands", help="CSV file whose header names the template operands")
+    live_bench_parser = subparsers.add_parser("benchmark-live", help="measure live preview latency per keystroke")
+    live_bench_parser.add_argument("--tokens", type=int, default=10000)
+    args = parser.parse_args()
+
+    if args.command == "batch":
+        source = sys.stdin if args.input == "-" else open(args.input)
+        target = sys.stdout if args.output == "-" else open(args.output, "w")
+        with source, target:
+            for result in evaluate_batch(source, args.workers, args.chunk_size):
+                target.write(result + "\n")
+    elif args.command == "template":
+        if np is None:
+            parser.error("NumPy is required for vectorized evaluation")
+        columns = np.genfromtxt(args.operands, delimiter=",", names=True)
+        operands = {name: columns[name] for name in columns.dtype.names}
+        for result in np.atleast_1d(evaluate_template(args.template, operands)):
+            print(result)
+    elif args.command == "benchmark-live":
+        benchmark_live(args.tokens)
+    elif args.command == "benchmark":
+        benchmark(args.repeat)
+    else:
+        run_gui()
@@ -1,46 +1,744 @@
 # This Python program is a versatile password generator built with Tkinter. Users can specify the desired password length and choose from four character types: digits, uppercase letters, lowercase letters, and special symbols. Each selected type is guaranteed to be included at least once in the generated password, ensuring robust security. The interface displays the number of each character type used in the password and adjusts its size dynamically based on password length. Additionally, the program allows users to easily copy the generated password to the clipboard. This tool is ideal for creating strong, customized passwords for enhanced online security.
 
+import argparse
+import hashlib
+import http.client
+import itertools
+import json
+import math
+import mmap
+import os
+import secrets
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
 import tkinter as tk
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from tkinter import messagebox
-import random
+import tk_instrument
 import string
-import pyperclip
 
+# pyperclip is only used for copying; without it the Tk clipboard is used
+try:
+    import pyperclip
+except ImportError:
+    pyperclip = None
+
+# Character classes in the order of the checkboxes: digits, uppercase, lowercase, symbols
+CHARACTER_CLASSES = [string.digits, string.ascii_uppercase, string.ascii_lowercase, string.punctuation]
+
+# Maps every character to its class letter, so one str.translate pass plus str.count
+# gives the class counts of a password
+CLASS_TABLE = str.maketrans({char: letter for chars, letter in zip(CHARACTER_CLASSES, "duls") for char in chars})
+
+# Random bytes drawn from the OS per batch in bulk generation
+RANDOM_BATCH_BYTES = 1 << 16
+
+# Checkbox policies up to this length are drawn by the exact PasswordSampler. Longer
+# ones use the byte-table generator, whose candidates then miss a selected type with
+# probability below 1e-6, so its rejection loop practically never runs
+PLAIN_SAMPLER_LENGTH = 128
+
+# Passwords written to the output file at a time
+WRITE_BATCH_SIZE = 10000
+
+# Characters that are easy to confuse when read or typed
+AMBIGUOUS_CHARACTERS = "0O1lI|`'\""
+
+# Total size of the compiled policies kept by policy_sampler; a sampler's tables grow
+# with the square of the password length
+POLICY_CACHE_BYTES = 64 << 20
+
+# Port of the local password service
+SERVICE_PORT = 8765
+
+# Most passwords kept ready for one policy by the service
+SERVICE_BUFFER_SIZE = 20000
+
+# Largest refill job handed to a pool worker
+SERVICE_BATCH_SIZE = 5000
+
+# Policies the service keeps buffers for; the least recently used idle one is dropped
+# to make room, and any unused for SERVICE_POLICY_IDLE_SECONDS are dropped as well
+SERVICE_MAX_POLICIES = 64
+SERVICE_POLICY_IDLE_SECONDS = 600
+
+# Largest number of passwords one request may ask for
+SERVICE_MAX_COUNT = 10000
+
+# Longest password the service generates
+SERVICE_MAX_LENGTH = 1024
+
+# Limits for policies beyond the checkbox options, which go through PasswordSampler:
+# a sample costs O(length ** 2) and compiling O(states * length ** 2), about 0.4 ms
+# and 0.35 s at these limits
+SERVICE_MAX_SAMPLER_LENGTH = 128
+SERVICE_MAX_SAMPLER_COST = 2500000
+
+# Bloom filter of leaked passwords, opened at startup if present
+BREACH_FILTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "breached.bloom")
+
+# Target false positive rate when sizing a new breach filter
+BREACH_ERROR_RATE = 0.001
+
+# Attempts to draw a password that is not in the breach filter before giving up
+MAX_BREACH_ATTEMPTS = 100
+
+# Breach filter file header: magic, number of bits, number of hash functions
+BREACH_HEADER = struct.Struct("<8sQI")
+BREACH_MAGIC = b"PWBLOOM1"
+
+# Bit positions of an entry, by double hashing the two halves of a 128-bit BLAKE2b digest
+def bloom_positions(data, bits, hashes):
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    first = int.from_bytes(digest[:8], "little")
+    step = int.from_bytes(digest[8:], "little") | 1
+    return [(first + i * step) % bits for i in range(hashes)]
+
+# Read-only Bloom filter backed by an mmap of the filter file. Lookups index the
+# mapping directly, so only the touched pages are ever read from disk.
+class BreachFilter:
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            # Check the header and size first: mmap fails on an empty file, and a
+            # truncated one would fail or read past the end on lookups
+            header = file.read(BREACH_HEADER.size)
+            if len(header) < BREACH_HEADER.size or header[:len(BREACH_MAGIC)] != BREACH_MAGIC:
+                raise ValueError(f"{path} is not a breach filter file.")
+            magic, self.bits, self.hashes = BREACH_HEADER.unpack(header)
+            size = os.fstat(file.fileno()).st_size
+            expected = BREACH_HEADER.size + (self.bits + 7) // 8
+            if not self.bits or not self.hashes or size != expected:
+                raise ValueError(f"{path} is damaged or truncated ({size} bytes, expected {expected}); rebuild it with build-filter.")
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __contains__(self, password):
+        data = self.data
+        offset = BREACH_HEADER.size
+        for position in bloom_positions(password.encode("utf-8"), self.bits, self.hashes):
+            if not data[offset + (position >> 3)] >> (position & 7) & 1:
+                return False
+        return True
+
+    def close(self):
+        self.data.close()
+
+# Loaded breach filter, or None when screening is off
+breach_filter = None
+
+def load_breach_filter(path=BREACH_FILTER_PATH):
+    global breach_filter
+    if os.path.exists(path):
+        breach_filter = BreachFilter(path)
+    return breach_filter
+
+def is_breached(password):
+    return breach_filter is not None and password in breach_filter
+
+# Builds a filter file from a corpus with one password per line. The file is sized
+# up front and the bits are set through a writable mmap, so the bit array never has
+# to fit in memory. Without a given entry count the corpus is counted in a first pass.
+def build_breach_filter(corpus_path, filter_path, entries=None, error_rate=BREACH_ERROR_RATE):
+    if entries is None:
+        with open(corpus_path, "rb") as corpus:
+            entries = sum(1 for line in corpus if line.strip(b"\r\n"))
+    entries = max(entries, 1)
+    bits = max(8, math.ceil(-entries * math.log(error_rate) / math.log(2) ** 2))
+    hashes = max(1, round(bits / entries * math.log(2)))
+    size = BREACH_HEADER.size + (bits + 7) // 8
+    with open(filter_path, "wb+") as file:
+        file.truncate(size)
+        with mmap.mmap(file.fileno(), size) as data:
+            BREACH_HEADER.pack_into(data, 0, BREACH_MAGIC, bits, hashes)
+            offset = BREACH_HEADER.size
+            with open(corpus_path, "rb") as corpus:
+                for line in corpus:
+                    line = line.rstrip(b"\r\n")
+                    if not line:
+                        continue
+                    for position in bloom_positions(line, bits, hashes):
+                        data[offset + (position >> 3)] |= 1 << (position & 7)
+            data.flush()
+    return bits, hashes
+
+def count_classes(password):
+    classes = password.translate(CLASS_TABLE)
+    return classes.count("d"), classes.count("u"), classes.count("l"), classes.count("s")
+
+# Uniform over all passwords that contain each selected type at least once; see
+# generate_passwords for how the password is drawn
 def generate_password(length, use_digits, use_uppercase, use_lowercase, use_symbols):
-    characters = ''
-    password = []
-    if use_digits:
-        characters += string.digits
-        password.append(random.choice(string.digits))
-    if use_uppercase:
-        characters += string.ascii_uppercase
-        password.append(random.choice(string.ascii_uppercase))
-    if use_lowercase:
-        characters += string.ascii_lowercase
-        password.append(random.choice(string.ascii_lowercase))
-    if use_symbols:
-        characters += string.punctuation
-        password.append(random.choice(string.punctuation))
-
-    if not characters:
-        messagebox.showerror("Error", "Please select at least one option for password generation.")
+    try:
+        password = next(generate_passwords(1, length, use_digits, use_uppercase, use_lowercase, use_symbols))
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
         return ""
 
-    # Generate the remaining characters randomly
-    while len(password) < length:
-        password.append(random.choice(characters))
-    
-    # Shuffle the list to avoid a predictable pattern
-    random.shuffle(password)
+    count_digits, count_uppercase, count_lowercase, count_symbols = count_classes(password)
 
-    password = ''.join(password)
+    return password, count_digits, count_uppercase, count_lowercase, count_symbols
 
-    count_digits = sum(c in string.digits for c in password)
-    count_uppercase = sum(c in string.ascii_uppercase for c in password)
-    count_lowercase = sum(c in string.ascii_lowercase for c in password)
-    count_symbols = sum(c in string.punctuation for c in password)
+# Samples uniformly from all passwords of a fixed length over some character classes,
+# with a minimum count per class and optionally no run of the same character longer
+# than max_run. The number of valid completions is counted for every generation state
+# (positions left, minimums still missing, class of the last character and its run
+# length) once per policy. A password is one random rank below the total count,
+# decoded position by position through those counts, so nothing is ever rejected.
+# The counts are integers of about length * log2(alphabet) bits, so compiling and
+# sampling both cost O(length ** 2) bit operations; plain checkbox policies longer than
+# PLAIN_SAMPLER_LENGTH use the byte-table generator instead.
+class PasswordSampler:
+    def __init__(self, length, classes, minimums, max_run=None):
+        self.length = length
+        self.classes = classes
+        self.max_run = max_run
+        self.limited = max_run is not None
 
-    return password, count_digits, count_uppercase, count_lowercase, count_symbols
+        # Enumerate the states; the last class is -1 before the first character
+        # and always when runs are not limited
+        deficits = list(itertools.product(*(range(minimum + 1) for minimum in minimums)))
+        if self.limited:
+            lasts = [(-1, 0)] + [(cls, run) for cls in range(len(classes)) for run in range(1, max_run + 1)]
+        else:
+            lasts = [(-1, 0)]
+        self.states = [(deficit, last, run) for deficit in deficits for last, run in lasts]
+        index = {state: i for i, state in enumerate(self.states)}
+        self.start = index[(tuple(minimums), -1, 0)]
+
+        # Transitions per state: (class, repeat of the last character, ways, next state)
+        self.transitions = []
+        for deficit, last, run in self.states:
+            options = []
+            for cls, chars in enumerate(classes):
+                missing = list(deficit)
+                missing[cls] = max(0, missing[cls] - 1)
+                missing = tuple(missing)
+                if not self.limited:
+                    options.append((cls, False, len(chars), index[(missing, -1, 0)]))
+                elif cls == last:
+                    if run < max_run:
+                        options.append((cls, True, 1, index[(missing, cls, run + 1)]))
+                    if len(chars) > 1:
+                        options.append((cls, False, len(chars) - 1, index[(missing, cls, 1)]))
+                else:
+                    options.append((cls, False, len(chars), index[(missing, cls, 1)]))
+            self.transitions.append(options)
+
+        # counts[r][state] is the number of valid ways to fill r more positions
+        self.counts = [[int(not any(deficit)) for deficit, last, run in self.states]]
+        for remaining in range(length):
+            below = self.counts[-1]
+            self.counts.append([sum(ways * below[target] for cls, same, ways, target in options) for options in self.transitions])
+        self.count = self.counts[length][self.start]
+        self.size = sum(sys.getsizeof(count) for row in self.counts for count in row)
+
+    def sample(self):
+        if not self.count:
+            raise ValueError("No password satisfies this policy.")
+        password = []
+        state = self.start
+        previous = 0
+        rank = secrets.randbelow(self.count)
+        for remaining in range(self.length, 0, -1):
+            below = self.counts[remaining - 1]
+            for cls, same, ways, target in self.transitions[state]:
+                weight = ways * below[target]
+                if rank < weight:
+                    break
+                rank -= weight
+            # Within the chosen option every character has the same number of completions
+            pick, rank = divmod(rank, below[target])
+            if same:
+                pick = previous
+            elif self.limited and cls == self.states[state][1] and pick >= previous:
+                pick += 1
+            password.append(self.classes[cls][pick])
+            previous = pick
+            state = target
+        return "".join(password)
+
+    def passwords(self):
+        while True:
+            yield self.sample()
+
+# Compiled samplers by policy, least recently used first, and their total size
+policy_samplers = OrderedDict()
+policy_samplers_size = 0
+policy_samplers_lock = threading.Lock()
+
+def clear_policy_samplers():
+    global policy_samplers_size
+    with policy_samplers_lock:
+        policy_samplers.clear()
+        policy_samplers_size = 0
+
+# Compiled sampler for a checkbox policy with the same minimum count for every selected
+# class and characters in exclude removed from the alphabet. Recently used samplers are
+# kept up to POLICY_CACHE_BYTES in total; a larger one is not kept at all.
+def policy_sampler(length, use_digits, use_uppercase, use_lowercase, use_symbols, min_count=1, exclude="", max_run=None):
+    global policy_samplers_size
+    key = (length, use_digits, use_uppercase, use_lowercase, use_symbols, min_count, exclude, max_run)
+    with policy_samplers_lock:
+        sampler = policy_samplers.get(key)
+        if sampler is not None:
+            policy_samplers.move_to_end(key)
+            return sampler
+    sampler = build_policy_sampler(*key)
+    with policy_samplers_lock:
+        if key not in policy_samplers and sampler.size <= POLICY_CACHE_BYTES:
+            policy_samplers[key] = sampler
+            policy_samplers_size += sampler.size
+            while policy_samplers_size > POLICY_CACHE_BYTES:
+                evicted_key, evicted = policy_samplers.popitem(last=False)
+                policy_samplers_size -= evicted.size
+    return sampler
+
+def build_policy_sampler(length, use_digits, use_uppercase, use_lowercase, use_symbols, min_count, exclude, max_run):
+    classes = [chars for chars, used in zip(CHARACTER_CLASSES, (use_digits, use_uppercase, use_lowercase, use_symbols)) if used]
+    if not classes:
+        raise ValueError("Please select at least one option for password generation.")
+    classes = ["".join(char for char in chars if char not in exclude) for chars in classes]
+    if not all(classes):
+        raise ValueError("Excluding those characters leaves a selected type empty.")
+    return PasswordSampler(length, classes, [min_count] * len(classes), max_run)
+
+# Translation table for unbiased sampling from random bytes: a byte below the largest
+# multiple of the alphabet size maps to alphabet[byte % size], the rest are rejected.
+# bytes.translate then filters and maps a whole batch in one C-level pass. Alphabets
+# come from the checkbox combinations, so there are at most 15 tables to cache.
+@lru_cache(maxsize=None)
+def byte_sampling_table(alphabet):
+    size = len(alphabet)
+    limit = 256 - 256 % size
+    table = bytes(alphabet[byte % size] if byte < limit else 0 for byte in range(256))
+    return table, bytes(range(limit, 256))
+
+# Endless passwords for a policy. Characters are drawn uniformly from the selected
+# classes using the OS CSPRNG, and a password missing one of the selected classes is
+# discarded, which keeps the result uniform over all valid passwords. The expected
+# number of candidates per password is 1 / P(all selected types present), which is
+# large for short passwords, so this is only used above PLAIN_SAMPLER_LENGTH. Random
+# bytes are drawn batch_bytes at a time.
+def random_passwords(length, classes, batch_bytes=RANDOM_BATCH_BYTES):
+    table, rejected = byte_sampling_table("".join(classes).encode("ascii"))
+    required = [set(chars) for chars in classes]
+    buffer = ""
+    while True:
+        buffer += secrets.token_bytes(batch_bytes).translate(table, rejected).decode("ascii")
+        usable = len(buffer) - len(buffer) % length
+        for start in range(0, usable, length):
+            password = buffer[start:start + length]
+            if not any(chars.isdisjoint(password) for chars in required):
+                yield password
+        buffer = buffer[usable:]
+
+# Takes count passwords that are not in the breach filter
+def screen_passwords(passwords, count):
+    if count <= 0:
+        return
+    produced = 0
+    breached = 0
+    for password in passwords:
+        if is_breached(password):
+            breached += 1
+            if breached == MAX_BREACH_ATTEMPTS:
+                raise ValueError("Could not generate a password that is not in the breach list. Try a longer password.")
+            continue
+        yield password
+        breached = 0
+        produced += 1
+        if produced == count:
+            return
+
+# Bulk generator of passwords for a checkbox policy. Up to PLAIN_SAMPLER_LENGTH every
+# password is one exact draw from the policy's PasswordSampler; longer ones come from
+# the byte-table generator, which is faster there and almost never rejects
+def generate_passwords(count, length, use_digits, use_uppercase, use_lowercase, use_symbols):
+    classes = [chars for chars, used in zip(CHARACTER_CLASSES, (use_digits, use_uppercase, use_lowercase, use_symbols)) if used]
+    if not classes:
+        raise ValueError("Please select at least one option for password generation.")
+    if len(classes) > length:
+        raise ValueError("Length is too short to include at least one of each selected type.")
+    if length <= PLAIN_SAMPLER_LENGTH:
+        sampler = policy_sampler(length, use_digits, use_uppercase, use_lowercase, use_symbols)
+        return screen_passwords(sampler.passwords(), count)
+    # Small requests draw about what they need instead of a whole batch
+    batch_bytes = min(RANDOM_BATCH_BYTES, max(256, 2 * count * length))
+    return screen_passwords(random_passwords(length, classes, batch_bytes), count)
+
+# Streams passwords to a file (or stdout) in batches and returns the elapsed time
+def write_passwords(output, passwords):
+    begin = time.perf_counter()
+    batch = []
+    for password in passwords:
+        batch.append(password)
+        if len(batch) == WRITE_BATCH_SIZE:
+            output.write("\n".join(batch) + "\n")
+            batch = []
+    if batch:
+        output.write("\n".join(batch) + "\n")
+    return time.perf_counter() - begin
+
+# A policy is the tuple (length, digits, uppercase, lowercase, symbols, min_count,
+# exclude_ambiguous, max_run), as taken by the bulk CLI and the service. Returns the
+# sampler for policies beyond the checkbox options, None for plain ones, and raises
+# ValueError for a policy no password satisfies.
+def check_policy(policy):
+    length, use_digits, use_uppercase, use_lowercase, use_symbols, min_count, exclude_ambiguous, max_run = policy
+    flags = (use_digits, use_uppercase, use_lowercase, use_symbols)
+    if min_count != 1 or exclude_ambiguous or max_run is not None:
+        exclude = AMBIGUOUS_CHARACTERS if exclude_ambiguous else ""
+        sampler = policy_sampler(length, *flags, min_count, exclude, max_run)
+        if not sampler.count:
+            raise ValueError("No password satisfies this policy.")
+        return sampler
+    if not any(flags):
+        raise ValueError("Please select at least one option for password generation.")
+    if sum(flags) > length:
+        raise ValueError("Length is too short to include at least one of each selected type.")
+    return None
+
+def policy_passwords(policy, count):
+    sampler = check_policy(policy)
+    if sampler is not None:
+        return screen_passwords(sampler.passwords(), count)
+    return generate_passwords(count, *policy[:5])
+
+# Pool worker job: one batch of passwords for a policy
+def generate_batch(policy, count):
+    return list(policy_passwords(policy, count))
+
+# Passwords ready for one policy, the refill work in flight for it and how many spare
+# passwords to keep ready
+class PolicyBuffer:
+    def __init__(self):
+        self.passwords = deque()
+        self.pending = 0
+        self.futures = set()
+        self.waiting = 0
+        self.target = 0
+        self.used = time.monotonic()
+        self.error = None
+
+# Serves passwords from per-policy buffers. Requests take from the buffer and only
+# wait when it runs short. A new policy only generates what its first request asks
+# for; every later request that finds the buffer short doubles the spare passwords
+# kept for it, up to SERVICE_BUFFER_SIZE, so only policies in steady use are buffered.
+# Once the passwords ready or in flight, less the demand of waiting requests, fall
+# below half of that target, they are topped up with jobs of up to SERVICE_BATCH_SIZE
+# for the process pool, so each job amortizes its pickling and wake-ups over many
+# requests. Buffers are kept in least recently used order and bounded by
+# SERVICE_MAX_POLICIES and SERVICE_POLICY_IDLE_SECONDS.
+class PasswordService:
+    def __init__(self, workers=None, breach_path=BREACH_FILTER_PATH):
+        self.pool = ProcessPoolExecutor(workers, initializer=load_breach_filter, initargs=(breach_path,))
+        self.condition = threading.Condition()
+        self.buffers = OrderedDict()
+
+    def take(self, policy, count):
+        # Fail fast on a policy that cannot produce passwords
+        check_policy(policy)
+        with self.condition:
+            buffer = self.buffers.get(policy)
+            if buffer is None:
+                self.evict(1)
+                buffer = self.buffers[policy] = PolicyBuffer()
+            else:
+                self.buffers.move_to_end(policy)
+                if len(buffer.passwords) < count:
+                    buffer.target = min(SERVICE_BUFFER_SIZE, max(count, 2 * buffer.target))
+            buffer.used = time.monotonic()
+            buffer.waiting += count
+            try:
+                # A job that finished before its callback was added fills the buffer
+                # inside refill, so the buffer is checked again before every wait
+                self.refill(policy, buffer)
+                while len(buffer.passwords) < count and buffer.error is None:
+                    self.condition.wait()
+                    self.refill(policy, buffer)
+                if buffer.error is not None:
+                    error, buffer.error = buffer.error, None
+                    raise error
+                passwords = [buffer.passwords.popleft() for i in range(count)]
+            finally:
+                buffer.waiting -= count
+            self.refill(policy, buffer)
+        return passwords
+
+    # Drops idle buffers unused for too long, and the least recently used ones until
+    # there is room for new policies. Buffers with waiting requests are kept.
+    # Called with the condition held.
+    def evict(self, new):
+        now = time.monotonic()
+        for policy, buffer in list(self.buffers.items()):
+            if len(self.buffers) + new <= SERVICE_MAX_POLICIES and now - buffer.used < SERVICE_POLICY_IDLE_SECONDS:
+                break
+            if buffer.waiting:
+                continue
+            del self.buffers[policy]
+            for future in list(buffer.futures):
+                future.cancel()
+
+    # Called with the condition held
+    def refill(self, policy, buffer):
+        available = len(buffer.passwords) + buffer.pending - buffer.waiting
+        if 2 * available >= buffer.target:
+            return
+        while available < buffer.target:
+            size = min(SERVICE_BATCH_SIZE, buffer.target - available)
+            buffer.pending += size
+            available += size
+            future = self.pool.submit(generate_batch, policy, size)
+            buffer.futures.add(future)
+            future.add_done_callback(lambda future, buffer=buffer, size=size: self.filled(buffer, size, future))
+
+    def filled(self, buffer, size, future):
+        with self.condition:
+            buffer.pending -= size
+            buffer.futures.discard(future)
+            # Jobs still queued are cancelled on close and when the buffer is dropped
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                buffer.error = future.exception()
+            else:
+                buffer.passwords.extend(future.result())
+            self.condition.notify_all()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+# Bounds on what one request can make the service compute. The sampler's state count
+# grows with min_count and max_run.
+def check_service_policy(policy):
+    length, use_digits, use_uppercase, use_lowercase, use_symbols, min_count, exclude_ambiguous, max_run = policy
+    if not 0 < length <= SERVICE_MAX_LENGTH:
+        raise ValueError(f"Length must be between 1 and {SERVICE_MAX_LENGTH}.")
+    if not 0 <= min_count <= length:
+        raise ValueError("Minimum count must be between 0 and the length.")
+    if max_run is not None and not 0 < max_run <= length:
+        raise ValueError("Maximum run must be between 1 and the length.")
+    if min_count != 1 or exclude_ambiguous or max_run is not None:
+        classes = use_digits + use_uppercase + use_lowercase + use_symbols
+        if length > SERVICE_MAX_SAMPLER_LENGTH:
+            raise ValueError(f"Length must be at most {SERVICE_MAX_SAMPLER_LENGTH} with a minimum count, excluded characters or a maximum run.")
+        states = (min_count + 1) ** classes * (1 + classes * (max_run or 0))
+        if states * length ** 2 > SERVICE_MAX_SAMPLER_COST:
+            raise ValueError("This policy is too large for the service; use a shorter length, smaller minimum count or shorter maximum run.")
+
+# A flag of a service request must be a JSON boolean; reading it by truthiness would
+# take the string "false" as true
+def request_flag(request, name, default):
+    value = request.get(name, default)
+    if not isinstance(value, bool):
+        raise ValueError(f"{name} must be true or false.")
+    return value
+
+# POST /passwords with a JSON body of the policy fields and a count; the reply is
+# {"passwords": [...]}. Connections are kept alive between requests.
+class PasswordRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Headers and body go out in separate writes, which Nagle's algorithm would delay
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        if self.path != "/passwords":
+            self.reply(404, {"error": "Not found."})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            count = int(request.get("count", 1))
+            if not 0 < count <= SERVICE_MAX_COUNT:
+                raise ValueError(f"Count must be between 1 and {SERVICE_MAX_COUNT}.")
+            max_run = request.get("max_run")
+            policy = (int(request.get("length", 16)), request_flag(request, "digits", True), request_flag(request, "uppercase", True),
+                      request_flag(request, "lowercase", True), request_flag(request, "symbols", True), int(request.get("min_count", 1)),
+                      request_flag(request, "exclude_ambiguous", False), None if max_run is None else int(max_run))
+            check_service_policy(policy)
+            passwords = self.server.service.take(policy, count)
+        except (ValueError, TypeError, AttributeError) as e:
+            self.reply(400, {"error": str(e)})
+            return
+        # Anything else, such as a broken process pool, is the service's fault
+        except Exception as e:
+            self.reply(500, {"error": f"Password generation failed: {str(e) or type(e).__name__}"})
+            return
+        self.reply(200, {"passwords": passwords})
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(port, workers, breach_path):
+    server = ThreadingHTTPServer(("127.0.0.1", port), PasswordRequestHandler)
+    server.daemon_threads = True
+    server.service = PasswordService(workers, breach_path)
+    print(f"Serving passwords on http://127.0.0.1:{server.server_address[1]}/passwords", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+
+# Load test against a running service: each client thread sends requests over its
+# own keep-alive connection for the given duration
+def load_test(port, clients, duration, count, length):
+    body = json.dumps({"count": count, "length": length}).encode("utf-8")
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + duration
+
+    def client():
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        try:
+            while time.perf_counter() < deadline:
+                begin = time.perf_counter()
+                connection.request("POST", "/passwords", body, {"Content-Type": "application/json"})
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+                latencies.append(time.perf_counter() - begin)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=client) for i in range(clients)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - begin
+    if not latencies:
+        print(f"No requests completed: {errors[:1]}")
+        return
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] * 1000
+    print(f"{len(latencies)} requests from {clients} clients in {elapsed:.1f}s: {len(latencies) / elapsed:,.0f} req/s, "
+          f"{len(latencies) * count / elapsed:,.0f} passwords/s, p50 {p50:.2f}ms, p99 {p99:.2f}ms, {len(errors)} errors")
+
+# Whether a password meets a sampler policy, checked directly for the statistics check
+def satisfies(password, classes, minimums, max_run):
+    for chars, minimum in zip(classes, minimums):
+        if sum(char in chars for char in password) < minimum:
+            return False
+    if max_run is not None:
+        return all(len(list(run)) <= max_run for char, run in itertools.groupby(password))
+    return True
+
+# Statistical check of the sampler: exact counts against brute-force enumeration,
+# a chi-square test of uniformity on small policies, and validity of samples from a
+# full-size policy. Returns False if any check fails.
+def check_sampler(samples_per_password):
+    passed = True
+    policies = [
+        (4, ["ab", "XYZ"], [1, 1], None),
+        (4, ["ab", "XYZ", "0"], [1, 1, 1], 1),
+        (5, ["ab", "XYZ"], [2, 1], 2),
+        (3, ["abc", "0"], [0, 2], None),
+    ]
+    for length, classes, minimums, max_run in policies:
+        sampler = PasswordSampler(length, classes, minimums, max_run)
+        valid = ["".join(chars) for chars in itertools.product("".join(classes), repeat=length)]
+        valid = [password for password in valid if satisfies(password, classes, minimums, max_run)]
+        if sampler.count != len(valid):
+            print(f"FAIL count {classes} {minimums} run {max_run}: {sampler.count} != {len(valid)}")
+            passed = False
+            continue
+
+        # Chi-square over every valid password, turned into a z-score with the
+        # Wilson-Hilferty approximation; z above 3.29 is p < 0.0005
+        draws = samples_per_password * len(valid)
+        observed = dict.fromkeys(valid, 0)
+        for i in range(draws):
+            password = sampler.sample()
+            if password not in observed:
+                print(f"FAIL invalid sample {password!r} for {classes} {minimums} run {max_run}")
+                passed = False
+                break
+            observed[password] += 1
+        else:
+            chi_square = sum((seen - samples_per_password) ** 2 for seen in observed.values()) / samples_per_password
+            freedom = len(valid) - 1
+            z = ((chi_square / freedom) ** (1 / 3) - (1 - 2 / (9 * freedom))) / math.sqrt(2 / (9 * freedom))
+            result = "ok" if z < 3.29 else "FAIL"
+            passed = passed and z < 3.29
+            print(f"{result} {classes} {minimums} run {max_run}: {len(valid)} passwords, {draws} draws, chi2 {chi_square:.1f}, z {z:.2f}")
+
+    sampler = policy_sampler(16, True, True, True, True, 2, AMBIGUOUS_CHARACTERS, 1)
+    invalid = [password for password in itertools.islice(sampler.passwords(), 10000)
+               if not satisfies(password, sampler.classes, [2] * 4, 1) or any(char in AMBIGUOUS_CHARACTERS for char in password)]
+    passed = passed and not invalid
+    print(f"{'FAIL' if invalid else 'ok'} 16 chars, 2 of each type, no ambiguous, no repeats: {len(invalid)} invalid of 10000")
+    return passed
+
+# Times compiling and sampling a few policies next to the bulk rejection generator
+def benchmark_sampler(count):
+    for label, args in (("16 chars, each type", (16, True, True, True, True)),
+                        ("16 chars, 2 of each, no ambiguous, no repeats", (16, True, True, True, True, 2, AMBIGUOUS_CHARACTERS, 1)),
+                        ("64 chars, 4 of each, runs up to 2", (64, True, True, True, True, 4, "", 2))):
+        clear_policy_samplers()
+        begin = time.perf_counter()
+        sampler = policy_sampler(*args)
+        compiled = time.perf_counter() - begin
+        begin = time.perf_counter()
+        for i in range(count):
+            sampler.sample()
+        elapsed = time.perf_counter() - begin
+        print(f"{label}: compile {compiled * 1000:.1f}ms, {count / elapsed:,.0f} passwords/s")
+    begin = time.perf_counter()
+    for password in generate_passwords(count, 16, True, True, True, True):
+        pass
+    print(f"bulk rejection generator, 16 chars, each type: {count / (time.perf_counter() - begin):,.0f} passwords/s")
+
+# Times building a filter from a synthetic corpus and looking up corpus members and
+# fresh passwords, and extrapolates the build to a 500M-entry corpus
+def benchmark_breach(entries, lookups):
+    folder = tempfile.mkdtemp()
+    corpus_path = os.path.join(folder, "benchmark-corpus.txt")
+    filter_path = os.path.join(folder, "benchmark.bloom")
+    try:
+        with open(corpus_path, "w") as corpus:
+            for start in range(0, entries, WRITE_BATCH_SIZE):
+                corpus.write("".join(f"leaked{i}\n" for i in range(start, min(entries, start + WRITE_BATCH_SIZE))))
+        begin = time.perf_counter()
+        bits, hashes = build_breach_filter(corpus_path, filter_path, entries)
+        build = time.perf_counter() - begin
+        print(f"build: {entries} entries in {build:.2f}s, {bits // 8 / 2 ** 20:.1f} MiB, {hashes} hashes "
+              f"(about {build / entries * 500_000_000 / 60:.0f} min for 500M entries)")
+
+        begin = time.perf_counter()
+        screen = BreachFilter(filter_path)
+        print(f"open: {(time.perf_counter() - begin) * 1000:.2f}ms")
+        members = [f"leaked{i}" for i in range(0, entries, max(1, entries // lookups))][:lookups]
+        fresh = list(generate_passwords(lookups, 16, True, True, True, True))
+        for name, passwords in (("hit", members), ("miss", fresh)):
+            begin = time.perf_counter()
+            found = sum(password in screen for password in passwords)
+            elapsed = time.perf_counter() - begin
+            print(f"{name}: {len(passwords) / elapsed:,.0f} lookups/s, {found / len(passwords):.4%} reported breached")
+        screen.close()
+    finally:
+        shutil.rmtree(folder)
 
 def generate_and_display_password():
     try:
@@ -56,9 +754,10 @@ def generate_and_display_password():
             messagebox.showerror("Error", "Length is too short to include at least one of each selected type.")
             return
 
-        password, count_digits, count_uppercase, count_lowercase, count_symbols = generate_password(
-            length, use_digits, use_uppercase, use_lowercase, use_symbols
-        )
+        result = generate_password(length, use_digits, use_uppercase, use_lowercase, use_symbols)
+        if not result:
+            return
+        password, count_digits, count_uppercase, count_lowercase, count_symbols = result
 
         password_label.config(text=f"Generated Password:\n\n{password}")
 
@@ -87,75 +786,163 @@ def generate_and_display_password():
 def copy_password():
     password = password_label.cget("text").split(":\n\n")[1]
     if password:
-        pyperclip.copy(password)
+        if pyperclip is not None:
+            pyperclip.copy(password)
+        else:
+            root.clipboard_clear()
+            root.clipboard_append(password)
         messagebox.showinfo("Success", "Password copied to clipboard!")
     else:
         messagebox.showwarning("Warning", "No password generated yet.")
 
-root = tk.Tk()
-root.title("Password Generator")
-root.geometry("500x400")
-root.resizable(True, True)
-root.configure(background="#ebebeb")
-
-# Title label
-title_label = tk.Label(root, text="Password Generator", font=("Arial", 24), pady=10, bg="#ebebeb")
-title_label.pack()
-
-# Length label and entry
-length_frame = tk.Frame(root, bg="#ebebeb")
-length_frame.pack(pady=5)
-length_label = tk.Label(length_frame, text="Password Length:", font=("Arial", 12), bg="#ebebeb")
-length_label.grid(row=0, column=0, padx=(0, 10))
-length_entry = tk.Entry(length_frame, font=("Arial", 12), width=5)
-length_entry.grid(row=0, column=1, padx=(0, 10))
-
-# Options frame
-options_frame = tk.Frame(root, bg="#ebebeb")
-options_frame.pack(pady=5)
-
-# Checkboxes with counts
-digits_var = tk.BooleanVar()
-digits_check = tk.Checkbutton(options_frame, text="Digits", variable=digits_var, bg="#ebebeb", font=("Arial", 12))
-digits_check.grid(row=0, column=0, sticky=tk.W)
-digits_count_label = tk.Label(options_frame, text="- 0", bg="#ebebeb", font=("Arial", 12))
-digits_count_label.grid(row=0, column=1, sticky=tk.W)
-
-uppercase_var = tk.BooleanVar()
-uppercase_check = tk.Checkbutton(options_frame, text="Uppercase Characters", variable=uppercase_var, bg="#ebebeb", font=("Arial", 12))
-uppercase_check.grid(row=1, column=0, sticky=tk.W)
-uppercase_count_label = tk.Label(options_frame, text="- 0", bg="#ebebeb", font=("Arial", 12))
-uppercase_count_label.grid(row=1, column=1, sticky=tk.W)
-
-lowercase_var = tk.BooleanVar()
-lowercase_check = tk.Checkbutton(options_frame, text="Lowercase Characters", variable=lowercase_var, bg="#ebebeb", font=("Arial", 12))
-lowercase_check.grid(row=2, column=0, sticky=tk.W)
-lowercase_count_label = tk.Label(options_frame, text="- 0", bg="#ebebeb", font=("Arial", 12))
-lowercase_count_label.grid(row=2, column=1, sticky=tk.W)
-
-symbols_var = tk.BooleanVar()
-symbols_check = tk.Checkbutton(options_frame, text="Special Symbols", variable=symbols_var, bg="#ebebeb", font=("Arial", 12))
-symbols_check.grid(row=3, column=0, sticky=tk.W)
-symbols_count_label = tk.Label(options_frame, text="- 0", bg="#ebebeb", font=("Arial", 12))
-symbols_count_label.grid(row=3, column=1, sticky=tk.W)
-
-# Generate and Copy Password buttons frame
-buttons_frame = tk.Frame(root, bg="#ebebeb")
-buttons_frame.pack()
-
-# Generate button
-generate_button = tk.Button(buttons_frame, text="Generate Password", command=generate_and_display_password, font=("Arial", 12), bg="#4CAF50", fg="white")
-generate_button.pack(side=tk.LEFT, padx=5)
-
-# Password frame to add padding
-password_frame = tk.Frame(root, bg="#ebebeb")
-password_frame.pack(fill=tk.BOTH, expand=True)
-
-# Password label
-password_label = tk.Label(password_frame, text="", font=("Arial", 14), wraplength=900, bg="#ebebeb")
-password_label.pack(pady=10, fill=tk.BOTH, expand=True)
-
-# Copy password button
-copy_button = tk.Button(buttons_frame, text="Copy Password", command=copy_password, font=("Arial", 12), bg="#3576D0", fg="white")
-
-root.mainloop()
+def run_gui(breach_path=BREACH_FILTER_PATH):
+    global root, length_entry, digits_var, uppercase_var, lowercase_var, symbols_var
+    global digits_count_label, uppercase_count_label, lowercase_count_label, symbols_count_label
+    global password_frame, password_label, copy_button
+
+    root = tk.Tk()
+    tk_instrument.instrument(root)
+    # A missing filter turns the check off; an unusable one is reported and skipped
+    try:
+        load_breach_filter(breach_path)
+    except (OSError, ValueError) as e:
+        messagebox.showwarning("Warning", f"{e}\nPasswords will not be checked against the breach list.")
+    root.title("Password Generator")
+    root.geometry("500x400")
+    root.resizable(True, True)
+    root.configure(background="#ebebeb")
+
+    # Title label
+    title_label = tk.Label(root, text="Password Generator", font=("Arial", 24), pady=10, bg="#ebebeb")
+    title_label.pack()
+
+    # Length label and entry
+    length_frame = tk.Frame(root, bg="#ebebeb")
+    length_frame.pack(pady=5)
+    length_label = tk.Label(length_frame, text="Password Length:", font=("Arial", 12), bg="#ebebeb")
+    length_label.grid(row=0, column=0, padx=(0, 10))
+    length_entry = tk.Entry(length_frame, font=("Arial", 12), width=5)
+    length_entry.grid(row=0, column=1, padx=(0, 10))
+
+    # Options frame
+    options_frame = tk.Frame(root, bg="#ebebeb")
+    options_frame.pack(pady=5)
+
+    # Checkboxes with counts
+    digits_var = tk.BooleanVar()
+    digits_check = tk.Checkbutton(options_frame, text="Digits", variable=digits_var, bg="#ebebeb", font=("Arial", 12))
+    digits_check.grid(row=0, column=0, sticky=tk.W)
+    digits_count_label = tk.Label(options_frame, text="- 0", bg="#ebebeb", font=("Arial", 12))
+    digits_count_label.grid(row=0, column=1, sticky=tk.W)
+
+    uppercase_var = tk.BooleanVar()
+    uppercase_check = tk.Checkbutton(options_frame, text="Uppercase Characters", variable=uppercase_var, bg="#ebebeb", font=("Arial", 12))
+    uppercase_check.grid(row=1, column=0, sticky=tk.W)
+    uppercase_count_label = tk.Label(options_frame, text="- 0", bg="#ebebeb", font=("Arial", 12))
+    uppercase_count_label.grid(row=1, column=1, sticky=tk.W)
+
+    lowercase_var = tk.BooleanVar()
+    lowercase_check = tk.Checkbutton(options_frame, text="Lowercase Characters", variable=lowercase_var, bg="#ebebeb", font=("Arial", 12))
+    lowercase_check.grid(row=2, column=0, sticky=tk.W)
+    lowercase_count_label = tk.Label(options_frame, text="- 0", bg="#ebebeb", font=("Arial", 12))
+    lowercase_count_label.grid(row=2, column=1, sticky=tk.W)
+
+    symbols_var = tk.BooleanVar()
+    symbols_check = tk.Checkbutton(options_frame, text="Special Symbols", variable=symbols_var, bg="#ebebeb", font=("Arial", 12))
+    symbols_check.grid(row=3, column=0, sticky=tk.W)
+    symbols_count_label = tk.Label(options_frame, text="- 0", bg="#ebebeb", font=("Arial", 12))
+    symbols_count_label.grid(row=3, column=1, sticky=tk.W)
+
+    # Generate and Copy Password buttons frame
+    buttons_frame = tk.Frame(root, bg="#ebebeb")
+    buttons_frame.pack()
+
+    # Generate button
+    generate_button = tk.Button(buttons_frame, text="Generate Password", command=generate_and_display_password, font=("Arial", 12), bg="#4CAF50", fg="white")
+    generate_button.pack(side=tk.LEFT, padx=5)
+
+    # Password frame to add padding
+    password_frame = tk.Frame(root, bg="#ebebeb")
+    password_frame.pack(fill=tk.BOTH, expand=True)
+
+    # Password label
+    password_label = tk.Label(password_frame, text="", font=("Arial", 14), wraplength=900, bg="#ebebeb")
+    password_label.pack(pady=10, fill=tk.BOTH, expand=True)
+
+    # Copy password button
+    copy_button = tk.Button(buttons_frame, text="Copy Password", command=copy_password, font=("Arial", 12), bg="#3576D0", fg="white")
+
+    root.mainloop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Password Generator")
+    parser.add_argument("--breach-filter", default=BREACH_FILTER_PATH, help="Bloom filter of leaked passwords")
+    subparsers = parser.add_subparsers(dest="command")
+    bulk_parser = subparsers.add_parser("bulk", help="generate many passwords for one policy")
+    bulk_parser.add_argument("count", type=int)
+    bulk_parser.add_argument("--length", type=int, default=16)
+    bulk_parser.add_argument("--digits", action="store_true")
+    bulk_parser.add_argument("--uppercase", action="store_true")
+    bulk_parser.add_argument("--lowercase", action="store_true")
+    bulk_parser.add_argument("--symbols", action="store_true")
+    bulk_parser.add_argument("--output", default="-")
+    bulk_parser.add_argument("--min-count", type=int, default=1, help="minimum characters of each selected type")
+    bulk_parser.add_argument("--exclude-ambiguous", action="store_true", help=f"leave out {AMBIGUOUS_CHARACTERS}")
+    bulk_parser.add_argument("--max-run", type=int, help="longest allowed run of one character")
+    build_parser = subparsers.add_parser("build-filter", help="build the breach filter from a leaked-password list")
+    build_parser.add_argument("corpus")
+    build_parser.add_argument("--entries", type=int, help="number of passwords in the corpus, counted if omitted")
+    build_parser.add_argument("--error-rate", type=float, default=BREACH_ERROR_RATE)
+    breach_parser = subparsers.add_parser("benchmark-breach", help="time breach filter build and lookups")
+    breach_parser.add_argument("--entries", type=int, default=1000000)
+    breach_parser.add_argument("--lookups", type=int, default=100000)
+    check_parser = subparsers.add_parser("check-sampler", help="statistical check of the uniform sampler")
+    check_parser.add_argument("--samples", type=int, default=200, help="expected draws per valid password")
+    sampler_parser = subparsers.add_parser("benchmark-sampler", help="time the uniform sampler")
+    sampler_parser.add_argument("--count", type=int, default=100000)
+    serve_parser = subparsers.add_parser("serve", help="run the local password service")
+    serve_parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    serve_parser.add_argument("--workers", type=int, help="refill processes, defaults to the CPU count")
+    load_parser = subparsers.add_parser("load-test", help="measure latency and throughput of a running service")
+    load_parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    load_parser.add_argument("--clients", type=int, default=16)
+    load_parser.add_argument("--duration", type=float, default=10)
+    load_parser.add_argument("--count", type=int, default=10, help="passwords per request")
+    load_parser.add_argument("--length", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.command == "build-filter":
+        begin = time.perf_counter()
+        bits, hashes = build_breach_filter(args.corpus, args.breach_filter, args.entries, args.error_rate)
+        print(f"Wrote {args.breach_filter}: {bits // 8 / 2 ** 20:.1f} MiB, {hashes} hashes in {time.perf_counter() - begin:.2f}s")
+    elif args.command == "benchmark-breach":
+        benchmark_breach(args.entries, args.lookups)
+    elif args.command == "check-sampler":
+        sys.exit(0 if check_sampler(args.samples) else 1)
+    elif args.command == "benchmark-sampler":
+        benchmark_sampler(args.count)
+    elif args.command == "serve":
+        # Check the filter here, where a bad one is a clear error, not a broken worker pool
+        try:
+            load_breach_filter(args.breach_filter)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        serve(args.port, args.workers, args.breach_filter)
+    elif args.command == "load-test":
+        load_test(args.port, args.clients, args.duration, args.count, args.length)
+    elif args.command == "bulk":
+        try:
+            load_breach_filter(args.breach_filter)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        output = sys.stdout if args.output == "-" else open(args.output, "w")
+        with output:
+            try:
+                policy = (args.length, args.digits, args.uppercase, args.lowercase, args.symbols,
+                          args.min_count, args.exclude_ambiguous, args.max_run)
+                elapsed = write_passwords(output, policy_passwords(policy, args.count))
+            except ValueError as e:
+                parser.error(str(e))
+        print(f"{args.count} passwords in {elapsed:.2f}s ({args.count / elapsed * 60:,.0f} per minute)", file=sys.stderr)
+    else:
+        run_gui(args.breach_filter)
@@ -1,8 +1,190 @@
 # "Experience the timeless fun of Rock-Paper-Scissors in this engaging tkinter-based game. Players face off against a computer opponent, selecting their choice of Rock, Paper, or Scissors. The game dynamically determines the winner based on classic rules: Rock crushes Scissors, Scissors cuts Paper, and Paper covers Rock. With stylish button designs and intuitive user interface, players can easily navigate through rounds. At the end of each game, the result is displayed, showcasing the winner alongside their respective scores. It's a perfect blend of nostalgia and modern design, offering endless entertainment for players of all ages."
 
+import argparse
+import importlib
+import math
+import mmap
+import os
+import random
+import statistics
+import struct
+import time
 import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor
 from tkinter import messagebox
-import random
+import tk_instrument
+
+# NumPy is only needed for the headless simulation engine
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Moves in the order of their integer encoding; each move beats the one before it
+MOVES = ['Rock', 'Paper', 'Scissors']
+MOVE_INDEX = {move: index for index, move in enumerate(MOVES)}
+
+# PAYOFF[user][computer] is 1 when the user wins, -1 when the user loses and 0 for a tie
+PAYOFF = [[(user - computer + 1) % 3 - 1 for computer in range(3)] for user in range(3)]
+
+# Rounds drawn at a time by simulate, which bounds the temporary arrays
+SIMULATION_BATCH_SIZE = 1 << 20
+
+# Game history log, appended to while the GUI runs
+LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rps-history.log")
+
+# Rounds buffered in memory before a block is written
+LOG_BLOCK_ROUNDS = 1 << 16
+
+# Interval of the GUI's periodic checkpoint, which writes the rounds buffered so far
+LOG_FLUSH_MS = 5000
+
+# Checkpoint written in front of every block of the log: magic, rounds in the block,
+# game number, rounds in the log before the block, and the user and computer scores of
+# the game at the start of the block. Each round is then one byte: user move in bits
+# 0-1, computer move in bits 2-3 and the result + 1 (0 loss, 1 tie, 2 win) in bits 4-5.
+LOG_HEADER = struct.Struct("<4sIIQQQ")
+LOG_MAGIC = b"RPSB"
+
+# Longest history, in rounds, the adaptive opponent conditions on
+NGRAM_MAX_ORDER = 3
+
+# Per-round decay of old observations, so the opponent follows a player who changes habits
+NGRAM_DECAY = 0.98
+
+# Decayed observations a context needs before its prediction is trusted
+NGRAM_MIN_COUNT = 1.0
+
+# Weight at which the count tables are rescaled back to 1
+NGRAM_RESCALE_LIMIT = 1e100
+
+# Strategy plugins: a class taking an optional random.Random, with choose() returning
+# its next move and update(user_move, computer_move) called after every round, where
+# computer_move is the strategy's own move. Built-ins are registered by name below;
+# any other class can be named as "module:Class".
+OPPONENTS = {}
+
+def register_strategy(name):
+    def register(cls):
+        OPPONENTS[name] = cls
+        return cls
+    return register
+
+def load_strategy(spec):
+    if spec in OPPONENTS:
+        return OPPONENTS[spec]
+    module, separator, name = spec.partition(":")
+    if not separator:
+        raise ValueError(f"Unknown strategy {spec!r}, expected one of {sorted(OPPONENTS)} or module:Class")
+    return getattr(importlib.import_module(module), name)
+
+# The original computer player
+@register_strategy("random")
+class RandomOpponent:
+    def __init__(self, rng=random):
+        self.rng = rng
+
+    def choose(self):
+        return self.rng.randrange(3)
+
+    def update(self, user_move, computer_move):
+        pass
+
+@register_strategy("rock")
+class RockOpponent:
+    def __init__(self, rng=random):
+        pass
+
+    def choose(self):
+        return 0
+
+    def update(self, user_move, computer_move):
+        pass
+
+# Rock, Paper, Scissors, Rock, ...
+@register_strategy("cycle")
+class CycleOpponent:
+    def __init__(self, rng=random):
+        self.move = 0
+
+    def choose(self):
+        return self.move
+
+    def update(self, user_move, computer_move):
+        self.move = (computer_move + 1) % 3
+
+# Plays whatever the other player played last
+@register_strategy("copy")
+class CopyOpponent:
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.last = None
+
+    def choose(self):
+        return self.rng.randrange(3) if self.last is None else self.last
+
+    def update(self, user_move, computer_move):
+        self.last = user_move
+
+# Beats the other player's most frequent move so far
+@register_strategy("frequency")
+class FrequencyOpponent:
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.counts = [0, 0, 0]
+
+    def choose(self):
+        best = max(self.counts)
+        return (self.rng.choice([move for move in range(3) if self.counts[move] == best]) + 1) % 3
+
+    def update(self, user_move, computer_move):
+        self.counts[user_move] += 1
+
+# Predicts the player's next move from the last one to NGRAM_MAX_ORDER rounds and plays
+# what beats it. A round is one of 9 (user, computer) pairs, so every order has a fixed
+# table of 9 ** order contexts, allocated up front; memory does not grow with history.
+# Instead of decaying every count each round, new observations are added with a weight
+# that grows by 1 / decay, and the tables are rescaled only when that weight gets huge.
+# Both choose and update touch one context per order, so each is O(NGRAM_MAX_ORDER).
+@register_strategy("adaptive")
+class AdaptiveOpponent:
+    def __init__(self, rng=random, max_order=NGRAM_MAX_ORDER, decay=NGRAM_DECAY):
+        self.rng = rng
+        self.max_order = max_order
+        self.decay = decay
+        self.tables = [[[0.0, 0.0, 0.0] for context in range(9 ** order)] for order in range(1, max_order + 1)]
+        self.sizes = [9 ** order for order in range(1, max_order + 1)]
+        self.weight = 1.0
+        self.history = 0
+        self.rounds = 0
+
+    # Prefer the longest context that has been seen often enough
+    def choose(self):
+        for order in range(min(self.max_order, self.rounds), 0, -1):
+            counts = self.tables[order - 1][self.history % self.sizes[order - 1]]
+            if counts[0] + counts[1] + counts[2] >= NGRAM_MIN_COUNT * self.weight:
+                best = max(counts)
+                predicted = self.rng.choice([move for move in range(3) if counts[move] == best])
+                return (predicted + 1) % 3
+        return self.rng.randrange(3)
+
+    def update(self, user_move, computer_move):
+        weight = self.weight
+        for order in range(min(self.max_order, self.rounds), 0, -1):
+            self.tables[order - 1][self.history % self.sizes[order - 1]][user_move] += weight
+        self.weight = weight / self.decay
+        if self.weight > NGRAM_RESCALE_LIMIT:
+            for table in self.tables:
+                for counts in table:
+                    counts[0] /= self.weight
+                    counts[1] /= self.weight
+                    counts[2] /= self.weight
+            self.weight = 1.0
+        self.history = (self.history * 9 + user_move * 3 + computer_move) % self.sizes[-1]
+        self.rounds += 1
+
+# Computer player used by play_round
+opponent = AdaptiveOpponent()
 
 # Function to determine the winner
 def determine_winner(user_choice, computer_choice):
@@ -15,10 +197,216 @@ def determine_winner(user_choice, computer_choice):
     else:
         return "You lose!"
 
+# Append-only log of every round. Rounds go into a bytearray and are written as one
+# block when it fills up, when a game ends and on close. Opening a log resumes its
+# counters from the last checkpoint and cuts off a block left incomplete by a crash.
+class GameLog:
+    def __init__(self, path):
+        self.file = open(path, "ab+")
+        self.buffer = bytearray()
+        self.game = 0
+        self.rounds = 0
+        self.user_score = 0
+        self.computer_score = 0
+        end = 0
+        for offset, header in log_blocks(self.file):
+            magic, count, self.game, self.rounds, self.user_score, self.computer_score = header
+            end = offset + LOG_HEADER.size + count
+        if end:
+            self.file.seek(end - count)
+            counts = round_counts(self.file.read(count))
+            self.rounds += count
+            self.user_score += sum(counts[value] for value in ROUND_BYTES if value >> 4 == 2)
+            self.computer_score += sum(counts[value] for value in ROUND_BYTES if value >> 4 == 0)
+        self.file.truncate(end)
+        self.block_start = (self.rounds, self.user_score, self.computer_score)
+        # Every session starts a new game at 0-0, as the score label does
+        if self.rounds:
+            self.new_game()
+
+    def record(self, user_move, computer_move):
+        result = PAYOFF[user_move][computer_move]
+        self.buffer.append(user_move | computer_move << 2 | (result + 1) << 4)
+        self.rounds += 1
+        if result == 1:
+            self.user_score += 1
+        elif result == -1:
+            self.computer_score += 1
+        if len(self.buffer) == LOG_BLOCK_ROUNDS:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            rounds, user_score, computer_score = self.block_start
+            self.file.write(LOG_HEADER.pack(LOG_MAGIC, len(self.buffer), self.game, rounds, user_score, computer_score))
+            self.file.write(self.buffer)
+            self.file.flush()
+            self.buffer = bytearray()
+        self.block_start = (self.rounds, self.user_score, self.computer_score)
+
+    def new_game(self):
+        self.flush()
+        self.game += 1
+        self.user_score = 0
+        self.computer_score = 0
+        self.block_start = (self.rounds, 0, 0)
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+# The nine possible round bytes, one per move pair
+ROUND_BYTES = [user | computer << 2 | (PAYOFF[user][computer] + 1) << 4 for user in range(3) for computer in range(3)]
+
+# Maps the first eight round bytes to one bit each; the ninth is the remainder
+PLANE_TABLE = bytes(1 << ROUND_BYTES.index(byte) if byte in ROUND_BYTES[:8] else 0 for byte in range(256))
+
+# Occurrences of each round byte in a block. One translate turns the block into bit
+# planes and each count is then a mask and a popcount over the block read as one int.
+def round_counts(block):
+    planes = int.from_bytes(block.translate(PLANE_TABLE), "little")
+    ones = int.from_bytes(b"\1" * len(block), "little")
+    counts = {value: (planes & ones << bit).bit_count() for bit, value in enumerate(ROUND_BYTES[:8])}
+    counts[ROUND_BYTES[8]] = len(block) - sum(counts.values())
+    return counts
+
+# Complete blocks of a log file as (offset, header), reading only the headers
+def log_blocks(file):
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    offset = 0
+    while offset + LOG_HEADER.size <= size:
+        file.seek(offset)
+        header = LOG_HEADER.unpack(file.read(LOG_HEADER.size))
+        if header[0] != LOG_MAGIC or offset + LOG_HEADER.size + header[1] > size:
+            break
+        yield offset, header
+        offset += LOG_HEADER.size + header[1]
+
+# Map round bytes to 1 for a user win (or loss) and to 0 otherwise
+WIN_TABLE = bytes(1 if byte >> 4 == 2 else 0 for byte in range(256))
+LOSS_TABLE = bytes(1 if byte >> 4 == 0 else 0 for byte in range(256))
+
+# Longest run of 1 bytes in a chunk, given the run still open from earlier chunks.
+# Returns the longest run seen and the run left open at the end of the chunk. With the
+# chunk read as one int, starts[n] has a bit for every round where a run of at least n
+# begins, and starts[a + b] = starts[a] & starts[b] >> 8 * a; the longest run is found
+# by doubling n and then adding back smaller powers of two.
+def longest_run(flags, current):
+    size = len(flags)
+    prefix = size - len(flags.lstrip(b"\1"))
+    if prefix == size:
+        return current + size, current + size
+    suffix = size - len(flags.rstrip(b"\1"))
+    starts = int.from_bytes(flags, "little")
+    if not starts:
+        return current, 0
+    powers = [starts]
+    while True:
+        doubled = powers[-1] & powers[-1] >> 8 * (1 << (len(powers) - 1))
+        if not doubled:
+            break
+        powers.append(doubled)
+    longest = 1 << (len(powers) - 1)
+    starts = powers[-1]
+    for power in range(len(powers) - 2, -1, -1):
+        longer = starts & powers[power] >> 8 * longest
+        if longer:
+            starts = longer
+            longest += 1 << power
+    return max(longest, current + prefix), suffix
+
+# Streams over a log through mmap, one block at a time, and returns outcome counts and
+# rates, move frequencies of both players and the longest win and loss streaks within
+# a game. Each block is counted with bytes.count and translate/split, so no Python
+# object is created per round and memory stays at one block.
+def analyze_log(path):
+    counts = dict.fromkeys(ROUND_BYTES, 0)
+    games = set()
+    best_wins = best_losses = 0
+    win_run = loss_run = 0
+    with open(path, "rb") as file:
+        blocks = list(log_blocks(file))
+        if blocks:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for offset, header in blocks:
+                    count, game = header[1], header[2]
+                    if game not in games:
+                        games.add(game)
+                        win_run = loss_run = 0
+                    block = data[offset + LOG_HEADER.size:offset + LOG_HEADER.size + count]
+                    for value, seen in round_counts(block).items():
+                        counts[value] += seen
+                    longest, win_run = longest_run(block.translate(WIN_TABLE), win_run)
+                    best_wins = max(best_wins, longest)
+                    longest, loss_run = longest_run(block.translate(LOSS_TABLE), loss_run)
+                    best_losses = max(best_losses, longest)
+
+    rounds = sum(counts.values())
+    losses, ties, wins = (sum(seen for value, seen in counts.items() if value >> 4 == result) for result in range(3))
+    user_moves = [sum(seen for value, seen in counts.items() if value & 3 == move) for move in range(3)]
+    computer_moves = [sum(seen for value, seen in counts.items() if value >> 2 & 3 == move) for move in range(3)]
+    return {
+        "rounds": rounds,
+        "games": len(games),
+        "wins": wins,
+        "losses": losses,
+        "ties": ties,
+        "win_rate": wins / rounds if rounds else 0.0,
+        "loss_rate": losses / rounds if rounds else 0.0,
+        "tie_rate": ties / rounds if rounds else 0.0,
+        "longest_win_streak": best_wins,
+        "longest_loss_streak": best_losses,
+        "user_moves": dict(zip(MOVES, user_moves)),
+        "computer_moves": dict(zip(MOVES, computer_moves)),
+    }
+
+# Times record() per round, pads the log to `rounds` with random blocks, then times
+# the analytics pass over the whole file
+def benchmark_log(path, rounds, recorded=1000000, seed=0):
+    rng = random.Random(seed)
+    if os.path.exists(path):
+        os.remove(path)
+    try:
+        log = GameLog(path)
+        moves = [(rng.randrange(3), rng.randrange(3)) for i in range(min(recorded, rounds))]
+        begin = time.perf_counter()
+        for user_move, computer_move in moves:
+            log.record(user_move, computer_move)
+        elapsed = time.perf_counter() - begin
+        print(f"record: {elapsed / len(moves) * 1e9:.0f}ns per round")
+
+        # Pad with random blocks written straight to the file
+        block = bytes(user | computer << 2 | (PAYOFF[user][computer] + 1) << 4
+                      for user, computer in ((rng.randrange(3), rng.randrange(3)) for i in range(LOG_BLOCK_ROUNDS)))
+        remaining = rounds - len(moves)
+        log.flush()
+        while remaining > 0:
+            count = min(remaining, LOG_BLOCK_ROUNDS)
+            log.file.write(LOG_HEADER.pack(LOG_MAGIC, count, log.game, log.rounds, 0, 0))
+            log.file.write(block[:count])
+            log.rounds += count
+            remaining -= count
+        log.close()
+
+        begin = time.perf_counter()
+        statistics = analyze_log(path)
+        elapsed = time.perf_counter() - begin
+        print(f"analyze: {statistics['rounds']} rounds ({os.path.getsize(path) / 2 ** 20:.0f} MiB) in {elapsed:.2f}s, "
+              f"{statistics['rounds'] / elapsed / 1e6:.0f}M rounds/s")
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+# Game log the GUI records to, opened in run_gui
+game_log = None
+
 # Function to play a round
 def play_round(user_choice):
-    choices = ['Rock', 'Paper', 'Scissors']
-    computer_choice = random.choice(choices)
+    computer_choice = MOVES[opponent.choose()]
+    opponent.update(MOVE_INDEX[user_choice], MOVE_INDEX[computer_choice])
+    if game_log is not None:
+        game_log.record(MOVE_INDEX[user_choice], MOVE_INDEX[computer_choice])
     result = determine_winner(user_choice, computer_choice)
     
     # Update the result label
@@ -33,6 +421,194 @@ def play_round(user_choice):
     # Update score label
     score_label.config(text=f"Score - You: {scores['user']} Computer: {scores['computer']}")
 
+# Resolves whole arrays of integer-encoded moves at once through the payoff table and
+# returns the outcome of every round as an int8 array of 1, 0 and -1
+def simulate_rounds(user_moves, computer_moves):
+    if np is None:
+        raise RuntimeError("NumPy is required for the simulation engine")
+    return np.asarray(PAYOFF, dtype=np.int8)[user_moves, computer_moves]
+
+def draw_moves(rng, rounds, probabilities=None):
+    if probabilities is None:
+        return rng.integers(0, 3, rounds, dtype=np.int8)
+    return rng.choice(3, rounds, p=probabilities).astype(np.int8)
+
+# Simulates rounds between two players that pick moves with fixed probabilities
+# (uniform when not given) and returns the outcome array
+def simulate(rounds, user_probabilities=None, computer_probabilities=None, seed=None):
+    if np is None:
+        raise RuntimeError("NumPy is required for the simulation engine")
+    rng = np.random.default_rng(seed)
+    outcomes = np.empty(rounds, dtype=np.int8)
+    for start in range(0, rounds, SIMULATION_BATCH_SIZE):
+        size = min(SIMULATION_BATCH_SIZE, rounds - start)
+        user_moves = draw_moves(rng, size, user_probabilities)
+        computer_moves = draw_moves(rng, size, computer_probabilities)
+        outcomes[start:start + size] = simulate_rounds(user_moves, computer_moves)
+    return outcomes
+
+# Score of each player after every round, as the score label would show it
+def running_scores(outcomes):
+    return np.cumsum(outcomes == 1, dtype=np.int64), np.cumsum(outcomes == -1, dtype=np.int64)
+
+# Win, loss and tie counts and rates, with the standard error of the win rate; the
+# rates are zero when there are no rounds
+def round_statistics(outcomes):
+    rounds = len(outcomes)
+    losses, ties, wins = (int(count) for count in np.bincount(outcomes + 1, minlength=3))
+    divisor = max(rounds, 1)
+    win_rate = wins / divisor
+    return {
+        "rounds": rounds,
+        "wins": wins,
+        "losses": losses,
+        "ties": ties,
+        "win_rate": win_rate,
+        "loss_rate": losses / divisor,
+        "tie_rate": ties / divisor,
+        "win_rate_error": math.sqrt(win_rate * (1 - win_rate) / divisor),
+    }
+
+# Times the string-based determine_winner loop, the same loop on the integer payoff
+# table, and the NumPy engine on the same random rounds
+def benchmark(rounds, seed=0):
+    rng = random.Random(seed)
+    user_choices = [rng.choice(MOVES) for i in range(rounds)]
+    computer_choices = [rng.choice(MOVES) for i in range(rounds)]
+
+    begin = time.perf_counter()
+    wins = sum(determine_winner(user, computer) == "You win!" for user, computer in zip(user_choices, computer_choices))
+    baseline = time.perf_counter() - begin
+    print(f"determine_winner loop: {rounds / baseline:,.0f} rounds/s")
+
+    user_moves = [MOVE_INDEX[choice] for choice in user_choices]
+    computer_moves = [MOVE_INDEX[choice] for choice in computer_choices]
+    begin = time.perf_counter()
+    table_wins = sum(PAYOFF[user][computer] == 1 for user, computer in zip(user_moves, computer_moves))
+    elapsed = time.perf_counter() - begin
+    assert table_wins == wins
+    print(f"payoff table loop: {rounds / elapsed:,.0f} rounds/s ({baseline / elapsed:.1f}x)")
+
+    if np is None:
+        print("NumPy is not installed, skipping the simulation engine")
+        return
+    user_array = np.array(user_moves, dtype=np.int8)
+    computer_array = np.array(computer_moves, dtype=np.int8)
+    begin = time.perf_counter()
+    statistics = round_statistics(simulate_rounds(user_array, computer_array))
+    elapsed = time.perf_counter() - begin
+    assert statistics["wins"] == wins
+    print(f"NumPy engine: {rounds / elapsed:,.0f} rounds/s ({baseline / elapsed:.1f}x)")
+
+    begin = time.perf_counter()
+    simulate(rounds, seed=seed)
+    elapsed = time.perf_counter() - begin
+    print(f"NumPy engine with move generation: {rounds / elapsed:,.0f} rounds/s ({baseline / elapsed:.1f}x)")
+
+# Plays the adaptive opponent against scripted players for the given number of rounds
+# each, then times single decisions (choose plus update) on the trained model
+def benchmark_opponent(rounds, decisions=10000, seed=0):
+    rng = random.Random(seed)
+    players = {
+        "cycle": lambda i, last: i % 3,
+        "biased": lambda i, last: 0 if rng.random() < 0.5 else rng.randrange(3),
+        "copy computer": lambda i, last: last,
+        "random": lambda i, last: rng.randrange(3),
+    }
+    for name, player in players.items():
+        model = AdaptiveOpponent()
+        outcome = [0, 0, 0]
+        last = 0
+        begin = time.perf_counter()
+        for i in range(rounds):
+            computer_move = model.choose()
+            user_move = player(i, last)
+            model.update(user_move, computer_move)
+            outcome[PAYOFF[computer_move][user_move] + 1] += 1
+            last = computer_move
+        elapsed = time.perf_counter() - begin
+        losses, ties, wins = outcome
+        print(f"vs {name}: computer wins {wins / rounds:.1%}, loses {losses / rounds:.1%} ({rounds / elapsed:,.0f} rounds/s)")
+
+    latencies = []
+    for i in range(decisions):
+        begin = time.perf_counter()
+        model.update(rng.randrange(3), model.choose())
+        latencies.append(time.perf_counter() - begin)
+    latencies.sort()
+    print(f"decision after {rounds} rounds: p50 {latencies[len(latencies) // 2] * 1e6:.1f}us, "
+          f"p99 {latencies[len(latencies) * 99 // 100] * 1e6:.1f}us, max {latencies[-1] * 1e6:.1f}us")
+
+# One match between two strategy specs. Each side gets its own generator seeded from
+# the match seed, so a match gives the same result in any process. Returns the wins,
+# losses and ties of the first strategy.
+def play_match(first_spec, second_spec, rounds, seed):
+    first = load_strategy(first_spec)(random.Random(f"{seed}:first"))
+    second = load_strategy(second_spec)(random.Random(f"{seed}:second"))
+    outcome = [0, 0, 0]
+    for i in range(rounds):
+        first_move = first.choose()
+        second_move = second.choose()
+        first.update(second_move, first_move)
+        second.update(first_move, second_move)
+        outcome[PAYOFF[first_move][second_move] + 1] += 1
+    losses, ties, wins = outcome
+    return wins, losses, ties
+
+# Every strategy plays every other one in `matches` separately seeded matches, spread
+# over a process pool. Returns the leaderboard as (strategy, mean score per round, 95%
+# confidence half-width, matches, {opponent: (mean, half-width)}) sorted best first,
+# where a score is wins minus losses over rounds. The opponents are fixed, so the
+# matches are stratified by opponent: each pairing gets its own mean and interval from
+# the spread of its own matches, the overall mean is the mean over opponents, and its
+# interval combines the pairings' variances. Pooling the per-match scores instead would
+# count the differences between opponents as noise.
+def run_tournament(specs, rounds, matches, workers=None, seed=0):
+    jobs = [(first, second, f"{seed}:{first}:{second}:{match}")
+            for i, first in enumerate(specs) for second in specs[i + 1:] for match in range(matches)]
+    firsts, seconds, seeds = zip(*jobs)
+    chunksize = max(1, len(jobs) // (4 * (workers or os.cpu_count())))
+    with ProcessPoolExecutor(workers) as pool:
+        results = list(pool.map(play_match, firsts, seconds, [rounds] * len(jobs), seeds, chunksize=chunksize))
+    scores = {spec: {} for spec in specs}
+    for (first, second, match_seed), (wins, losses, ties) in zip(jobs, results):
+        scores[first].setdefault(second, []).append((wins - losses) / rounds)
+        scores[second].setdefault(first, []).append((losses - wins) / rounds)
+    leaderboard = []
+    for spec, opponents in scores.items():
+        pairings = {}
+        variance = 0.0
+        for opponent, values in opponents.items():
+            spread = statistics.stdev(values) if len(values) > 1 else 0.0
+            pairings[opponent] = (statistics.fmean(values), 1.96 * spread / math.sqrt(len(values)))
+            variance += spread ** 2 / len(values)
+        mean = statistics.fmean(pair_mean for pair_mean, pair_interval in pairings.values())
+        interval = 1.96 * math.sqrt(variance) / len(pairings)
+        leaderboard.append((spec, mean, interval, sum(map(len, opponents.values())), pairings))
+    leaderboard.sort(key=lambda row: row[1], reverse=True)
+    return leaderboard
+
+def print_leaderboard(leaderboard):
+    for place, (spec, mean, interval, count, pairings) in enumerate(leaderboard, 1):
+        print(f"{place:>2}. {spec:<20} {mean:+.4f} +/- {interval:.4f} per round over {count} matches")
+        for opponent, (pair_mean, pair_interval) in pairings.items():
+            print(f"      vs {opponent:<17} {pair_mean:+.4f} +/- {pair_interval:.4f}")
+
+# Runs the same tournament with 1 to max_workers processes and reports the speedup
+def tournament_scaling(specs, rounds, matches, max_workers, seed=0):
+    baseline = None
+    reference = None
+    for workers in range(1, max_workers + 1):
+        begin = time.perf_counter()
+        leaderboard = run_tournament(specs, rounds, matches, workers, seed)
+        elapsed = time.perf_counter() - begin
+        if reference is None:
+            baseline, reference = elapsed, leaderboard
+        elif leaderboard != reference:
+            print("warning: results differ from the single-process run")
+        print(f"{workers} workers: {elapsed:.2f}s, speedup {baseline / elapsed:.2f}x, efficiency {baseline / elapsed / workers:.0%}")
+    return reference
+
 # Function to reset the game and display result
 def reset_game():
     # Get the winner and total points
@@ -50,51 +626,142 @@ def reset_game():
     scores['computer'] = 0
     result_label.config(text="")
     score_label.config(text="Score - You: 0 Computer: 0")
+    if game_log is not None:
+        game_log.new_game()
+
+# Periodic checkpoint, so a killed game loses at most LOG_FLUSH_MS of rounds
+def flush_log():
+    game_log.flush()
+    root.after(LOG_FLUSH_MS, flush_log)
+
+def on_close():
+    if game_log is not None:
+        game_log.close()
+    root.destroy()
+
+# Scores of the current game
+scores = {'user': 0, 'computer': 0}
 
 # Setting up the GUI
-root = tk.Tk()
-root.title("Rock-Paper-Scissors Game")
-root.geometry("400x400")
-root.config(bg="#F5F5F5")
+def run_gui(log_path=LOG_PATH):
+    global root, result_label, score_label, button_frame, game_log
 
-# Fonts
-title_font = ("Arial", 20, "bold")
-button_font = ("Arial", 12)
-result_font = ("Arial", 14)
+    game_log = GameLog(log_path)
+    root = tk.Tk()
+    tk_instrument.instrument(root)
+    root.title("Rock-Paper-Scissors Game")
+    root.geometry("400x400")
+    root.config(bg="#F5F5F5")
 
-# Colors
-button_colors = ['#4CAF50', '#03A9F4', '#FF9800']  # Dark green, Dark blue, and Dark orange colors for buttons
-reset_button_bg = "#3576D0"  # Dark Blue color for reset button
+    # Fonts
+    title_font = ("Arial", 20, "bold")
+    button_font = ("Arial", 12)
+    result_font = ("Arial", 14)
 
-# Title
-title_label = tk.Label(root, text="Rock-Paper-Scissors", font=title_font, bg="#F5F5F5", fg="#333333")
-title_label.pack(pady=20)
+    # Colors
+    button_colors = ['#4CAF50', '#03A9F4', '#FF9800']  # Dark green, Dark blue, and Dark orange colors for buttons
+    reset_button_bg = "#3576D0"  # Dark Blue color for reset button
 
-# Result label
-result_label = tk.Label(root, text="", font=result_font, bg="#F5F5F5", fg="#333333")
-result_label.pack(pady=20)
+    # Title
+    title_label = tk.Label(root, text="Rock-Paper-Scissors", font=title_font, bg="#F5F5F5", fg="#333333")
+    title_label.pack(pady=20)
 
-# Score label
-scores = {'user': 0, 'computer': 0}
-score_label = tk.Label(root, text="Score - You: 0 Computer: 0", font=result_font, bg="#F5F5F5", fg="#333333")
-score_label.pack(pady=10)
+    # Result label
+    result_label = tk.Label(root, text="", font=result_font, bg="#F5F5F5", fg="#333333")
+    result_label.pack(pady=20)
+
+    # Score label
+    score_label = tk.Label(root, text="Score - You: 0 Computer: 0", font=result_font, bg="#F5F5F5", fg="#333333")
+    score_label.pack(pady=10)
 
-# Buttons for user choice
-button_frame = tk.Frame(root, bg="#F5F5F5")
-button_frame.pack(pady=20)
+    # Buttons for user choice
+    button_frame = tk.Frame(root, bg="#F5F5F5")
+    button_frame.pack(pady=20)
 
-def create_button(text, command, color):
-    button = tk.Button(button_frame, text=text, font=button_font, width=10, command=command, bg=color, fg="white", relief="flat")
-    button.pack(side="left", padx=10)
-    return button
+    def create_button(text, command, color):
+        button = tk.Button(button_frame, text=text, font=button_font, width=10, command=command, bg=color, fg="white", relief="flat")
+        button.pack(side="left", padx=10)
+        return button
 
-rock_button = create_button("Rock", lambda: play_round("Rock"), button_colors[0])
-paper_button = create_button("Paper", lambda: play_round("Paper"), button_colors[1])
-scissors_button = create_button("Scissors", lambda: play_round("Scissors"), button_colors[2])
+    rock_button = create_button("Rock", lambda: play_round("Rock"), button_colors[0])
+    paper_button = create_button("Paper", lambda: play_round("Paper"), button_colors[1])
+    scissors_button = create_button("Scissors", lambda: play_round("Scissors"), button_colors[2])
 
-# Reset button
-reset_button = tk.Button(root, text="Reset", font=button_font, width=10, command=reset_game, bg=reset_button_bg, fg="white", relief="flat")
-reset_button.pack(pady=20)
+    # Reset button
+    reset_button = tk.Button(root, text="Reset", font=button_font, width=10, command=reset_game, bg=reset_button_bg, fg="white", relief="flat")
+    reset_button.pack(pady=20)
 
-# Main loop
-root.mainloop()
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    root.after(LOG_FLUSH_MS, flush_log)
+
+    # Main loop
+    root.mainloop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rock-Paper-Scissors Game")
+    subparsers = parser.add_subparsers(dest="command")
+    simulate_parser = subparsers.add_parser("simulate", help="simulate rounds between two fixed-probability players")
+    simulate_parser.add_argument("--rounds", type=int, default=1000000)
+    simulate_parser.add_argument("--seed", type=int)
+    simulate_parser.add_argument("--user", type=float, nargs=3, metavar=("ROCK", "PAPER", "SCISSORS"), help="move probabilities of the user")
+    simulate_parser.add_argument("--computer", type=float, nargs=3, metavar=("ROCK", "PAPER", "SCISSORS"), help="move probabilities of the computer")
+    benchmark_parser = subparsers.add_parser("benchmark", help="compare the simulation engine with determine_winner")
+    benchmark_parser.add_argument("--rounds", type=int, default=1000000)
+    opponent_parser = subparsers.add_parser("benchmark-opponent", help="evaluate and time the adaptive opponent")
+    opponent_parser.add_argument("--rounds", type=int, default=1000000)
+    tournament_parser = subparsers.add_parser("tournament", help="round-robin tournament between strategies")
+    tournament_parser.add_argument("strategies", nargs="*", help="built-in names or module:Class, defaults to all built-ins")
+    tournament_parser.add_argument("--rounds", type=int, default=10000, help="rounds per match")
+    tournament_parser.add_argument("--matches", type=int, default=4, help="matches per pair of strategies")
+    tournament_parser.add_argument("--workers", type=int, help="processes, defaults to the CPU count")
+    tournament_parser.add_argument("--seed", type=int, default=0)
+    tournament_parser.add_argument("--scaling", action="store_true", help="time the tournament with 1 to --workers processes")
+    stats_parser = subparsers.add_parser("log-stats", help="win rates, streaks and move frequencies from a game log")
+    log_parser = subparsers.add_parser("benchmark-log", help="time game log writes and analytics")
+    log_parser.add_argument("--rounds", type=int, default=100000000)
+    parser.add_argument("--log", default=LOG_PATH, help="game history log")
+    parser.add_argument("--opponent", default="adaptive", help="computer player in the game, a built-in name or module:Class")
+    args = parser.parse_args()
+    if getattr(args, "rounds", 1) < 1:
+        parser.error("--rounds must be at least 1")
+
+    if args.command == "simulate":
+        if np is None:
+            parser.error("NumPy is required for the simulation engine")
+        try:
+            outcomes = simulate(args.rounds, args.user, args.computer, args.seed)
+        except ValueError as e:
+            parser.error(str(e))
+        for name, value in round_statistics(outcomes).items():
+            print(f"{name}: {value}")
+    elif args.command == "benchmark":
+        benchmark(args.rounds)
+    elif args.command == "benchmark-opponent":
+        benchmark_opponent(args.rounds)
+    elif args.command == "tournament":
+        specs = args.strategies or sorted(OPPONENTS)
+        try:
+            for spec in specs:
+                load_strategy(spec)
+        except (ValueError, ImportError, AttributeError) as e:
+            parser.error(str(e))
+        if len(specs) < 2:
+            parser.error("A tournament needs at least two strategies")
+        if args.scaling:
+            leaderboard = tournament_scaling(specs, args.rounds, args.matches, args.workers or os.cpu_count(), args.seed)
+        else:
+            leaderboard = run_tournament(specs, args.rounds, args.matches, args.workers, args.seed)
+        print_leaderboard(leaderboard)
+    elif args.command == "log-stats":
+        if not os.path.exists(args.log):
+            parser.error(f"No game log at {args.log}")
+        for name, value in analyze_log(args.log).items():
+            print(f"{name}: {value}")
+    elif args.command == "benchmark-log":
+        benchmark_log(args.log + ".benchmark", args.rounds)
+    else:
+        try:
+            opponent = load_strategy(args.opponent)()
+        except (ValueError, ImportError, AttributeError) as e:
+            parser.error(str(e))
+        run_gui(args.log)
@@ -1,13 +1,1125 @@
 # Contact Book Application
 # The Contact Book is a desktop application built with Python and Tkinter for efficient contact management. Users can easily add, view, search, update, and delete contacts. Contacts are displayed in a stylish table with equally spaced columns for names and phone numbers, ensuring clarity and readability. The application ensures phone numbers are numeric and unique across contacts. It features an intuitive interface with clean input dialogs and attractive, color-coded buttons for each function. The Contact Book provides a simple and visually appealing way to manage your contact information effectively, combining functionality with a user-friendly design.
 
+import argparse
+import csv
+import heapq
+import multiprocessing
+import os
+import queue
+import random
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 import tkinter as tk
 from tkinter import messagebox, Toplevel, Entry, Label, Button
 from tkinter.font import Font
-from tkinter import ttk
+from tkinter import ttk, filedialog
+import tk_instrument
+
+# Number of extra rows rendered below the visible window of the contact table
+OVERSCAN_ROWS = 5
+
+# Rows fetched per query when paging the contact table in from the database
+CONTACT_PAGE_SIZE = 200
+
+# Default database file and how long edits are batched before they are committed
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "contacts.db")
+DB_COMMIT_DELAY_MS = 500
+
+# Longest phone number that fits the compact store's packed integer column
+PACKED_PHONE_DIGITS = 18
+
+# Duplicate detection settings: phone canonicalization, blocking keys, pair scoring
+DEFAULT_COUNTRY_CODE = "91"
+NATIONAL_PHONE_DIGITS = 10
+DEDUP_PHONE_SUFFIX = 7
+DEDUP_WINDOW = 10
+DEDUP_NAME_WEIGHT = 0.6
+DEDUP_PHONE_WEIGHT = 0.4
+DEDUP_THRESHOLD = 0.6
+DEDUP_CHUNK_RECORDS = 20000
+
+# Formatting characters stripped from imported phone numbers
+PHONE_SEPARATORS = str.maketrans("", "", " -().")
+
+# File types offered by the import and export dialogs
+CONTACT_FILE_TYPES = [("CSV files", "*.csv"), ("vCard files", "*.vcf"), ("All files", "*.*")]
+
+# Rows processed between commits (and progress reports) during a bulk import
+IMPORT_BATCH_SIZE = 5000
+
+# Live search settings
+SEARCH_DEBOUNCE_MS = 150
+SEARCH_RESULT_LIMIT = 500
+
+# Most names a fuzzy query computes edit distances for
+FUZZY_CANDIDATE_LIMIT = 2000
+# Most names collected per Soundex code of the query, closest spellings first
+FUZZY_BUCKET_SCAN = 5000
+# Edits up to which those spellings are ordered by distance; farther ones tie
+FUZZY_SPELLING_EDITS = 2
+
+# Trigram index for substring search, maintained incrementally on every change.
+# Text is padded with two end markers so any query shorter than three characters
+# is the prefix of at least one trigram; those are found through the prefix maps.
+# Keys get integer ids in insertion order and each posting is an array of ids, four
+# bytes per entry; ids only grow, so every posting stays sorted and intersections
+# are merges. Removing a key only retires its id, and the postings are compacted
+# once retired ids outnumber live ones.
+class NgramIndex:
+    PAD = "\0\0"
+
+    def __init__(self):
+        self.postings = {}
+        self.prefixes = {}
+        self.ids = {}
+        self.keys = []
+        self.retired = 0
+
+    def grams(self, text):
+        padded = text + self.PAD
+        return {padded[i:i + 3] for i in range(len(text))}
+
+    def add(self, key, text):
+        key_id = len(self.keys)
+        self.ids[key] = key_id
+        self.keys.append(key)
+        for gram in self.grams(text):
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array("I")
+                for size in (1, 2):
+                    self.prefixes.setdefault(gram[:size], set()).add(gram)
+            posting.append(key_id)
+
+    def remove(self, key, text):
+        self.keys[self.ids.pop(key)] = None
+        self.retired += 1
+        if self.retired > len(self.ids):
+            self.compact()
+
+    # Renumbers the live keys in order, which keeps the postings sorted, and drops
+    # postings left empty along with their prefix entries
+    def compact(self):
+        keys = self.keys
+        renumbered = [0] * len(keys)
+        live = []
+        for key_id, key in enumerate(keys):
+            if key is not None:
+                renumbered[key_id] = len(live)
+                self.ids[key] = len(live)
+                live.append(key)
+        for gram, posting in list(self.postings.items()):
+            kept = array("I", [renumbered[key_id] for key_id in posting if keys[key_id] is not None])
+            if kept:
+                self.postings[gram] = kept
+                continue
+            del self.postings[gram]
+            for size in (1, 2):
+                grams = self.prefixes[gram[:size]]
+                grams.discard(gram)
+                if not grams:
+                    del self.prefixes[gram[:size]]
+        self.keys = live
+        self.retired = 0
+
+    # Yields keys that may contain the query; long queries can give false positives
+    # (all trigrams present but not adjacent) so callers must verify the match.
+    def candidates(self, query):
+        keys = self.keys
+        if len(query) < 3:
+            for gram in self.prefixes.get(query, ()):
+                for key_id in self.postings[gram]:
+                    if keys[key_id] is not None:
+                        yield keys[key_id]
+            return
+        postings = []
+        for gram in {query[i:i + 3] for i in range(len(query) - 2)}:
+            posting = self.postings.get(gram)
+            if posting is None:
+                return
+            postings.append(posting)
+        postings.sort(key=len)
+        smallest, rest = postings[0], postings[1:]
+        # Walk the smallest posting; each other posting is searched from where the
+        # previous id was found, since all of them are sorted
+        starts = [0] * len(rest)
+        for key_id in smallest:
+            for index, posting in enumerate(rest):
+                position = bisect_left(posting, key_id, starts[index])
+                starts[index] = position
+                if position == len(posting) or posting[position] != key_id:
+                    break
+            else:
+                if keys[key_id] is not None:
+                    yield keys[key_id]
+
+# Soundex digit for each consonant; vowels, h, w and y have none
+SOUNDEX_CODES = {letter: digit for digit, letters in (("1", "bfpv"), ("2", "cgjkqsxz"), ("3", "dt"), ("4", "l"), ("5", "mn"), ("6", "r")) for letter in letters}
+
+def soundex(word):
+    letters = [c for c in word.lower() if "a" <= c <= "z"]
+    if not letters:
+        return None
+    code = letters[0].upper()
+    last = SOUNDEX_CODES.get(letters[0])
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter)
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate two letters with the same code; vowels do
+        if letter not in "hw":
+            last = digit
+    return code.ljust(4, "0")
+
+def levenshtein(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+# Bit masks of where each character occurs in a word, for bit_levenshtein
+def pattern_masks(word):
+    masks = {}
+    for i, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | 1 << i
+    return masks
+
+# Edit distance between a non-empty word and other by Myers' bit-parallel algorithm, one
+# column of the table per character of other, or limit + 1 as soon as the distance is
+# known to exceed limit (the score can drop by at most one per remaining character)
+def bit_levenshtein(word, masks, other, limit):
+    size = len(word)
+    if abs(size - len(other)) > limit:
+        return limit + 1
+    full = (1 << size) - 1
+    high = 1 << (size - 1)
+    positive = full
+    negative = 0
+    score = size
+    remaining = len(other)
+    for char in other:
+        equal = masks.get(char, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        up = negative | ~(horizontal | positive)
+        down = positive & horizontal
+        if up & high:
+            score += 1
+        elif down & high:
+            score -= 1
+        remaining -= 1
+        if score - remaining > limit:
+            return limit + 1
+        up = up << 1 | 1
+        positive = (down << 1 | ~(vertical | up)) & full
+        negative = up & vertical & full
+    return min(score, limit + 1)
+
+# Edit distance between a query and a name, word by word: each query word is matched
+# against its closest word in the name, so "jon" is one edit away from "John Smith".
+def token_distance(query_words, name_words):
+    return sum(min(levenshtein(word, other) for other in name_words) for word in query_words)
+
+# token_distance, or a value above bound once the distance is known to exceed it.
+# query holds (word, pattern masks, distances) per query word, where distances maps a
+# name word to (distance, limit it was computed with); names share most of their
+# words, so each pair is usually computed once per query. A stored distance above
+# its limit is only a lower bound and is recomputed when a later name allows more.
+def bounded_token_distance(query, name_words, bound):
+    total = 0
+    for word, masks, distances in query:
+        limit = bound - total
+        best = limit + 1
+        for other in name_words:
+            known = distances.get(other)
+            if known is not None and (known[0] <= known[1] or limit <= known[1]):
+                distance = known[0]
+            else:
+                distance = bit_levenshtein(word, masks, other, limit)
+                distances[other] = (distance, limit)
+            if distance < best:
+                best = distance
+                if not best:
+                    break
+                limit = best - 1
+        total += best
+        if total > bound:
+            break
+    return total
+
+# Phonetic-key hash index: Soundex code of every word in a name -> spelling of the word ->
+# names. Fuzzy queries only compute edit distances against names sharing at least one
+# code with the query.
+class PhoneticIndex:
+    def __init__(self):
+        self.keys = {}
+
+    # Lowercased words of a name grouped by Soundex code
+    def name_words(self, name):
+        words = {}
+        for word in name.lower().split():
+            key = soundex(word)
+            if key:
+                words.setdefault(key, set()).add(word)
+        return words
+
+    def add(self, name):
+        for key, words in self.name_words(name).items():
+            spellings = self.keys.setdefault(key, {})
+            for word in words:
+                spellings.setdefault(word, set()).add(name)
+
+    def remove(self, name):
+        for key, words in self.name_words(name).items():
+            spellings = self.keys[key]
+            for word in words:
+                names = spellings[word]
+                names.discard(name)
+                if not names:
+                    del spellings[word]
+            if not spellings:
+                del self.keys[key]
+
+    # (name, codes shared with the query) pairs, names sharing the most codes first. A
+    # common code is not scanned in full: its spellings are taken closest to the query
+    # word first until FUZZY_BUCKET_SCAN names have been collected for it.
+    def candidates(self, query, limit=FUZZY_CANDIDATE_LIMIT):
+        counts = Counter()
+        for key, words in self.name_words(query).items():
+            spellings = self.keys.get(key, {})
+            if sum(map(len, spellings.values())) > FUZZY_BUCKET_SCAN:
+                masks = [(word, pattern_masks(word)) for word in words]
+                distance = lambda spelling: min(bit_levenshtein(word, word_masks, spelling, FUZZY_SPELLING_EDITS) for word, word_masks in masks)
+                spellings = {spelling: spellings[spelling] for spelling in sorted(spellings, key=distance)}
+            names = set()
+            for spelling_names in spellings.values():
+                names.update(islice(spelling_names, FUZZY_BUCKET_SCAN - len(names)))
+                if len(names) >= FUZZY_BUCKET_SCAN:
+                    break
+            counts.update(names)
+        return counts.most_common(limit)
+
+# Contact store keeping a primary name index and a secondary phone -> name index.
+# Both indexes are updated together so every uniqueness check is a single hash lookup.
+# Trigram indexes over lowercased names and phone digits back the live search.
+class ContactStore:
+    # Built on the first fuzzy search, then kept up to date by add and delete
+    phonetic = None
+
+    def __init__(self):
+        self.contacts = {}
+        self.phone_index = {}
+        self.name_grams = NgramIndex()
+        self.phone_grams = NgramIndex()
+
+    def __len__(self):
+        return len(self.contacts)
+
+    def __contains__(self, name):
+        return name in self.contacts
+
+    def __iter__(self):
+        return iter(self.contacts)
+
+    def items(self):
+        return self.contacts.items()
+
+    def get(self, name):
+        return self.contacts.get(name)
+
+    def find_by_phone(self, phone):
+        return self.phone_index.get(phone)
+
+    def add(self, name, phone):
+        if not name or not phone:
+            raise ValueError("Both fields are required!")
+        if not phone.isdigit():
+            raise ValueError("Phone number must be numeric!")
+        owner = self.find_by_phone(phone)
+        if owner is not None:
+            raise ValueError(f"Contact with phone number {phone} already exists with name {owner}!")
+        if name in self:
+            raise ValueError("Contact already exists!")
+        self.insert(name, phone)
+        if self.phonetic is not None:
+            self.phonetic.add(name)
+
+    def update(self, name, phone):
+        if name not in self:
+            raise KeyError("Contact not found!")
+        if not phone.isdigit():
+            raise ValueError("Phone number must be numeric!")
+        owner = self.find_by_phone(phone)
+        if owner is not None and owner != name:
+            raise ValueError(f"Contact with phone number {phone} already exists with name {owner}!")
+        self.replace(name, phone)
+
+    def delete(self, name):
+        if name not in self:
+            raise KeyError("Contact not found!")
+        self.remove(name)
+        if self.phonetic is not None:
+            self.phonetic.remove(name)
+
+    # Names ranked by word-level edit distance, ties going to the most shared Soundex codes.
+    # With a limit, the distance of the limit-th best name so far bounds every later
+    # distance computation, and names beyond it are dropped without finishing.
+    def fuzzy_search(self, query, limit=None):
+        if self.phonetic is None:
+            self.phonetic = PhoneticIndex()
+            for name in self:
+                self.phonetic.add(name)
+        query_words = [(word, pattern_masks(word), {}) for word in query.lower().split()]
+        bound = float("inf")
+        best = []
+        ranked = []
+        for name, shared in self.phonetic.candidates(query):
+            distance = bounded_token_distance(query_words, name.lower().split(), bound)
+            if distance > bound:
+                continue
+            ranked.append((distance, -shared, name))
+            # best is a max-heap of the limit smallest distances seen
+            if limit is not None:
+                if len(best) < limit:
+                    heapq.heappush(best, -distance)
+                elif distance < -best[0]:
+                    heapq.heapreplace(best, -distance)
+                if best and len(best) == limit:
+                    bound = -best[0]
+        ranked.sort()
+        return [name for distance, shared, name in ranked[:limit]]
+
+    # Storage primitives, called once the checks above have passed
+    def insert(self, name, phone):
+        self.contacts[name] = {"phone": phone}
+        self.phone_index[phone] = name
+        self.name_grams.add(name, name.lower())
+        self.phone_grams.add(name, phone)
+
+    def replace(self, name, phone):
+        old_phone = self.contacts[name]["phone"]
+        del self.phone_index[old_phone]
+        self.phone_grams.remove(name, old_phone)
+        self.contacts[name] = {"phone": phone}
+        self.phone_index[phone] = name
+        self.phone_grams.add(name, phone)
+
+    def remove(self, name):
+        phone = self.contacts.pop(name)["phone"]
+        del self.phone_index[phone]
+        self.name_grams.remove(name, name.lower())
+        self.phone_grams.remove(name, phone)
+
+    # Row sequence for the contact table, in insertion order
+    def rows(self):
+        return list(self.contacts)
+
+    def commit(self):
+        pass
+
+    def reload(self):
+        pass
+
+    def close(self):
+        pass
+
+    # Names whose lowercased name contains the query or whose phone contains it
+    def search(self, query, limit=None):
+        if not query:
+            candidates = iter(self.contacts)
+        else:
+            lowered = query.lower()
+            candidates = (name for name in self.name_grams.candidates(lowered) if lowered in name.lower())
+            if query.isdigit():
+                candidates = chain(candidates, (name for name in self.phone_grams.candidates(query) if query in self.contacts[name]["phone"]))
+        found = {}
+        for name in candidates:
+            found[name] = None
+            if limit is not None and len(found) >= limit:
+                break
+        return list(found)
+
+# Compact columnar contact store. Names live in one list and phones in an array of packed
+# integers ("1" + digits, so leading zeros survive); phones longer than PACKED_PHONE_DIGITS
+# go to small overflow dicts. The name and phone indexes are open-addressing hash tables
+# of slot numbers held in arrays, so no per-contact dicts or int objects are allocated.
+# Deleted slots are left as holes (keeping insertion order) until compact() rewrites them.
+# Search is a scan over the columns: this mode trades search speed for memory.
+class CompactContactStore(ContactStore):
+    EMPTY = -1
+    DELETED = -2
+
+    def __init__(self):
+        self.names = []
+        self.phones = array("Q")
+        self.long_phones = {}
+        self.long_phone_slots = {}
+        self.holes = 0
+        self.name_table = array("q", [self.EMPTY]) * 8
+        self.phone_table = array("q", [self.EMPTY]) * 8
+        self.name_fill = 0
+        self.phone_fill = 0
+
+    def __len__(self):
+        return len(self.names) - self.holes
+
+    def __contains__(self, name):
+        return self.find_slot(self.name_table, hash(name), name, self.names)[1] >= 0
+
+    def __iter__(self):
+        return (name for name in self.names if name is not None)
+
+    def items(self):
+        return ((name, {"phone": self.phone_at(slot)}) for slot, name in enumerate(self.names) if name is not None)
+
+    def get(self, name):
+        slot = self.find_slot(self.name_table, hash(name), name, self.names)[1]
+        return None if slot < 0 else {"phone": self.phone_at(slot)}
+
+    def find_by_phone(self, phone):
+        if len(phone) > PACKED_PHONE_DIGITS:
+            slot = self.long_phone_slots.get(phone, -1)
+        else:
+            packed = int("1" + phone)
+            slot = self.find_slot(self.phone_table, packed, packed, self.phones)[1]
+        return None if slot < 0 else self.names[slot]
+
+    def phone_at(self, slot):
+        packed = self.phones[slot]
+        if packed == 0:
+            return self.long_phones[slot]
+        return str(packed)[1:]
+
+    # Probes a table the way CPython's dict does; returns (table position, slot or -1).
+    # When the key is missing the position is where it should be inserted.
+    def find_slot(self, table, key_hash, key, column):
+        mask = len(table) - 1
+        perturb = key_hash & 0xFFFFFFFFFFFFFFFF
+        position = key_hash & mask
+        free = -1
+        while True:
+            slot = table[position]
+            if slot == self.EMPTY:
+                return (position if free < 0 else free), -1
+            if slot == self.DELETED:
+                if free < 0:
+                    free = position
+            elif column[slot] == key:
+                return position, slot
+            perturb >>= 5
+            position = (position * 5 + perturb + 1) & mask
+
+    def table_insert(self, table, fill, key_hash, key, column, slot):
+        position = self.find_slot(table, key_hash, key, column)[0]
+        if table[position] == self.EMPTY:
+            fill += 1
+        table[position] = slot
+        return fill
+
+    def table_delete(self, table, key_hash, key, column):
+        position = self.find_slot(table, key_hash, key, column)[0]
+        table[position] = self.DELETED
+
+    def index_phone(self, phone, slot):
+        if len(phone) > PACKED_PHONE_DIGITS:
+            self.phones[slot] = 0
+            self.long_phones[slot] = phone
+            self.long_phone_slots[phone] = slot
+            return
+        packed = int("1" + phone)
+        self.phones[slot] = packed
+        self.phone_fill = self.table_insert(self.phone_table, self.phone_fill, packed, packed, self.phones, slot)
+
+    def unindex_phone(self, phone):
+        if len(phone) > PACKED_PHONE_DIGITS:
+            del self.long_phones[self.long_phone_slots.pop(phone)]
+        else:
+            packed = int("1" + phone)
+            self.table_delete(self.phone_table, packed, packed, self.phones)
+
+    def insert(self, name, phone):
+        slot = len(self.names)
+        self.names.append(name)
+        self.phones.append(0)
+        self.name_fill = self.table_insert(self.name_table, self.name_fill, hash(name), name, self.names, slot)
+        self.index_phone(phone, slot)
+        self.grow_tables()
+
+    def replace(self, name, phone):
+        slot = self.find_slot(self.name_table, hash(name), name, self.names)[1]
+        self.unindex_phone(self.phone_at(slot))
+        self.index_phone(phone, slot)
+        self.grow_tables()
+
+    def remove(self, name):
+        slot = self.find_slot(self.name_table, hash(name), name, self.names)[1]
+        self.unindex_phone(self.phone_at(slot))
+        self.table_delete(self.name_table, hash(name), name, self.names)
+        self.names[slot] = None
+        self.phones[slot] = 0
+        self.holes += 1
+        if self.holes > 1024 and self.holes * 2 > len(self.names):
+            self.compact()
+
+    # Tables are rebuilt once live entries plus tombstones pass two thirds of their size
+    def grow_tables(self):
+        if self.name_fill * 3 >= len(self.name_table) * 2 or self.phone_fill * 3 >= len(self.phone_table) * 2:
+            self.rebuild_tables()
+
+    def rebuild_tables(self):
+        size = 8
+        while size * 2 <= len(self) * 3:
+            size *= 2
+        self.name_table = array("q", [self.EMPTY]) * size
+        self.phone_table = array("q", [self.EMPTY]) * size
+        self.name_fill = self.phone_fill = 0
+        for slot, name in enumerate(self.names):
+            if name is None:
+                continue
+            self.name_fill = self.table_insert(self.name_table, self.name_fill, hash(name), name, self.names, slot)
+            packed = self.phones[slot]
+            if packed:
+                self.phone_fill = self.table_insert(self.phone_table, self.phone_fill, packed, packed, self.phones, slot)
+
+    # Drops the holes left by deletes and renumbers the slots
+    def compact(self):
+        live = [slot for slot, name in enumerate(self.names) if name is not None]
+        renumber = {old: new for new, old in enumerate(live)}
+        self.names = [self.names[slot] for slot in live]
+        self.phones = array("Q", (self.phones[slot] for slot in live))
+        self.long_phones = {renumber[slot]: phone for slot, phone in self.long_phones.items()}
+        self.long_phone_slots = {phone: slot for slot, phone in self.long_phones.items()}
+        self.holes = 0
+        self.rebuild_tables()
+
+    def search(self, query, limit=None):
+        lowered = query.lower()
+        digits = query.isdigit()
+        found = []
+        for slot, name in enumerate(self.names):
+            if name is None:
+                continue
+            if lowered in name.lower() or (digits and query in self.phone_at(slot)):
+                found.append(name)
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def rows(self):
+        return list(self)
+
+# SQLite-backed contact store. The database runs in WAL mode with unique indexes on name
+# and phone, and an FTS5 trigram index (kept in sync by triggers) answers substring search.
+# Statements are fixed parameterized strings, so the connection's statement cache compiles
+# each one only once. Writes open an implicit transaction that stays open until commit(),
+# which lets the GUI group a burst of edits into a single transaction.
+class SqliteContactStore(ContactStore):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS contacts (id INTEGER PRIMARY KEY, name TEXT NOT NULL, phone TEXT NOT NULL);
+        CREATE UNIQUE INDEX IF NOT EXISTS contacts_name ON contacts(name);
+        CREATE UNIQUE INDEX IF NOT EXISTS contacts_phone ON contacts(phone);
+    """
+    SEARCH_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS contacts_search USING fts5(name, phone, content='contacts', content_rowid='id', tokenize='trigram');
+        CREATE TRIGGER IF NOT EXISTS contacts_ai AFTER INSERT ON contacts BEGIN
+            INSERT INTO contacts_search(rowid, name, phone) VALUES (new.id, new.name, new.phone);
+        END;
+        CREATE TRIGGER IF NOT EXISTS contacts_ad AFTER DELETE ON contacts BEGIN
+            INSERT INTO contacts_search(contacts_search, rowid, name, phone) VALUES ('delete', old.id, old.name, old.phone);
+        END;
+        CREATE TRIGGER IF NOT EXISTS contacts_au AFTER UPDATE ON contacts BEGIN
+            INSERT INTO contacts_search(contacts_search, rowid, name, phone) VALUES ('delete', old.id, old.name, old.phone);
+            INSERT INTO contacts_search(rowid, name, phone) VALUES (new.id, new.name, new.phone);
+        END;
+    """
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(self.SCHEMA)
+        try:
+            self.db.executescript(self.SEARCH_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 or the trigram tokenizer: search falls back to LIKE
+            self.fts = False
+        self.reload()
+
+    # Re-reads the row count after other connections (an import worker) have written
+    def reload(self):
+        self.count = self.db.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+        self.phonetic = None
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, name):
+        return self.db.execute("SELECT 1 FROM contacts WHERE name = ?", (name,)).fetchone() is not None
+
+    def __iter__(self):
+        return (name for name, in self.db.execute("SELECT name FROM contacts ORDER BY id"))
+
+    def items(self):
+        return ((name, {"phone": phone}) for name, phone in self.db.execute("SELECT name, phone FROM contacts ORDER BY id"))
+
+    def get(self, name):
+        row = self.db.execute("SELECT phone FROM contacts WHERE name = ?", (name,)).fetchone()
+        return None if row is None else {"phone": row[0]}
+
+    def find_by_phone(self, phone):
+        row = self.db.execute("SELECT name FROM contacts WHERE phone = ?", (phone,)).fetchone()
+        return None if row is None else row[0]
+
+    def insert(self, name, phone):
+        self.db.execute("INSERT INTO contacts (name, phone) VALUES (?, ?)", (name, phone))
+        self.count += 1
+
+    def replace(self, name, phone):
+        self.db.execute("UPDATE contacts SET phone = ? WHERE name = ?", (phone, name))
+
+    def remove(self, name):
+        self.db.execute("DELETE FROM contacts WHERE name = ?", (name,))
+        self.count -= 1
+
+    def search(self, query, limit=None):
+        limit = -1 if limit is None else limit
+        if not query:
+            cursor = self.db.execute("SELECT name FROM contacts ORDER BY id LIMIT ?", (limit,))
+        # Phones are only matched by digit queries, as in the in-memory stores
+        elif self.fts and len(query) >= 3:
+            phrase = ("{name phone}" if query.isdigit() else "name") + ' : "' + query.replace('"', '""') + '"'
+            cursor = self.db.execute("SELECT name FROM contacts_search WHERE contacts_search MATCH ? ORDER BY rowid LIMIT ?", (phrase, limit))
+        else:
+            # Short queries match early, so the LIMIT usually stops the scan quickly
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            if query.isdigit():
+                cursor = self.db.execute("SELECT name FROM contacts WHERE name LIKE ? ESCAPE '\\' OR phone LIKE ? ESCAPE '\\' ORDER BY id LIMIT ?", (pattern, pattern, limit))
+            else:
+                cursor = self.db.execute("SELECT name FROM contacts WHERE name LIKE ? ESCAPE '\\' ORDER BY id LIMIT ?", (pattern, limit))
+        return [name for name, in cursor]
+
+    def contact_id(self, name):
+        row = self.db.execute("SELECT id FROM contacts WHERE name = ?", (name,)).fetchone()
+        return None if row is None else row[0]
+
+    # Keyset paging: up to limit (id, name) rows after the row with id after, in id order
+    def page(self, after, limit):
+        return self.db.execute("SELECT id, name FROM contacts WHERE id > ? ORDER BY id LIMIT ?", (after, limit)).fetchall()
+
+    # Id of the size-th row after the row with id after, or None if fewer rows follow. The
+    # skip is at most one page from a known id, unlike an OFFSET from the start of the table.
+    def page_end(self, after, size):
+        row = self.db.execute("SELECT id FROM contacts WHERE id > ? ORDER BY id LIMIT 1 OFFSET ?", (after, size - 1)).fetchone()
+        return None if row is None else row[0]
+
+    # Number of rows with an id strictly between after and before
+    def count_between(self, after, before):
+        return self.db.execute("SELECT COUNT(*) FROM contacts WHERE id > ? AND id < ?", (after, before)).fetchone()[0]
+
+    def rows(self):
+        return ContactPages(self)
+
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+# In-memory stores selectable with --store
+MEMORY_STORES = {"dict": ContactStore, "compact": CompactContactStore}
+
+# Lazy row sequence over a SqliteContactStore for VirtualTree. Rows are fetched a page at
+# a time as they scroll into view and a few recent pages are kept; any mutation drops them.
+# Pages are read by keyset from the id that ends the page before, and those boundaries are
+# kept, so jumping back to a page or finding a row's position never counts rows from the
+# start of the table again. Deleting a row only invalidates the boundaries after it.
+class ContactPages:
+    def __init__(self, store, page_size=CONTACT_PAGE_SIZE, cached_pages=8):
+        self.store = store
+        self.page_size = page_size
+        self.cached_pages = cached_pages
+        self.pages = OrderedDict()
+        # bounds[n] is the id of the last row before page n; ids start at 1
+        self.bounds = [0]
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, position):
+        number = position // self.page_size
+        page = self.pages.get(number)
+        if page is None:
+            page = self.pages[number] = self.store.page(self.bound(number), self.page_size)
+            if len(self.bounds) == number + 1 and len(page) == self.page_size:
+                self.bounds.append(page[-1][0])
+            if len(self.pages) > self.cached_pages:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(number)
+        return page[position - number * self.page_size][1]
+
+    # Boundary before a page, walking forward from the last known one
+    def bound(self, number):
+        while len(self.bounds) <= number:
+            self.bounds.append(self.store.page_end(self.bounds[-1], self.page_size))
+        return self.bounds[number]
+
+    def __contains__(self, name):
+        return name in self.store
+
+    def __delitem__(self, position):
+        self.pages.clear()
+        del self.bounds[position // self.page_size + 1:]
+
+    def index(self, name):
+        contact = self.store.contact_id(name)
+        if contact is None:
+            raise ValueError(f"{name} is not in the table")
+        # Walk the boundaries forward until one lies at or past the contact or the
+        # last page is reached; it is then in the page after the last boundary below it
+        while self.bounds[-1] < contact:
+            end = self.store.page_end(self.bounds[-1], self.page_size)
+            if end is None:
+                break
+            self.bounds.append(end)
+        number = bisect_left(self.bounds, contact) - 1
+        return number * self.page_size + self.store.count_between(self.bounds[number], contact)
+
+    def append(self, name):
+        self.pages.clear()
+
+# Virtualized view over a Treeview: only the visible rows plus a small overscan exist
+# as items, and they are recycled while scrolling. The full row order lives in self.rows,
+# which is a list of names or a lazily paged ContactPages sequence.
+class VirtualTree:
+    def __init__(self, tree, scrollbar, row_values, overscan=OVERSCAN_ROWS):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_values = row_values
+        self.visible = int(tree.cget("height"))
+        self.rows = []
+        self.top = 0
+        self.items = [tree.insert("", "end") for _ in range(self.visible + overscan)]
+        self.attached = len(self.items)
+        self.scrollbar.config(command=self.yview)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(3))
+        self.render()
+
+    def set_rows(self, rows):
+        self.rows = rows
+        self.top = 0
+        self.render()
+
+    def insert(self, name):
+        self.rows.append(name)
+        position = len(self.rows) - 1
+        if position < self.top + len(self.items):
+            self.render_from(position)
+        self.update_scrollbar()
+
+    def refresh(self, name):
+        if name not in self.rows:
+            return
+        position = self.rows.index(name)
+        slot = position - self.top
+        if 0 <= slot < len(self.items):
+            self.tree.item(self.items[slot], values=self.row_values(position, name))
+
+    # Position of a shown contact, looked up before it is deleted from the store
+    def find(self, name):
+        if name not in self.rows:
+            return None
+        return self.rows.index(name)
+
+    def remove_at(self, position):
+        if position is None:
+            return
+        del self.rows[position]
+        old_top = self.top
+        self.top = max(0, min(self.top, len(self.rows) - self.visible))
+        # Rows below the removed one shift up and get new index numbers
+        self.render_from(position if self.top == old_top else self.top)
+        self.update_scrollbar()
+
+    def render(self):
+        self.render_from(self.top)
+        self.tree.yview_moveto(0)
+        self.update_scrollbar()
+
+    # Rewrites the recycled items from a row position to the end of the window
+    def render_from(self, position):
+        end = min(len(self.rows), self.top + len(self.items))
+        for row in range(max(position, self.top), end):
+            self.tree.item(self.items[row - self.top], values=self.row_values(row, self.rows[row]))
+        count = end - self.top
+        if count < self.attached:
+            self.tree.detach(*self.items[count:self.attached])
+        elif count > self.attached:
+            for slot in range(self.attached, count):
+                self.tree.move(self.items[slot], "", slot)
+        self.attached = count
+
+    def scroll(self, rows):
+        top = max(0, min(self.top + rows, len(self.rows) - self.visible))
+        if top != self.top:
+            self.top = top
+            self.render()
+        return "break"
+
+    def on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    # Scrollbar protocol: "moveto fraction" or "scroll n units|pages"
+    def yview(self, *args):
+        if args[0] == "moveto":
+            top = int(float(args[1]) * len(self.rows))
+            self.scroll(top - self.top)
+        elif args[0] == "scroll":
+            step = self.visible if args[2] == "pages" else 1
+            self.scroll(int(args[1]) * step)
+
+    def update_scrollbar(self):
+        if not self.rows:
+            self.scrollbar.set(0, 1)
+            return
+        total = len(self.rows)
+        self.scrollbar.set(self.top / total, min(1, (self.top + self.visible) / total))
+
+# Bulk import/export pipeline. Every stage is a generator, so a file of any size is
+# streamed one record at a time: parse -> normalize -> validate -> add (uniqueness) ->
+# commit every batch_size rows. Rejected records are counted in stats["skipped"].
+def parse_csv(lines):
+    for line_number, row in enumerate(csv.reader(lines)):
+        if not row or (line_number == 0 and row[0].strip().lower() == "name"):
+            continue
+        yield row[0], row[1] if len(row) > 1 else ""
+
+def unfold_vcard(lines):
+    pending = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending is not None:
+        yield pending
+
+def parse_vcard(lines):
+    name = phone = None
+    for line in unfold_vcard(lines):
+        key, _, value = line.partition(":")
+        key = key.split(";")[0].split(".")[-1].upper()
+        if key == "BEGIN":
+            name = phone = None
+        elif key == "FN":
+            name = value.replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+        elif key == "TEL" and phone is None:
+            phone = value
+        elif key == "END":
+            yield name or "", phone or ""
+
+# A leading + becomes the international prefix 00, which canonical_phone understands
+def normalize_records(records):
+    for name, phone in records:
+        phone = phone.strip()
+        if phone.lower().startswith("tel:"):
+            phone = phone[4:]
+        phone = phone.translate(PHONE_SEPARATORS)
+        if phone.startswith("+"):
+            phone = "00" + phone[1:]
+        yield name.strip(), phone
+
+def validate_records(records, stats):
+    for name, phone in records:
+        if name and phone.isdigit():
+            yield name, phone
+        else:
+            stats["skipped"] += 1
+
+def contact_format(path):
+    return "vcard" if path.lower().endswith((".vcf", ".vcard")) else "csv"
+
+def import_contacts(store, path, progress=None, batch_size=IMPORT_BATCH_SIZE):
+    stats = {"imported": 0, "skipped": 0}
+    parse = parse_vcard if contact_format(path) == "vcard" else parse_csv
+    with open(path, newline="", encoding="utf-8") as file:
+        records = validate_records(normalize_records(parse(file)), stats)
+        for processed, (name, phone) in enumerate(records, start=1):
+            # store.add checks name and phone uniqueness against the indexes
+            try:
+                store.add(name, phone)
+                stats["imported"] += 1
+            except ValueError:
+                stats["skipped"] += 1
+            if processed % batch_size == 0:
+                store.commit()
+                if progress:
+                    progress(stats)
+    store.commit()
+    if progress:
+        progress(stats)
+    return stats
+
+def export_contacts(store, path):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        if contact_format(path) == "vcard":
+            for name, details in store.items():
+                escaped = name.replace("\\", "\\\\").replace(",", "\\,").replace(";", "\\;")
+                file.write(f"BEGIN:VCARD\r\nVERSION:3.0\r\nFN:{escaped}\r\nTEL:{details['phone']}\r\nEND:VCARD\r\n")
+                count += 1
+        else:
+            writer = csv.writer(file)
+            writer.writerow(["Name", "Phone"])
+            for name, details in store.items():
+                writer.writerow([name, details['phone']])
+                count += 1
+    return count
+
+# Duplicate detection: phones are canonicalized (international prefix, country code and
+# trunk zeros dropped), contacts are grouped into blocks sharing a phone suffix, and pairs
+# inside each block are scored on a process pool. Matching pairs are
+# joined into clusters; the oldest contact of each cluster is kept and the rest deleted.
+def canonical_phone(phone, country_code=DEFAULT_COUNTRY_CODE):
+    if phone.startswith("00"):
+        phone = phone[2:]
+    if country_code and phone.startswith(country_code) and len(phone) > NATIONAL_PHONE_DIGITS:
+        phone = phone[len(country_code):]
+    return phone.lstrip("0")
+
+def normalize_name(name):
+    return " ".join("".join(c for c in name.lower() if c.isalnum() or c.isspace()).split())
+
+def pair_score(name_a, phone_a, name_b, phone_b):
+    if phone_a == phone_b:
+        phone_score = 1.0
+    elif phone_a[-DEDUP_PHONE_SUFFIX:] == phone_b[-DEDUP_PHONE_SUFFIX:]:
+        phone_score = 0.8
+    else:
+        # Two people can share a name, so a pair whose phones disagree is never a duplicate
+        return 0.0
+    if name_a == name_b:
+        similarity = 1.0
+    else:
+        # Skip the edit distance when even the best case cannot reach the threshold
+        needed = (DEDUP_THRESHOLD - DEDUP_PHONE_WEIGHT * phone_score) / DEDUP_NAME_WEIGHT
+        longest = max(len(name_a), len(name_b))
+        if needed >= 1 or 1 - abs(len(name_a) - len(name_b)) / longest < needed:
+            return 0.0
+        similarity = 1 - levenshtein(name_a, name_b) / longest
+    return DEDUP_NAME_WEIGHT * similarity + DEDUP_PHONE_WEIGHT * phone_score
+
+# Worker task: each block is a list of (record index, normalized name, canonical phone).
+# Members are sorted by name and compared with the next DEDUP_WINDOW neighbours only.
+def score_blocks(blocks):
+    pairs = []
+    for block in blocks:
+        block.sort(key=lambda record: record[1])
+        for position, (i, name_a, phone_a) in enumerate(block):
+            for j, name_b, phone_b in block[position + 1:position + 1 + DEDUP_WINDOW]:
+                if pair_score(name_a, phone_a, name_b, phone_b) >= DEDUP_THRESHOLD:
+                    pairs.append((min(i, j), max(i, j)))
+    return pairs
+
+def find_duplicates(store, country_code=DEFAULT_COUNTRY_CODE, workers=None, progress=None):
+    report = progress or (lambda stage: None)
+    report("canonicalizing phones")
+    names = []
+    blocks = {}
+    for index, (name, details) in enumerate(store.items()):
+        record = (index, normalize_name(name), canonical_phone(details['phone'], country_code))
+        names.append(name)
+        # Only contacts whose phones agree can pair up, and those share this block
+        blocks.setdefault(record[2][-DEDUP_PHONE_SUFFIX:], []).append(record)
+
+    report("scoring candidate pairs")
+    chunks = []
+    chunk = []
+    chunk_size = 0
+    for block in blocks.values():
+        if len(block) < 2:
+            continue
+        chunk.append(block)
+        chunk_size += len(block)
+        if chunk_size >= DEDUP_CHUNK_RECORDS:
+            chunks.append(chunk)
+            chunk = []
+            chunk_size = 0
+    if chunk:
+        chunks.append(chunk)
+    del blocks
+
+    parent = {}
+
+    def find(i):
+        while parent.get(i, i) != i:
+            parent[i] = parent.get(parent[i], parent[i])
+            i = parent[i]
+        return i
+
+    pool = None
+    try:
+        if workers == 1:
+            results = map(score_blocks, chunks)
+        else:
+            # spawn keeps forked children away from the Tk interpreter when run from the GUI
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            results = pool.map(score_blocks, chunks)
+
+        report("building merge plan")
+        for pairs in results:
+            for i, j in pairs:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+    finally:
+        # A failed chunk must not leave the workers running; queued chunks are dropped
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    clusters = {}
+    for i in parent:
+        clusters.setdefault(find(i), []).append(i)
+    return [(names[keeper], [names[i] for i in sorted(members) if i != keeper]) for keeper, members in sorted(clusters.items())]
+
+# Deletes every duplicate in the plan and commits once. This only deletes: a contact is
+# just a name and one phone, and pair_score only pairs contacts whose phones are the same
+# number once canonicalized or share its last DEDUP_PHONE_SUFFIX digits, so the keeper
+# keeps its own phone and the duplicates' phones are dropped.
+def delete_duplicates(store, plan):
+    removed = 0
+    for keeper, duplicates in plan:
+        for name in duplicates:
+            if name in store:
+                store.delete(name)
+                removed += 1
+    store.commit()
+    return removed
 
 # Data Structure to store contacts
-contacts = {}
+contacts = ContactStore()
 
 # Custom input dialog function
 def custom_input_dialog(title, fields):
@@ -45,119 +1157,515 @@ def add_contact():
     inputs = custom_input_dialog("Add Contact", fields)
     name = inputs["Name"]
     phone = inputs["Phone Number"]
-    if not name or not phone:
-        messagebox.showerror("Error", "Both fields are required!")
-        return
-    if not phone.isdigit():
-        messagebox.showerror("Error", "Phone number must be numeric!")
-        return
-    for contact_name, details in contacts.items():
-        if phone == details["phone"]:
-            messagebox.showerror("Error", f"Contact with phone number {phone} already exists with name {contact_name}!")
-            return
-    if name in contacts:
-        messagebox.showerror("Error", "Contact already exists!")
+    try:
+        contacts.add(name, phone)
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
         return
-    contacts[name] = {"phone": phone}
+    schedule_commit()
     messagebox.showinfo("Success", f"Contact {name} added successfully!")
-    view_contacts()
+    # Search results only gain the contact if the query finds it, so the query is re-run
+    if searching:
+        cancel_search()
+        run_search()
+    else:
+        contact_view.insert(name)
+
+def contact_row(position, name):
+    return (position + 1, name, contacts.get(name)['phone'])
+
+def show_contacts(rows):
+    contact_view.set_rows(rows)
 
 def view_contacts():
-    for item in contact_tree.get_children():
-        contact_tree.delete(item)
-    for index, (name, details) in enumerate(contacts.items(), start=1):
-        contact_tree.insert("", "end", values=(index, name, details['phone']))
+    global searching
+    search_var.set("")
+    cancel_search()
+    searching = False
+    show_contacts(contacts.rows())
 
-def search_contact():
-    fields = ["Search Query"]
-    inputs = custom_input_dialog("Search Contact", fields)
-    query = inputs["Search Query"]
-    found_contacts = {name: details for name, details in contacts.items() if query.lower() in name.lower() or query in details['phone']}
-    for item in contact_tree.get_children():
-        contact_tree.delete(item)
+# Edits are committed together once they stop arriving for DB_COMMIT_DELAY_MS
+def schedule_commit():
+    global commit_job
+    if commit_job is not None:
+        root.after_cancel(commit_job)
+    commit_job = root.after(DB_COMMIT_DELAY_MS, commit_contacts)
+
+def commit_contacts():
+    global commit_job
+    commit_job = None
+    contacts.commit()
+
+def on_close():
+    if commit_job is not None:
+        root.after_cancel(commit_job)
+    contacts.close()
+    root.destroy()
+
+# Live search: keystrokes are debounced and the query is answered from the trigram index.
+# searching is set while the table shows search results instead of every contact.
+def schedule_search(*args):
+    global search_job
+    cancel_search()
+    search_job = root.after(SEARCH_DEBOUNCE_MS, run_search)
+
+def cancel_search():
+    global search_job
+    if search_job is not None:
+        root.after_cancel(search_job)
+        search_job = None
+
+def run_search():
+    global search_job, searching
+    search_job = None
+    searching = True
+    query = search_var.get()
+    if fuzzy_var.get() and query.strip():
+        found_contacts = contacts.fuzzy_search(query, limit=SEARCH_RESULT_LIMIT)
+    else:
+        found_contacts = contacts.search(query, limit=SEARCH_RESULT_LIMIT)
+    show_contacts(found_contacts)
     if found_contacts:
-        for index, (name, details) in enumerate(found_contacts.items(), start=1):
-            contact_tree.insert("", "end", values=(index, name, details['phone']))
+        search_status.config(text="")
     else:
-        messagebox.showinfo("No Match", "No matching contacts found!")
+        search_status.config(text="No matching contacts found!")
+
+def search_contact():
+    search_entry.focus_set()
+    search_entry.select_range(0, tk.END)
 
 def update_contact():
     fields = ["Name", "New Phone Number"]
     inputs = custom_input_dialog("Update Contact", fields)
     name = inputs["Name"]
     phone = inputs["New Phone Number"]
-    if name in contacts:
-        if not phone.isdigit():
-            messagebox.showerror("Error", "Phone number must be numeric!")
-            return
-        contacts[name] = {"phone": phone}
-        messagebox.showinfo("Success", f"Contact {name} updated successfully!")
-        view_contacts()
-    else:
+    try:
+        contacts.update(name, phone)
+    except KeyError:
         messagebox.showerror("Error", "Contact not found!")
+        return
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
+        return
+    schedule_commit()
+    messagebox.showinfo("Success", f"Contact {name} updated successfully!")
+    contact_view.refresh(name)
 
 def delete_contact():
     fields = ["Name"]
     inputs = custom_input_dialog("Delete Contact", fields)
     name = inputs["Name"]
     if name in contacts:
-        del contacts[name]
+        position = contact_view.find(name)
+        contacts.delete(name)
+        schedule_commit()
         messagebox.showinfo("Success", f"Contact {name} deleted successfully!")
-        view_contacts()
+        contact_view.remove_at(position)
     else:
         messagebox.showerror("Error", "Contact not found!")
 
+# Bulk import/export runs on a worker thread with its own database connection; it
+# reports through a queue that the mainloop polls, so Tk is only touched from one thread.
+def start_transfer(title, work, on_done=None):
+    global transfer_thread
+    if transfer_thread is not None:
+        messagebox.showerror("Error", "A background job is already running!")
+        return
+    if not isinstance(contacts, SqliteContactStore) or db_path == ":memory:":
+        messagebox.showerror("Error", "Background jobs need a database file!")
+        return
+    # Pending edits must be visible to the worker's connection
+    if commit_job is not None:
+        root.after_cancel(commit_job)
+    commit_contacts()
+
+    # Any failure, including opening the database, must reach poll_transfer, which
+    # otherwise keeps polling and never lets another job start
+    def worker():
+        store = None
+        try:
+            store = SqliteContactStore(db_path)
+            transfer_queue.put(("done", work(store)))
+        except Exception as e:
+            transfer_queue.put(("error", str(e) or type(e).__name__))
+        finally:
+            if store is not None:
+                store.close()
+
+    transfer_status.config(text=f"{title}...")
+    transfer_thread = threading.Thread(target=worker, daemon=True)
+    transfer_thread.start()
+    set_editing(False)
+    root.after(100, poll_transfer, title, on_done)
+
+# The worker holds SQLite's write lock between its batch commits, so an edit would block
+# the mainloop for the busy timeout and then fail; editing is disabled while it runs
+def set_editing(enabled):
+    for button in edit_buttons:
+        button.config(state=tk.NORMAL if enabled else tk.DISABLED)
+
+def poll_transfer(title, on_done):
+    global transfer_thread
+    message = None
+    while not transfer_queue.empty():
+        message = transfer_queue.get()
+        if message[0] == "progress":
+            transfer_status.config(text=f"{title}: {message[1]}")
+    if message is None or message[0] == "progress":
+        root.after(100, poll_transfer, title, on_done)
+        return
+    transfer_thread = None
+    set_editing(True)
+    contacts.reload()
+    view_contacts()
+    if message[0] == "error":
+        transfer_status.config(text="")
+        messagebox.showerror("Error", message[1])
+    elif on_done is not None:
+        transfer_status.config(text="")
+        on_done(message[1])
+    else:
+        transfer_status.config(text=f"{title} finished: {message[1]}")
+
+def import_file():
+    path = filedialog.askopenfilename(parent=root, title="Import Contacts", filetypes=CONTACT_FILE_TYPES)
+    if path:
+        progress = lambda stats: transfer_queue.put(("progress", describe_import(stats)))
+        start_transfer("Importing", lambda store: describe_import(import_contacts(store, path, progress)))
+
+def export_file():
+    path = filedialog.asksaveasfilename(parent=root, title="Export Contacts", filetypes=CONTACT_FILE_TYPES, defaultextension=".csv")
+    if path:
+        start_transfer("Exporting", lambda store: f"{export_contacts(store, path)} contacts exported")
+
+def describe_import(stats):
+    return f"{stats['imported']} imported, {stats['skipped']} skipped"
+
+def find_duplicates_gui():
+    progress = lambda stage: transfer_queue.put(("progress", stage))
+    start_transfer("Finding duplicates", lambda store: find_duplicates(store, progress=progress), show_merge_plan)
+
+# Lists the merge plan and deletes all the duplicates in one batch when confirmed
+def show_merge_plan(plan):
+    if not plan:
+        messagebox.showinfo("No Duplicates", "No duplicate contacts found!")
+        return
+    plan_window = Toplevel(root)
+    plan_window.title("Delete Duplicates")
+    plan_window.geometry("500x400")
+    plan_window.config(bg="#e8f4f8")
+    merged = sum(len(duplicates) for keeper, duplicates in plan)
+    summary = Label(plan_window, text=f"{merged} duplicates of {len(plan)} contacts", bg="#e8f4f8", fg="#333333", font=custom_font)
+    summary.pack(pady=5)
+    plan_text = tk.Text(plan_window, height=15, width=60)
+    plan_text.pack(padx=10, pady=5)
+    plan_text.insert(tk.END, "\n".join(f"{keeper} <- {', '.join(duplicates)}" for keeper, duplicates in plan))
+    plan_text.config(state=tk.DISABLED)
+
+    def on_apply():
+        if transfer_thread is not None:
+            messagebox.showerror("Error", "Wait for the background job to finish!")
+            return
+        removed = delete_duplicates(contacts, plan)
+        plan_window.destroy()
+        view_contacts()
+        messagebox.showinfo("Success", f"{removed} duplicate contacts deleted!")
+
+    apply_btn = Button(plan_window, text="Delete", command=on_apply, width=10, bg="#4caf50", fg="white", font=custom_font, bd=0, highlightthickness=0)
+    apply_btn.pack(pady=10)
+
+# Fuzzy search through the phonetic index against a naive Levenshtein scan of every name
+def benchmark_fuzzy(total=100_000, queries=5):
+    rng = random.Random(0)
+    syllables = ["an", "ber", "cha", "dra", "el", "fin", "gor", "hal", "is", "jo", "ka", "lin", "mar", "nor", "ol", "pet", "ra", "sam", "tor", "vin"]
+    word = lambda: "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))).capitalize()
+    store = ContactStore()
+    while len(store) < total:
+        name = f"{word()} {word()}"
+        if name not in store:
+            store.add(name, str(6000000000 + len(store)))
+    names = list(store)
+    begin = time.perf_counter()
+    store.fuzzy_search("warm up")
+    print(f"phonetic index built in {(time.perf_counter() - begin) * 1e3:.0f} ms")
+    print(f"{'query':>24} {'index ms':>10} {'scan ms':>10} {'top match':>24}")
+    for _ in range(queries):
+        target = list(rng.choice(names).lower())
+        position = rng.randrange(len(target))
+        target[position] = rng.choice("aeioulnrst")
+        query = "".join(target)
+        begin = time.perf_counter()
+        found = store.fuzzy_search(query, limit=10)
+        indexed = time.perf_counter() - begin
+        begin = time.perf_counter()
+        words = query.split()
+        sorted(names, key=lambda name: token_distance(words, name.lower().split()))[:10]
+        scanned = time.perf_counter() - begin
+        print(f"{query:>24} {indexed * 1e3:>10.1f} {scanned * 1e3:>10.1f} {found[0] if found else '-':>24}")
+
+# Duplicate detection on a generated book where every tenth contact has a near-duplicate
+# (country code or trunk zero added to the phone, name case changed or a letter dropped)
+def benchmark_dedup(total=1_000_000, workers=None):
+    rng = random.Random(0)
+    store = CompactContactStore()
+    originals = total * 9 // 10
+    for i in range(originals):
+        store.add(f"Contact {rng.choice('ABCDEFGHIJ')}{i}", str(7000000000 + i))
+    names = list(store)
+    while len(store) < total:
+        name = rng.choice(names)
+        phone = store.get(name)['phone']
+        duplicate = name.upper() if rng.random() < 0.5 else name[:-1]
+        try:
+            store.add(duplicate, rng.choice(["0", "91", "0091"]) + phone)
+        except ValueError:
+            pass
+    begin = time.perf_counter()
+    plan = find_duplicates(store, workers=workers, progress=lambda stage: print(f"{time.perf_counter() - begin:8.1f}s {stage}"))
+    merged = sum(len(duplicates) for keeper, duplicates in plan)
+    print(f"{time.perf_counter() - begin:8.1f}s {merged} duplicates in {len(plan)} clusters ({total - originals} planted)")
+
+# Benchmark of live search latency against the old linear scan
+def benchmark_search(total=100_000, limit=SEARCH_RESULT_LIMIT):
+    store = ContactStore()
+    phones = random.Random(0).sample(range(6000000000, 10000000000), total)
+    for i, phone in enumerate(phones):
+        store.add(f"Contact {i}", str(phone))
+    print(f"{'query':>12} {'index ms':>10} {'scan ms':>10} {'matches':>8}")
+    for query in ("c", "co", "ntact 4", "act 12345", "98", "7731", "zzz"):
+        begin = time.perf_counter()
+        found = store.search(query, limit=limit)
+        indexed = time.perf_counter() - begin
+        begin = time.perf_counter()
+        [name for name, details in store.items() if query.lower() in name.lower() or query in details['phone']]
+        scanned = time.perf_counter() - begin
+        print(f"{query:>12} {indexed * 1e3:>10.3f} {scanned * 1e3:>10.3f} {len(found):>8}")
+
+# Frame time of the old full Treeview rebuild against the virtualized view (needs a display)
+def benchmark_render(total=100_000):
+    store = ContactStore()
+    for i in range(total):
+        store.add(f"Contact {i}", str(9000000000 + i))
+    root = tk.Tk()
+    tree = ttk.Treeview(root, columns=('Index', 'Name', 'Phone'), show='headings')
+    tree.pack(side=tk.LEFT)
+    scrollbar = ttk.Scrollbar(root, orient=tk.VERTICAL)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    root.update()
+
+    def frame(action):
+        begin = time.perf_counter()
+        action()
+        root.update()
+        return (time.perf_counter() - begin) * 1e3
+
+    def rebuild():
+        for item in tree.get_children():
+            tree.delete(item)
+        for index, (name, details) in enumerate(store.items(), start=1):
+            tree.insert("", "end", values=(index, name, details['phone']))
+
+    print(f"{'operation':>24} {'ms/frame':>10}")
+    print(f"{'full rebuild (before)':>24} {frame(rebuild):>10.2f}")
+    print(f"{'mutation (before)':>24} {frame(rebuild):>10.2f}")
+    tree.delete(*tree.get_children())
+
+    view = VirtualTree(tree, scrollbar, lambda position, name: (position + 1, name, store.get(name)['phone']))
+    print(f"{'full view (after)':>24} {frame(lambda: view.set_rows(store.rows())):>10.2f}")
+    scrolls = [frame(lambda: view.yview("scroll", 1, "pages")) for _ in range(100)]
+    print(f"{'page scroll (after)':>24} {sum(scrolls) / len(scrolls):>10.2f}")
+    store.add("Benchmark", "1")
+    print(f"{'insert (after)':>24} {frame(lambda: view.insert('Benchmark')):>10.2f}")
+    print(f"{'remove (after)':>24} {frame(lambda: view.remove_at(view.find('Contact 1005'))):>10.2f}")
+    root.destroy()
+
+# Bytes per contact for the in-memory stores, measured with tracemalloc
+def benchmark_memory(total=1_000_000, kinds=("compact", "dict")):
+    print(f"{'store':>10} {'contacts':>10} {'bytes/contact':>14}")
+    for kind in kinds:
+        tracemalloc.start()
+        store = MEMORY_STORES[kind]()
+        for i in range(total):
+            store.add(f"Contact {i}", str(9000000000 + i))
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{kind:>10} {total:>10} {current / total:>14.1f}")
+        del store
+
+# Benchmark showing that insert cost stays flat as the store grows
+def benchmark_store(total=1_000_000, step=100_000):
+    store = ContactStore()
+    print(f"{'contacts':>10} {'us/insert':>10}")
+    for start in range(0, total, step):
+        begin = time.perf_counter()
+        for i in range(start, start + step):
+            store.add(f"Contact {i}", str(9000000000 + i))
+        elapsed = time.perf_counter() - begin
+        print(f"{start + step:>10} {elapsed / step * 1e6:>10.3f}")
+
 # Setting up the GUI
-root = tk.Tk()
-root.title("Contact Book")
-root.geometry("600x400")
-root.config(bg="#e8f4f8")
+def run_gui(path=DB_PATH, store="sqlite"):
+    global root, custom_font, contact_tree, contact_view, search_var, search_entry, search_status, search_job, searching, contacts, commit_job
+    global db_path, transfer_thread, transfer_queue, transfer_status, fuzzy_var, edit_buttons
+
+    db_path = path
+    contacts = SqliteContactStore(db_path) if store == "sqlite" else MEMORY_STORES[store]()
+    commit_job = None
+    transfer_thread = None
+    transfer_queue = queue.Queue()
+
+    root = tk.Tk()
+    tk_instrument.instrument(root)
+    root.title("Contact Book")
+    root.geometry("620x530")
+    root.config(bg="#e8f4f8")
+
+    # Custom font
+    custom_font = Font(family="Helvetica", size=12, weight="bold")
+    title_font = Font(family="Helvetica", size=16, weight="bold")
+
+    # Style configuration for Treeview
+    style = ttk.Style()
+    style.configure("Treeview.Heading", font=(None, 12, 'bold'), background="#4caf50", foreground="white")
+    style.configure("Treeview", font=(None, 12), rowheight=25, background="#f0f0f0", foreground="#333333")
+    style.map("Treeview", background=[('selected', '#4caf50')], foreground=[('selected', 'white')])
+
+    # Title Label
+    title_label = tk.Label(root, text="Contact Book", font=title_font, bg="#e8f4f8", fg="#333333")
+    title_label.pack(pady=10)
 
-# Custom font
-custom_font = Font(family="Helvetica", size=12, weight="bold")
-title_font = Font(family="Helvetica", size=16, weight="bold")
+    frame = tk.Frame(root, bg="#e8f4f8")
+    frame.pack(pady=20)
 
-# Style configuration for Treeview
-style = ttk.Style()
-style.configure("Treeview.Heading", font=(None, 12, 'bold'), background="#4caf50", foreground="white")
-style.configure("Treeview", font=(None, 12), rowheight=25, background="#f0f0f0", foreground="#333333")
-style.map("Treeview", background=[('selected', '#4caf50')], foreground=[('selected', 'white')])
+    btn_add = tk.Button(frame, text="Add Contact", command=add_contact, width=15, bg="#4caf50", fg="white", font=custom_font, bd=0, highlightthickness=0)
+    btn_add.grid(row=0, column=0, padx=10, pady=5)
 
-# Title Label
-title_label = tk.Label(root, text="Contact Book", font=title_font, bg="#e8f4f8", fg="#333333")
-title_label.pack(pady=10)
+    btn_view = tk.Button(frame, text="View Contacts", command=view_contacts, width=15, bg="#2196f3", fg="white", font=custom_font, bd=0, highlightthickness=0)
+    btn_view.grid(row=0, column=1, padx=10, pady=5)
 
-frame = tk.Frame(root, bg="#e8f4f8")
-frame.pack(pady=20)
+    btn_search = tk.Button(frame, text="Search Contact", command=search_contact, width=15, bg="#ff9800", fg="white", font=custom_font, bd=0, highlightthickness=0)
+    btn_search.grid(row=0, column=2, padx=10, pady=5)
 
-btn_add = tk.Button(frame, text="Add Contact", command=add_contact, width=15, bg="#4caf50", fg="white", font=custom_font, bd=0, highlightthickness=0)
-btn_add.grid(row=0, column=0, padx=10, pady=5)
+    btn_update = tk.Button(frame, text="Update Contact", command=update_contact, width=15, bg="#f44336", fg="white", font=custom_font, bd=0, highlightthickness=0)
+    btn_update.grid(row=1, column=0, padx=10, pady=5)
 
-btn_view = tk.Button(frame, text="View Contacts", command=view_contacts, width=15, bg="#2196f3", fg="white", font=custom_font, bd=0, highlightthickness=0)
-btn_view.grid(row=0, column=1, padx=10, pady=5)
+    btn_delete = tk.Button(frame, text="Delete Contact", command=delete_contact, width=15, bg="#9c27b0", fg="white", font=custom_font, bd=0, highlightthickness=0)
+    btn_delete.grid(row=1, column=1, padx=10, pady=5)
 
-btn_search = tk.Button(frame, text="Search Contact", command=search_contact, width=15, bg="#ff9800", fg="white", font=custom_font, bd=0, highlightthickness=0)
-btn_search.grid(row=0, column=2, padx=10, pady=5)
+    btn_import = tk.Button(frame, text="Import", command=import_file, width=15, bg="#009688", fg="white", font=custom_font, bd=0, highlightthickness=0)
+    btn_import.grid(row=1, column=2, padx=10, pady=5)
 
-btn_update = tk.Button(frame, text="Update Contact", command=update_contact, width=15, bg="#f44336", fg="white", font=custom_font, bd=0, highlightthickness=0)
-btn_update.grid(row=1, column=0, padx=10, pady=5)
+    btn_export = tk.Button(frame, text="Export", command=export_file, width=15, bg="#607d8b", fg="white", font=custom_font, bd=0, highlightthickness=0)
+    btn_export.grid(row=2, column=0, padx=10, pady=5)
 
-btn_delete = tk.Button(frame, text="Delete Contact", command=delete_contact, width=15, bg="#9c27b0", fg="white", font=custom_font, bd=0, highlightthickness=0)
-btn_delete.grid(row=1, column=1, padx=10, pady=5)
+    btn_dedup = tk.Button(frame, text="Find Duplicates", command=find_duplicates_gui, width=15, bg="#795548", fg="white", font=custom_font, bd=0, highlightthickness=0)
+    btn_dedup.grid(row=2, column=1, padx=10, pady=5)
+    edit_buttons = [btn_add, btn_update, btn_delete]
 
-# Create Treeview
-columns = ('Index', 'Name', 'Phone')
-contact_tree = ttk.Treeview(root, columns=columns, show='headings')
-contact_tree.heading('Index', text='Index')
-contact_tree.heading('Name', text='Name')
-contact_tree.heading('Phone', text='Phone')
+    transfer_status = tk.Label(root, text="", bg="#e8f4f8", fg="#333333")
+    transfer_status.pack()
 
-# Set column widths to be equal
-contact_tree.column('Index', width=50)
-contact_tree.column('Name', width=275)
-contact_tree.column('Phone', width=275)
+    # Live search entry
+    search_frame = tk.Frame(root, bg="#e8f4f8")
+    search_frame.pack()
+    search_label = tk.Label(search_frame, text="Search:", font=custom_font, bg="#e8f4f8", fg="#333333")
+    search_label.grid(row=0, column=0, padx=5)
+    search_var = tk.StringVar()
+    search_job = None
+    searching = False
+    search_entry = tk.Entry(search_frame, textvariable=search_var, font=custom_font, bg="#ffffff", fg="#333333", bd=2, relief="groove", width=30)
+    search_entry.grid(row=0, column=1, padx=5)
+    fuzzy_var = tk.BooleanVar()
+    fuzzy_check = tk.Checkbutton(search_frame, text="Fuzzy", variable=fuzzy_var, command=schedule_search, bg="#e8f4f8", font=custom_font)
+    fuzzy_check.grid(row=0, column=2, padx=5)
+    search_status = tk.Label(search_frame, text="", bg="#e8f4f8", fg="#f44336")
+    search_status.grid(row=1, column=0, columnspan=3)
+    search_var.trace_add("write", schedule_search)
 
-contact_tree.pack(pady=20)
+    # Create Treeview
+    tree_frame = tk.Frame(root, bg="#e8f4f8")
+    tree_frame.pack(pady=10)
+    columns = ('Index', 'Name', 'Phone')
+    contact_tree = ttk.Treeview(tree_frame, columns=columns, show='headings')
+    contact_tree.heading('Index', text='Index')
+    contact_tree.heading('Name', text='Name')
+    contact_tree.heading('Phone', text='Phone')
 
-# Start the GUI main loop
-root.mainloop()
+    # Set column widths to be equal
+    contact_tree.column('Index', width=50)
+    contact_tree.column('Name', width=275)
+    contact_tree.column('Phone', width=275)
+
+    contact_tree.pack(side=tk.LEFT)
+    tree_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
+    tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    contact_view = VirtualTree(contact_tree, tree_scrollbar, contact_row)
+    view_contacts()
+    root.protocol("WM_DELETE_WINDOW", on_close)
+
+    # Start the GUI main loop
+    root.mainloop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Contact Book")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database file (use :memory: for a throwaway book)")
+    parser.add_argument("--store", choices=["sqlite", *MEMORY_STORES], default="sqlite", help="keep the book in SQLite or in memory only")
+    subparsers = parser.add_subparsers(dest="command")
+    bench_parser = subparsers.add_parser("benchmark", help="measure insert cost as the store grows")
+    bench_parser.add_argument("--total", type=int, default=1_000_000)
+    bench_parser.add_argument("--step", type=int, default=100_000)
+    search_bench_parser = subparsers.add_parser("benchmark-search", help="compare indexed search with a linear scan")
+    search_bench_parser.add_argument("--total", type=int, default=100_000)
+    render_bench_parser = subparsers.add_parser("benchmark-render", help="compare full Treeview rebuilds with the virtualized view")
+    render_bench_parser.add_argument("--total", type=int, default=100_000)
+    import_parser = subparsers.add_parser("import", help="stream contacts from a CSV or vCard file into the database")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    export_parser = subparsers.add_parser("export", help="stream the database out to a CSV or vCard file")
+    export_parser.add_argument("file")
+    memory_bench_parser = subparsers.add_parser("benchmark-memory", help="report bytes per contact for the in-memory stores")
+    memory_bench_parser.add_argument("--total", type=int, default=1_000_000)
+    memory_bench_parser.add_argument("--stores", nargs="+", choices=list(MEMORY_STORES), default=["compact", "dict"])
+    fuzzy_bench_parser = subparsers.add_parser("benchmark-fuzzy", help="compare fuzzy search with a naive Levenshtein scan")
+    fuzzy_bench_parser.add_argument("--total", type=int, default=100_000)
+    dedup_parser = subparsers.add_parser("dedup", help="find duplicate contacts and print (or delete) them")
+    dedup_parser.add_argument("--country-code", default=DEFAULT_COUNTRY_CODE)
+    dedup_parser.add_argument("--workers", type=int, default=None)
+    dedup_parser.add_argument("--apply", action="store_true", help="delete the duplicates in one batch")
+    dedup_bench_parser = subparsers.add_parser("benchmark-dedup", help="time duplicate detection on a generated book")
+    dedup_bench_parser.add_argument("--total", type=int, default=1_000_000)
+    dedup_bench_parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "import":
+        store = SqliteContactStore(args.db)
+        progress = lambda stats: print(describe_import(stats), file=sys.stderr)
+        stats = import_contacts(store, args.file, progress, args.batch_size)
+        store.close()
+        print(describe_import(stats))
+    elif args.command == "export":
+        store = SqliteContactStore(args.db)
+        print(f"{export_contacts(store, args.file)} contacts exported")
+        store.close()
+    elif args.command == "dedup":
+        store = SqliteContactStore(args.db)
+        plan = find_duplicates(store, args.country_code, args.workers, lambda stage: print(stage, file=sys.stderr))
+        for keeper, duplicates in plan:
+            print(f"{keeper} <- {', '.join(duplicates)}")
+        if args.apply:
+            print(f"{delete_duplicates(store, plan)} duplicate contacts deleted")
+        store.close()
+    elif args.command == "benchmark-dedup":
+        benchmark_dedup(args.total, args.workers)
+    elif args.command == "benchmark":
+        benchmark_store(args.total, args.step)
+    elif args.command == "benchmark-search":
+        benchmark_search(args.total)
+    elif args.command == "benchmark-render":
+        benchmark_render(args.total)
+    elif args.command == "benchmark-fuzzy":
+        benchmark_fuzzy(args.total)
+    elif args.command == "benchmark-memory":
+        benchmark_memory(args.total, args.stores)
+    else:
+        run_gui(args.db, args.store)
@@ -0,0 +1,388 @@
+# Benchmark suite shared by the five apps. It times the cold import of each app and the hot paths
+# behind their buttons (to-do list edits, expression evaluation, password generation, deciding a
+# round, adding and searching contacts), compares the results with a saved baseline and exits with
+# status 1 when any of them got slower than the tolerance allows. Everything except the "gui" group
+# runs without a display; the gui group runs when Tk can open one (for example under xvfb-run) and is
+# skipped otherwise.
+#
+#   python benchmarks.py --save            record a baseline on this machine
+#   python benchmarks.py                   compare against it
+#   xvfb-run python benchmarks.py          include the gui group on a headless machine
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import time
+import tkinter as tk
+from functools import lru_cache
+
+import Task1
+import Task2
+import Task3
+import Task4
+import Task5
+
+# Folder of the apps, used as the working folder of the import timings
+APP_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+# Baseline file, written by --save
+BASELINE_PATH = os.path.join(APP_FOLDER, "benchmarks-baseline.json")
+
+# A benchmark regresses when it is this fraction slower than its baseline
+TOLERANCE = 0.25
+
+# Each benchmark keeps the best of this many runs
+REPEATS = 5
+
+# Apps whose cold import is timed
+APPS = ["Task1", "Task2", "Task3", "Task4", "Task5"]
+
+# Benchmarks by name. Each one is a function that prepares its data and returns a run
+# function, which does the timed work and returns how many operations it did; results
+# are seconds per operation.
+BENCHMARKS = {}
+
+def register_benchmark(name):
+    def register(prepare):
+        BENCHMARKS[name] = prepare
+        return prepare
+    return register
+
+# Shared fixtures, built once. Benchmarks that change them must copy them first.
+@lru_cache(maxsize=None)
+def task_names(count, seed=0):
+    rng = random.Random(seed)
+    return [f"task {index} " + "".join(rng.choice(string.ascii_lowercase) for _ in range(12)) for index in range(count)]
+
+@lru_cache(maxsize=None)
+def contact_book(count, seed=0):
+    rng = random.Random(seed)
+    syllables = ["an", "ber", "cha", "dra", "el", "fin", "gor", "hal", "is", "jo", "ka", "lin", "mar", "nor", "ol", "pet", "ra", "sam", "tor", "vin"]
+    word = lambda: "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))).capitalize()
+    entries = {}
+    while len(entries) < count:
+        name = f"{word()} {word()}"
+        if name not in entries:
+            entries[name] = str(6000000000 + len(entries))
+    return list(entries.items())
+
+@lru_cache(maxsize=None)
+def contact_store(count):
+    store = Task5.ContactStore()
+    for name, phone in contact_book(count):
+        store.add(name, phone)
+    return store
+
+@lru_cache(maxsize=None)
+def expressions(count, seed=0):
+    rng = random.Random(seed)
+    numbers = lambda: str(rng.randint(1, 999)) if rng.random() < 0.8 else f"{rng.randint(1, 99)}.{rng.randint(1, 9)}"
+    return [numbers() + "".join(rng.choice("+-*/") + numbers() for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+@register_benchmark("task1.insert")
+def bench_task1_insert():
+    store = Task1.TaskStore()
+    store.extend(task_names(100000))
+    rng = random.Random(1)
+    positions = [rng.randrange(len(store) + index + 1) for index in range(5000)]
+    def run():
+        for position in positions:
+            store.insert(position, "new task")
+        return len(positions)
+    return run
+
+@register_benchmark("task1.update")
+def bench_task1_update():
+    store = Task1.TaskStore()
+    store.extend(task_names(100000))
+    rng = random.Random(2)
+    positions = [rng.randrange(len(store)) for _ in range(20000)]
+    def run():
+        for position in positions:
+            store[position] = store[position] + "!"
+        return len(positions)
+    return run
+
+@register_benchmark("task1.delete")
+def bench_task1_delete():
+    store = Task1.TaskStore()
+    store.extend(task_names(100000))
+    positions = random.Random(3).sample(range(len(store)), 10000)
+    def run():
+        store.delete(positions)
+        return len(positions)
+    return run
+
+@register_benchmark("task2.evaluate_cold")
+def bench_task2_evaluate_cold():
+    lines = expressions(2000)
+    Task2.compile_expression.cache_clear()
+    def run():
+        for line in lines:
+            try:
+                Task2.evaluate(line)
+            except ZeroDivisionError:
+                pass
+        return len(lines)
+    return run
+
+# Few enough expressions to all stay in the expression cache
+@register_benchmark("task2.evaluate_cached")
+def bench_task2_evaluate_cached():
+    lines = expressions(Task2.EXPRESSION_CACHE_SIZE)
+    Task2.compile_expression.cache_clear()
+    def run():
+        for line in lines:
+            try:
+                Task2.evaluate(line)
+            except ZeroDivisionError:
+                pass
+        return len(lines)
+    run()
+    return run
+
+@register_benchmark("task2.live_preview")
+def bench_task2_live_preview():
+    text = "".join(expressions(200))
+    def run():
+        live = Task2.LiveEvaluator()
+        for char in text:
+            live.push(char)
+            live.preview()
+        return len(text)
+    return run
+
+@register_benchmark("task3.generate_password")
+def bench_task3_generate_password():
+    def run():
+        for _ in range(2000):
+            Task3.generate_password(16, True, True, True, True)
+        return 2000
+    return run
+
+@register_benchmark("task3.generate_passwords")
+def bench_task3_generate_passwords():
+    def run():
+        for password in Task3.generate_passwords(20000, 16, True, True, True, True):
+            pass
+        return 20000
+    return run
+
+@register_benchmark("task4.determine_winner")
+def bench_task4_determine_winner():
+    rng = random.Random(4)
+    rounds = [(rng.choice(Task4.MOVES), rng.choice(Task4.MOVES)) for _ in range(100000)]
+    def run():
+        for user_choice, computer_choice in rounds:
+            Task4.determine_winner(user_choice, computer_choice)
+        return len(rounds)
+    return run
+
+@register_benchmark("task4.adaptive_opponent")
+def bench_task4_adaptive_opponent():
+    rng = random.Random(5)
+    moves = [rng.randrange(3) for _ in range(20000)]
+    def run():
+        opponent = Task4.AdaptiveOpponent(rng=random.Random(6))
+        for user_move in moves:
+            opponent.update(user_move, opponent.choose())
+        return len(moves)
+    return run
+
+@register_benchmark("task5.add")
+def bench_task5_add():
+    book = contact_book(20000)
+    def run():
+        store = Task5.ContactStore()
+        for name, phone in book:
+            store.add(name, phone)
+        return len(book)
+    return run
+
+@register_benchmark("task5.search")
+def bench_task5_search():
+    store = contact_store(50000)
+    rng = random.Random(7)
+    queries = []
+    for name, phone in rng.sample(contact_book(50000), 500):
+        start = rng.randrange(len(name) - 3)
+        queries.append(name[start:start + 3])
+        queries.append(phone[-5:])
+    def run():
+        for query in queries:
+            store.search(query, limit=50)
+        return len(queries)
+    return run
+
+@register_benchmark("task5.fuzzy_search")
+def bench_task5_fuzzy_search():
+    store = contact_store(50000)
+    store.fuzzy_search("warm up")
+    rng = random.Random(8)
+    queries = []
+    for name, phone in rng.sample(contact_book(50000), 100):
+        target = list(name.lower())
+        target[rng.randrange(len(target))] = rng.choice("aeioulnrst")
+        queries.append("".join(target))
+    def run():
+        for query in queries:
+            store.fuzzy_search(query, limit=10)
+        return len(queries)
+    return run
+
+# Tk root for the gui group, or None when there is no display
+gui_root = None
+
+@register_benchmark("gui.todo_add")
+def bench_gui_todo_add():
+    for child in gui_root.winfo_children():
+        child.destroy()
+    app = Task1.TodoApp(gui_root, Task1.TaskStore())
+    def run():
+        for index in range(500):
+            app.task_entry.insert(0, f"task {index}")
+            app.add_task()
+        gui_root.update_idletasks()
+        return 500
+    return run
+
+@register_benchmark("gui.todo_scroll")
+def bench_gui_todo_scroll():
+    for child in gui_root.winfo_children():
+        child.destroy()
+    tasks = Task1.TaskStore()
+    tasks.extend(task_names(100000))
+    app = Task1.TodoApp(gui_root, tasks)
+    def run():
+        for _ in range(200):
+            app.task_view.scroll(50)
+        for _ in range(200):
+            app.task_view.scroll(-50)
+        gui_root.update_idletasks()
+        return 400
+    return run
+
+# Collection is off while timing, as in timeit, so a collection triggered by the
+# setup does not land in the measured run
+def measure(prepare, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        run = prepare()
+        gc.collect()
+        gc.disable()
+        try:
+            begin = time.perf_counter()
+            operations = run()
+            elapsed = time.perf_counter() - begin
+        finally:
+            gc.enable()
+        best = min(best, elapsed / operations)
+    return best
+
+# Cold import time of each app in a fresh interpreter, less the interpreter's own startup.
+# Instrumentation is switched off so it cannot add to the time.
+def measure_imports(apps, repeats):
+    environment = dict(os.environ)
+    environment.pop("TK_INSTRUMENT", None)
+    def best(code):
+        times = []
+        for _ in range(repeats):
+            begin = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=APP_FOLDER, env=environment, check=True)
+            times.append(time.perf_counter() - begin)
+        return min(times)
+    startup = best("pass")
+    return {f"{app.lower()}.import": max(0.0, best(f"import {app}") - startup) for app in apps}
+
+def selected(name, only):
+    return not only or any(name == prefix or name.startswith(prefix + ".") for prefix in only)
+
+def run_benchmarks(only, repeats, headless):
+    global gui_root
+    results = measure_imports([app for app in APPS if selected(f"{app.lower()}.import", only)], repeats)
+    names = [name for name in BENCHMARKS if selected(name, only)]
+    if any(name.startswith("gui.") for name in names):
+        if not headless:
+            try:
+                gui_root = tk.Tk()
+                gui_root.withdraw()
+            except tk.TclError as e:
+                print(f"skipping gui benchmarks: {e}", file=sys.stderr)
+        if gui_root is None:
+            names = [name for name in names if not name.startswith("gui.")]
+    for name in names:
+        results[name] = measure(BENCHMARKS[name], repeats)
+    if gui_root is not None:
+        gui_root.destroy()
+        gui_root = None
+    return results
+
+# Print every result next to its baseline and return the names that regressed
+def compare(results, baseline, tolerance):
+    regressions = []
+    print(f"{'benchmark':>26} {'us/op':>12} {'baseline':>12} {'change':>9}")
+    for name, seconds in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:>26} {seconds * 1e6:>12.2f} {'-':>12} {'new':>9}")
+            continue
+        change = seconds / previous - 1 if previous else 0.0
+        flag = ""
+        if seconds > previous * (1 + tolerance):
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:>26} {seconds * 1e6:>12.2f} {previous * 1e6:>12.2f} {change:>+9.1%}{flag}")
+    return regressions
+
+def load_baseline(path):
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)["results"]
+    except FileNotFoundError:
+        return {}
+
+# Saving merges into the existing baseline, so --only can refresh part of it
+def save_baseline(path, results):
+    merged = load_baseline(path)
+    merged.update(results)
+    report = {"python": platform.python_version(), "platform": platform.platform(), "results": merged}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the apps against a saved baseline.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file")
+    parser.add_argument("--save", action="store_true", help="save the results as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="runs per benchmark, the best one counts")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="benchmarks or groups to run, e.g. task3 gui task1.insert")
+    parser.add_argument("--headless", action="store_true", help="skip the gui group even when a display is available")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args()
+    if args.list:
+        for name in [f"{app.lower()}.import" for app in APPS] + list(BENCHMARKS):
+            print(name)
+        sys.exit()
+    if args.repeats < 1 or args.tolerance < 0:
+        parser.error("repeats must be at least 1 and tolerance not negative")
+    results = run_benchmarks(args.only, args.repeats, args.headless)
+    if not results:
+        parser.error("no benchmark matches --only")
+    if args.save:
+        compare(results, {}, args.tolerance)
+        save_baseline(args.baseline, results)
+        print(f"saved baseline to {args.baseline}")
+    else:
+        baseline = load_baseline(args.baseline)
+        if not baseline:
+            print(f"no baseline at {args.baseline}; run with --save first", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
@@ -0,0 +1,145 @@
+import itertools
+import math
+import os
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+import Task3
+
+# Critical value of the chi-square distribution at p = 0.001, by the Wilson-Hilferty
+# approximation, so a correct sampler fails about once in a thousand runs
+def chi_square_limit(degrees):
+    z = 3.090
+    return degrees * (1 - 2 / (9 * degrees) + z * math.sqrt(2 / (9 * degrees))) ** 3
+
+def chi_square(observed, expected_per_outcome):
+    return sum((observed.get(outcome, 0) - expected_per_outcome) ** 2 / expected_per_outcome for outcome in observed.outcomes)
+
+class OutcomeCounter(Counter):
+    def __init__(self, samples, outcomes):
+        super().__init__(samples)
+        self.outcomes = outcomes
+
+def valid_passwords(length, classes):
+    alphabet = "".join(classes)
+    for letters in itertools.product(alphabet, repeat=length):
+        if all(set(chars) & set(letters) for chars in classes):
+            yield "".join(letters)
+
+class GeneratePasswordsTest(unittest.TestCase):
+    def setUp(self):
+        Task3.clear_policy_samplers()
+        self.patch_breach = mock.patch.object(Task3, "breach_filter", None)
+        self.patch_breach.start()
+
+    def tearDown(self):
+        self.patch_breach.stop()
+
+    def check_uniform(self, length, flags, draws_per_password=40):
+        classes = [chars for chars, used in zip(Task3.CHARACTER_CLASSES, flags) if used]
+        outcomes = set(valid_passwords(length, classes))
+        draws = draws_per_password * len(outcomes)
+        samples = list(Task3.generate_passwords(draws, length, *flags))
+        self.assertEqual(len(samples), draws)
+        self.assertTrue(outcomes.issuperset(samples))
+        observed = OutcomeCounter(samples, outcomes)
+        self.assertLess(chi_square(observed, draws_per_password), chi_square_limit(len(outcomes) - 1))
+
+    def test_uniform_digits_and_uppercase(self):
+        self.check_uniform(2, (True, True, False, False))
+
+    def test_uniform_digits_and_symbols(self):
+        self.check_uniform(2, (True, False, False, True))
+
+    def test_every_type_present(self):
+        for length in (4, 5, 8):
+            for password in Task3.generate_passwords(2000, length, True, True, True, True):
+                self.assertEqual(len(password), length)
+                self.assertTrue(all(Task3.count_classes(password)))
+
+    def test_short_passwords_never_retry(self):
+        # Length 4 with every type required: only about 1 in 30 uniform candidates
+        # would contain all four, yet each password costs exactly one random rank
+        with mock.patch.object(Task3, "random_passwords") as rejection, \
+                mock.patch.object(Task3.secrets, "randbelow", wraps=Task3.secrets.randbelow) as randbelow:
+            passwords = list(Task3.generate_passwords(1000, 4, True, True, True, True))
+        self.assertEqual(len(passwords), 1000)
+        self.assertEqual(randbelow.call_count, 1000)
+        rejection.assert_not_called()
+
+    def test_long_passwords_use_byte_table(self):
+        length = Task3.PLAIN_SAMPLER_LENGTH + 1
+        passwords = list(Task3.generate_passwords(10, length, True, True, True, True))
+        self.assertTrue(all(len(password) == length and all(Task3.count_classes(password)) for password in passwords))
+        self.assertEqual(len(Task3.policy_samplers), 0)
+
+    def test_too_short_for_types(self):
+        with self.assertRaises(ValueError):
+            Task3.generate_passwords(1, 3, True, True, True, True)
+
+class PasswordSamplerTest(unittest.TestCase):
+    def test_count_matches_enumeration(self):
+        classes = ["01", "ABC", "!"]
+        for length in range(1, 6):
+            for minimums in ((1, 1, 1), (2, 1, 0), (0, 2, 1)):
+                for max_run in (None, 1, 2):
+                    expected = 0
+                    for letters in itertools.product("".join(classes), repeat=length):
+                        counts = [sum(char in chars for char in letters) for chars in classes]
+                        runs = [len(list(group)) for char, group in itertools.groupby(letters)]
+                        if all(count >= minimum for count, minimum in zip(counts, minimums)) and (max_run is None or max(runs) <= max_run):
+                            expected += 1
+                    sampler = Task3.PasswordSampler(length, classes, minimums, max_run)
+                    self.assertEqual(sampler.count, expected, (length, minimums, max_run))
+
+    def test_uniform_with_run_limit(self):
+        classes = ["01", "ABC", "!"]
+        sampler = Task3.PasswordSampler(4, classes, (1, 1, 1), 1)
+        draws_per_password = 40
+        draws = draws_per_password * sampler.count
+        observed = OutcomeCounter((sampler.sample() for _ in range(draws)), None)
+        observed.outcomes = set(observed)
+        self.assertEqual(len(observed.outcomes), sampler.count)
+        self.assertLess(chi_square(observed, draws_per_password), chi_square_limit(sampler.count - 1))
+
+class BreachFilterTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.corpus = os.path.join(directory.name, "corpus.txt")
+        self.path = os.path.join(directory.name, "breached.bloom")
+        with open(self.corpus, "w") as corpus:
+            corpus.write("".join(f"password{i}\n" for i in range(1000)))
+        Task3.build_breach_filter(self.corpus, self.path)
+
+    def test_lookup(self):
+        screen = Task3.BreachFilter(self.path)
+        self.addCleanup(screen.close)
+        self.assertIn("password7", screen)
+        self.assertLess(sum(f"other{i}" in screen for i in range(1000)), 20)
+
+    def check_rejected(self, data):
+        with open(self.path, "wb") as file:
+            file.write(data)
+        with self.assertRaises(ValueError):
+            Task3.BreachFilter(self.path)
+
+    def test_empty_file(self):
+        self.check_rejected(b"")
+
+    def test_truncated_header(self):
+        with open(self.path, "rb") as file:
+            self.check_rejected(file.read(10))
+
+    def test_truncated_bits(self):
+        with open(self.path, "rb") as file:
+            self.check_rejected(file.read()[:-1])
+
+    def test_wrong_magic(self):
+        with open(self.path, "rb") as file:
+            self.check_rejected(b"NOTBLOOM" + file.read()[8:])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# Callback-latency instrumentation shared by the Tk apps in this repo. When enabled it times every
+# Tk callback (button commands, event bindings, after jobs), measures event-loop lag with an
+# after-based heartbeat, prints callbacks slower than a threshold and writes histograms of both to a
+# JSON file on exit. It is off unless the TK_INSTRUMENT environment variable is set, and then
+# instrument() returns at once without touching Tk, so the apps run exactly as before.
+#
+#   TK_INSTRUMENT=1                 turn instrumentation on
+#   TK_INSTRUMENT_FILE=path         histogram file, default tk-instrument-<app>.json in the working folder
+#   TK_INSTRUMENT_THRESHOLD_MS=50   log callbacks slower than this
+#   TK_INSTRUMENT_HEARTBEAT_MS=100  heartbeat interval for event-loop lag
+
+import atexit
+import json
+import os
+import sys
+import time
+import tkinter as tk
+
+# Upper bounds of the histogram buckets in milliseconds; the last bucket is open-ended
+BUCKET_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# Defaults for the environment settings
+THRESHOLD_MS = 50
+HEARTBEAT_MS = 100
+
+# Count, total, max and bucket counts for one series of durations
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, milliseconds):
+        self.count += 1
+        self.total += milliseconds
+        if milliseconds > self.max:
+            self.max = milliseconds
+        for index, bound in enumerate(BUCKET_BOUNDS_MS):
+            if milliseconds <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def export(self):
+        labels = [f"<={bound}ms" for bound in BUCKET_BOUNDS_MS] + [f">{BUCKET_BOUNDS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+# Histograms per callback name, and of event-loop lag
+callbacks = {}
+loop_lag = Histogram()
+threshold_ms = THRESHOLD_MS
+enabled = False
+
+# Name of a callback for the report; lambdas also get their file and line, and after
+# jobs, which tkinter wraps in a function named like the job, are marked as such
+def callback_name(function):
+    name = getattr(function, "__qualname__", None) or repr(function)
+    if name.endswith("<locals>.callit"):
+        return f"after {function.__name__}"
+    code = getattr(function, "__code__", None)
+    if code is not None and "<lambda>" in name:
+        name = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name
+
+def record(name, milliseconds):
+    histogram = callbacks.get(name)
+    if histogram is None:
+        histogram = callbacks[name] = Histogram()
+    histogram.add(milliseconds)
+    if milliseconds > threshold_ms:
+        print(f"slow callback {name}: {milliseconds:.1f}ms", file=sys.stderr)
+
+# Tkinter wraps every Python callback it registers with Tcl in a CallWrapper, so timing
+# this one class covers commands, bindings and after jobs of every widget created later
+class TimedCallWrapper(tk.CallWrapper):
+    def __init__(self, func, subst, widget):
+        super().__init__(func, subst, widget)
+        self.name = callback_name(func)
+
+    def __call__(self, *args):
+        begin = time.perf_counter()
+        try:
+            return super().__call__(*args)
+        finally:
+            record(self.name, (time.perf_counter() - begin) * 1000)
+
+# The heartbeat is a plain Tcl command rescheduled with "after", so it is not itself
+# timed as a callback; lag is how much later than asked it actually ran
+class Heartbeat:
+    def __init__(self, root, interval_ms):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.command = "tk_instrument_heartbeat"
+        root.tk.createcommand(self.command, self.beat)
+        self.schedule()
+
+    def schedule(self):
+        self.expected = time.perf_counter() + self.interval_ms / 1000
+        self.root.tk.call("after", self.interval_ms, self.command)
+
+    def beat(self):
+        loop_lag.add(max(0.0, (time.perf_counter() - self.expected) * 1000))
+        self.schedule()
+
+def export(path):
+    report = {
+        "bounds_ms": BUCKET_BOUNDS_MS,
+        "threshold_ms": threshold_ms,
+        "loop_lag": loop_lag.export(),
+        "callbacks": {name: histogram.export() for name, histogram in sorted(callbacks.items())},
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+# Call right after creating the Tk root, before the widgets, so their callbacks are timed
+def instrument(root, app=None):
+    global enabled, threshold_ms
+    if not os.environ.get("TK_INSTRUMENT") or enabled:
+        return
+    enabled = True
+    threshold_ms = float(os.environ.get("TK_INSTRUMENT_THRESHOLD_MS", THRESHOLD_MS))
+    interval_ms = int(os.environ.get("TK_INSTRUMENT_HEARTBEAT_MS", HEARTBEAT_MS))
+    app = app or os.path.splitext(os.path.basename(sys.argv[0]))[0] or "app"
+    path = os.environ.get("TK_INSTRUMENT_FILE") or f"tk-instrument-{app}.json"
+    tk.CallWrapper = TimedCallWrapper
+    Heartbeat(root, interval_ms)
+    atexit.register(export, path)